@@ -0,0 +1,286 @@
+# -*- coding: utf-8 -*-
+"""
+Coordinate transformations on plain arrays
+
+This module contains the Helioprojective, Heliocentric and Heliographic
+Stonyhurst transformations of `sunpy.coordinates.transformations` written
+for plain floating point arrays. They give the same results as transforming
+`~astropy.coordinates.SkyCoord` objects through the frame transform graph,
+without the overhead of units, representations and frame objects, which
+dominates when transforming large arrays of coordinates (for example one
+coordinate for every pixel of a map).
+
+All angles are in degrees and all distances are in metres. The observer is
+either a coordinate (a `~astropy.coordinates.BaseCoordinateFrame` or
+`~astropy.coordinates.SkyCoord`) or a ``(lon, lat, radius)`` tuple of its
+Heliographic Stonyhurst longitude, latitude and distance from the centre of
+the Sun.
+
+The calculation is performed in the floating point type of the inputs
+(float32 inputs give float32 outputs) unless ``dtype`` is given, and the
+results can be written into preallocated arrays with ``out``.
+"""
+import numpy as np
+
+import astropy.units as u
+from astropy.coordinates import BaseCoordinateFrame, SkyCoord
+
+from sunpy.sun import sun
+
+from .frames import HeliographicStonyhurst
+
+RSUN_METERS = sun.constants.get('radius').si.to_value(u.m)
+
+__all__ = ['hpc_to_hcc', 'hcc_to_hpc', 'hcc_to_hgs', 'hgs_to_hcc',
+           'hpc_to_hgs', 'hgs_to_hpc']
+
+
+def _observer_values(observer):
+    """
+    Return the Heliographic Stonyhurst longitude and latitude (degrees) and
+    radius (metres) of ``observer``.
+    """
+    if isinstance(observer, (BaseCoordinateFrame, SkyCoord)):
+        if not isinstance(observer, SkyCoord):
+            observer = SkyCoord(observer)
+        observer = observer.transform_to(HeliographicStonyhurst)
+        return (observer.lon.to_value(u.deg), observer.lat.to_value(u.deg),
+                observer.radius.to_value(u.m))
+    lon, lat, radius = observer
+    return float(lon), float(lat), float(radius)
+
+
+def _prepare(inputs, dtype, out, n_out):
+    """
+    Convert the inputs to arrays of the working dtype and check or create the
+    output arrays.
+    """
+    if dtype is None:
+        # Use the dtypes, as the result type of scalars depends on their value
+        dtype = np.result_type(*[np.asarray(value).dtype for value in inputs], np.float32)
+    dtype = np.dtype(dtype)
+    if dtype.kind != 'f':
+        raise ValueError('dtype must be a floating point type.')
+    inputs = [np.asarray(value, dtype=dtype) for value in inputs]
+    shape = np.broadcast(*inputs).shape
+    if out is None:
+        out = tuple(np.empty(shape, dtype=dtype) for _ in range(n_out))
+    elif len(out) != n_out or any(o.shape != shape for o in out):
+        raise ValueError('out must be a tuple of {} arrays of shape {}.'.format(n_out, shape))
+    return inputs, out
+
+
+def _wrap(lon, wrap_angle, out=None):
+    """
+    Wrap longitudes in degrees to [wrap_angle - 360, wrap_angle).
+    """
+    out = np.add(lon, 360 - wrap_angle, out=out)
+    np.mod(out, 360, out=out)
+    out -= 360 - wrap_angle
+    return out
+
+
+def hpc_to_hcc(tx, ty, observer, distance=None, rsun=RSUN_METERS, out=None, dtype=None):
+    """
+    Convert from Helioprojective to Heliocentric coordinates.
+
+    Parameters
+    ----------
+    tx, ty : `numpy.ndarray`
+        The Helioprojective longitude and latitude in degrees.
+    observer : `~astropy.coordinates.BaseCoordinateFrame`, `tuple`
+        The observer of the coordinates.
+    distance : `numpy.ndarray`, optional
+        The distance from the observer in metres. If not given, the points
+        are assumed to be on the surface of the Sun, in the same way as
+        `~sunpy.coordinates.frames.Helioprojective.calculate_distance`, and
+        points off the disk are NaN.
+    rsun : `float`, optional
+        The radius of the Sun in metres.
+    out : `tuple`, optional
+        Three arrays to store the x, y and z coordinates in.
+    dtype : `numpy.dtype`, optional
+        The floating point type to calculate in.
+
+    Returns
+    -------
+    x, y, z : `numpy.ndarray`
+        The Heliocentric coordinates in metres.
+    """
+    observer_radius = _observer_values(observer)[2]
+    inputs = [tx, ty] if distance is None else [tx, ty, distance]
+    inputs, (x, y, z) = _prepare(inputs, dtype, out, 3)
+    tx, ty = np.deg2rad(inputs[0]), np.deg2rad(inputs[1])
+
+    cosx = np.cos(tx)
+    sinx = np.sin(tx)
+    cosy = np.cos(ty)
+    siny = np.sin(ty)
+
+    cos_alpha = cosx * cosy
+    if distance is None:
+        # The nearest intersection of the line of sight with the solar sphere,
+        # as in Helioprojective.calculate_distance. The expressions are
+        # rearranged to avoid the loss of precision from subtracting large
+        # and nearly equal numbers, so that float32 gives accurate results.
+        sin2_alpha = (sinx * cosy)**2 + siny**2
+        with np.errstate(invalid='ignore'):
+            root = np.sqrt(rsun**2 - observer_radius**2 * sin2_alpha)
+        distance = observer_radius * cos_alpha - root
+        np.multiply(observer_radius, sin2_alpha, out=z)
+        z += cos_alpha * root
+    else:
+        distance = inputs[2]
+        np.subtract(observer_radius, distance * cos_alpha, out=z)
+
+    np.multiply(distance, cosy * sinx, out=x)
+    np.multiply(distance, siny, out=y)
+    return x, y, z
+
+
+def hcc_to_hpc(x, y, z, observer, out=None, dtype=None):
+    """
+    Convert from Heliocentric to Helioprojective coordinates.
+
+    Parameters
+    ----------
+    x, y, z : `numpy.ndarray`
+        The Heliocentric coordinates in metres.
+    observer : `~astropy.coordinates.BaseCoordinateFrame`, `tuple`
+        The observer of the coordinates.
+    out : `tuple`, optional
+        Three arrays to store the longitude, latitude and distance in.
+    dtype : `numpy.dtype`, optional
+        The floating point type to calculate in.
+
+    Returns
+    -------
+    tx, ty, distance : `numpy.ndarray`
+        The Helioprojective longitude and latitude in degrees and the
+        distance from the observer in metres.
+    """
+    observer_radius = _observer_values(observer)[2]
+    (x, y, z), (tx, ty, distance) = _prepare([x, y, z], dtype, out, 3)
+
+    dz = observer_radius - z
+    np.sqrt(x**2 + y**2 + dz**2, out=distance)
+
+    np.rad2deg(np.arctan2(x, dz), out=tx)
+    _wrap(tx, 180, out=tx)
+    np.rad2deg(np.arcsin(y / distance), out=ty)
+    return tx, ty, distance
+
+
+def hcc_to_hgs(x, y, z, observer, out=None, dtype=None):
+    """
+    Convert from Heliocentric to Heliographic Stonyhurst coordinates.
+
+    Parameters
+    ----------
+    x, y, z : `numpy.ndarray`
+        The Heliocentric coordinates in metres.
+    observer : `~astropy.coordinates.BaseCoordinateFrame`, `tuple`
+        The observer of the coordinates.
+    out : `tuple`, optional
+        Three arrays to store the longitude, latitude and radius in.
+    dtype : `numpy.dtype`, optional
+        The floating point type to calculate in.
+
+    Returns
+    -------
+    lon, lat, radius : `numpy.ndarray`
+        The Heliographic Stonyhurst longitude and latitude in degrees and the
+        distance from the centre of the Sun in metres.
+    """
+    l0, b0, _ = _observer_values(observer)
+    (x, y, z), (lon, lat, radius) = _prepare([x, y, z], dtype, out, 3)
+
+    cosb = np.cos(np.deg2rad(b0))
+    sinb = np.sin(np.deg2rad(b0))
+
+    np.sqrt(x**2 + y**2 + z**2, out=radius)
+    np.rad2deg(np.arctan2(x, z * cosb - y * sinb), out=lon)
+    lon += l0
+    _wrap(lon, 180, out=lon)
+    np.rad2deg(np.arcsin((y * cosb + z * sinb) / radius), out=lat)
+    return lon, lat, radius
+
+
+def hgs_to_hcc(lon, lat, observer, radius=None, rsun=RSUN_METERS, out=None, dtype=None):
+    """
+    Convert from Heliographic Stonyhurst to Heliocentric coordinates.
+
+    Parameters
+    ----------
+    lon, lat : `numpy.ndarray`
+        The Heliographic Stonyhurst longitude and latitude in degrees.
+    observer : `~astropy.coordinates.BaseCoordinateFrame`, `tuple`
+        The observer of the coordinates.
+    radius : `numpy.ndarray`, optional
+        The distance from the centre of the Sun in metres. Defaults to
+        ``rsun``.
+    rsun : `float`, optional
+        The radius of the Sun in metres.
+    out : `tuple`, optional
+        Three arrays to store the x, y and z coordinates in.
+    dtype : `numpy.dtype`, optional
+        The floating point type to calculate in.
+
+    Returns
+    -------
+    x, y, z : `numpy.ndarray`
+        The Heliocentric coordinates in metres.
+    """
+    l0, b0, _ = _observer_values(observer)
+    inputs = [lon, lat] if radius is None else [lon, lat, radius]
+    inputs, (x, y, z) = _prepare(inputs, dtype, out, 3)
+    radius = rsun if radius is None else inputs[2]
+
+    cosb = np.cos(np.deg2rad(b0))
+    sinb = np.sin(np.deg2rad(b0))
+
+    lon = np.deg2rad(inputs[0] - l0)
+    lat = np.deg2rad(inputs[1])
+    cosx = np.cos(lon)
+    sinx = np.sin(lon)
+    cosy = np.cos(lat)
+    siny = np.sin(lat)
+
+    np.multiply(radius, cosy * sinx, out=x)
+    np.multiply(radius, siny * cosb - cosy * cosx * sinb, out=y)
+    np.multiply(radius, siny * sinb + cosy * cosx * cosb, out=z)
+    return x, y, z
+
+
+def hpc_to_hgs(tx, ty, observer, distance=None, rsun=RSUN_METERS, out=None, dtype=None):
+    """
+    Convert from Helioprojective to Heliographic Stonyhurst coordinates.
+
+    See `hpc_to_hcc` and `hcc_to_hgs` for the parameters.
+
+    Returns
+    -------
+    lon, lat, radius : `numpy.ndarray`
+        The Heliographic Stonyhurst longitude and latitude in degrees and the
+        distance from the centre of the Sun in metres.
+    """
+    observer = _observer_values(observer)
+    x, y, z = hpc_to_hcc(tx, ty, observer, distance=distance, rsun=rsun, dtype=dtype)
+    return hcc_to_hgs(x, y, z, observer, out=out)
+
+
+def hgs_to_hpc(lon, lat, observer, radius=None, rsun=RSUN_METERS, out=None, dtype=None):
+    """
+    Convert from Heliographic Stonyhurst to Helioprojective coordinates.
+
+    See `hgs_to_hcc` and `hcc_to_hpc` for the parameters.
+
+    Returns
+    -------
+    tx, ty, distance : `numpy.ndarray`
+        The Helioprojective longitude and latitude in degrees and the
+        distance from the observer in metres.
+    """
+    observer = _observer_values(observer)
+    x, y, z = hgs_to_hcc(lon, lat, observer, radius=radius, rsun=rsun, dtype=dtype)
+    return hcc_to_hpc(x, y, z, observer, out=out)
@@ -0,0 +1,93 @@
+import numpy as np
+import pytest
+
+import astropy.units as u
+from astropy.coordinates import SkyCoord
+from astropy.tests.helper import assert_quantity_allclose
+
+from sunpy.coordinates import Helioprojective, HeliographicStonyhurst, Heliocentric
+from sunpy.coordinates import array_transforms
+
+
+@pytest.fixture
+def observer():
+    return HeliographicStonyhurst(lon=10*u.deg, lat=5*u.deg, radius=1.4e11*u.m,
+                                  obstime='2011-02-15T00:00:00')
+
+
+@pytest.fixture
+def hpc(observer):
+    tx, ty = np.meshgrid(np.linspace(-1100, 1100, 41), np.linspace(-1050, 1050, 37))
+    return SkyCoord(tx*u.arcsec, ty*u.arcsec, frame=Helioprojective, observer=observer,
+                    obstime=observer.obstime)
+
+
+def test_hpc_to_hgs(observer, hpc):
+    expected = hpc.transform_to(HeliographicStonyhurst)
+    lon, lat, radius = array_transforms.hpc_to_hgs(hpc.Tx.to_value(u.deg), hpc.Ty.to_value(u.deg),
+                                                   observer)
+    off_disk = np.isnan(expected.lon.value)
+    assert off_disk.any() and not off_disk.all()
+    np.testing.assert_array_equal(np.isnan(lon), off_disk)
+    assert_quantity_allclose(lon[~off_disk]*u.deg, expected.lon[~off_disk], atol=1e-9*u.deg)
+    assert_quantity_allclose(lat[~off_disk]*u.deg, expected.lat[~off_disk], atol=1e-9*u.deg)
+    assert_quantity_allclose(radius[~off_disk]*u.m, expected.radius[~off_disk])
+
+    # The observer can also be given as (lon, lat, radius)
+    lon2, _, _ = array_transforms.hpc_to_hgs(hpc.Tx.to_value(u.deg), hpc.Ty.to_value(u.deg),
+                                             (10, 5, 1.4e11))
+    np.testing.assert_array_equal(lon2, lon)
+
+
+def test_hgs_to_hpc(observer):
+    lon, lat = np.meshgrid(np.linspace(-80, 80, 17), np.linspace(-85, 85, 15))
+    hgs = SkyCoord(lon*u.deg, lat*u.deg, frame=HeliographicStonyhurst, obstime=observer.obstime)
+    expected = hgs.transform_to(Helioprojective(observer=observer, obstime=observer.obstime))
+    tx, ty, distance = array_transforms.hgs_to_hpc(lon, lat, observer)
+    assert_quantity_allclose(tx*u.deg, expected.Tx, atol=1e-9*u.deg)
+    assert_quantity_allclose(ty*u.deg, expected.Ty, atol=1e-9*u.deg)
+    assert_quantity_allclose(distance*u.m, expected.distance)
+
+
+def test_hcc(observer, hpc):
+    hpc = hpc.transform_to(HeliographicStonyhurst).transform_to(hpc.frame)
+    expected = hpc.transform_to(Heliocentric(observer=observer))
+    x, y, z = array_transforms.hpc_to_hcc(hpc.Tx.to_value(u.deg), hpc.Ty.to_value(u.deg),
+                                          observer, distance=hpc.distance.to_value(u.m))
+    on_disk = ~np.isnan(x)
+    assert_quantity_allclose(x[on_disk]*u.m, expected.x[on_disk], atol=1*u.m)
+    assert_quantity_allclose(y[on_disk]*u.m, expected.y[on_disk], atol=1*u.m)
+    assert_quantity_allclose(z[on_disk]*u.m, expected.z[on_disk], atol=1*u.m)
+
+    tx, ty, _ = array_transforms.hcc_to_hpc(x, y, z, observer)
+    np.testing.assert_allclose(tx[on_disk], hpc.Tx.to_value(u.deg)[on_disk], atol=1e-12)
+    np.testing.assert_allclose(ty[on_disk], hpc.Ty.to_value(u.deg)[on_disk], atol=1e-12)
+
+    lon, lat, _ = array_transforms.hcc_to_hgs(x, y, z, observer)
+    x2, y2, z2 = array_transforms.hgs_to_hcc(lon, lat, observer)
+    np.testing.assert_allclose(x2[on_disk], x[on_disk], atol=1)
+    np.testing.assert_allclose(z2[on_disk], z[on_disk], atol=1)
+
+
+def test_float32_and_out(observer, hpc):
+    tx, ty = hpc.Tx.to_value(u.deg), hpc.Ty.to_value(u.deg)
+    lon, lat, _ = array_transforms.hpc_to_hgs(tx, ty, observer)
+
+    out = tuple(np.empty(tx.shape, dtype=np.float32) for _ in range(3))
+    result = array_transforms.hpc_to_hgs(tx.astype(np.float32), ty.astype(np.float32), observer,
+                                         out=out)
+    assert all(r is o for r, o in zip(result, out))
+    np.testing.assert_array_equal(np.isnan(out[0]), np.isnan(lon))
+    on_disk = ~np.isnan(lon)
+    # Near the limb the longitude is very sensitive to the position
+    near_centre = on_disk & (np.hypot(tx, ty) < 0.2)
+    np.testing.assert_allclose(out[0][near_centre], lon[near_centre], atol=1e-4)
+    np.testing.assert_allclose(out[1][on_disk], lat[on_disk], atol=1e-3)
+
+    # Scalars are calculated in double precision
+    assert array_transforms.hpc_to_hgs(0.1, 0.1, observer)[0].dtype == np.float64
+
+    with pytest.raises(ValueError):
+        array_transforms.hpc_to_hgs(tx, ty, observer, out=out[:2])
+    with pytest.raises(ValueError):
+        array_transforms.hpc_to_hgs(tx, ty, observer, dtype=int)
@@ -870,7 +870,8 @@ class Database(object):
                       ignore_already_added)
 
     def add_from_dir(self, path, recursive=False, pattern='*',
-                     ignore_already_added=False, time_string_parse_format=None):
+                     ignore_already_added=False, time_string_parse_format=None,
+                     executor=None, index=None):
         """Search the given directory for FITS files and use their FITS headers
         to add new entries to the database. Note that one entry in the database
         is assigned to a list of FITS headers, so not the number of FITS headers
@@ -905,11 +906,20 @@ class Database(object):
             `~astropy.time.Time.strptime` if `sunpy.time.parse_time` is unable to
             automatically read the `date-obs` metadata.
 
+        executor : `concurrent.futures.Executor`, optional
+            If given, the FITS headers are read concurrently using this
+            executor, see :func:`sunpy.database.tables.entries_from_dir`.
+
+        index : `~sunpy.io.header_index.HeaderIndex`, optional
+            If given, the FITS headers are taken from this index where the
+            files have not changed since they were indexed.
+
         """
         cmds = CompositeOperation()
         entries = tables.entries_from_dir(
             path, recursive, pattern, self.default_waveunit,
-            time_string_parse_format=time_string_parse_format)
+            time_string_parse_format=time_string_parse_format, executor=executor,
+            index=index)
         for database_entry, filepath in entries:
             if database_entry in list(self) and not ignore_already_added:
                 raise EntryAlreadyAddedError(database_entry)
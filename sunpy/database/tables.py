@@ -645,6 +645,17 @@ def entries_from_file(file, default_waveunit=None,
 
     """
     headers = fits.get_header(file)
+    for entry in _entries_from_headers(headers, file, default_waveunit,
+                                       time_string_parse_format):
+        yield entry
+
+
+def _entries_from_headers(headers, file, default_waveunit=None,
+                          time_string_parse_format=''):
+    """
+    Generate the database entries of the FITS ``headers`` of ``file``, see
+    `entries_from_file`.
+    """
     if isinstance(file, str):
         filename = file
     else:
@@ -700,7 +711,8 @@ def entries_from_file(file, default_waveunit=None,
 
 
 def entries_from_dir(fitsdir, recursive=False, pattern='*',
-                     default_waveunit=None, time_string_parse_format=None):
+                     default_waveunit=None, time_string_parse_format=None,
+                     executor=None, index=None):
     """Search the given directory for FITS files and use the corresponding FITS
     headers to generate instances of :class:`DatabaseEntry`. FITS files are
     detected by reading the content of each file, the `pattern` argument may be
@@ -733,6 +745,17 @@ def entries_from_dir(fitsdir, recursive=False, pattern='*',
         `~astropy.time.Time.strptime` if `sunpy.time.parse_time` is unable to
         automatically read the `date-obs` metadata.
 
+    executor : `concurrent.futures.Executor`, optional
+        If given, the headers of the files in each directory are read
+        concurrently using this executor, for example a
+        `concurrent.futures.ThreadPoolExecutor`. The entries are generated in
+        the same order as without an executor.
+
+    index : `~sunpy.io.header_index.HeaderIndex`, optional
+        If given, the headers of the files are taken from this index, and
+        only read from the files which are not in the index or have changed
+        since they were indexed. The index is updated with the files found.
+
     Returns
     -------
     generator of (DatabaseEntry, str) pairs
@@ -754,7 +777,12 @@ def entries_from_dir(fitsdir, recursive=False, pattern='*',
     """
     for dirpath, dirnames, filenames in os.walk(fitsdir):
         filename_paths = (os.path.join(dirpath, name) for name in filenames)
+        fits_paths = []
         for path in fnmatch.filter(filename_paths, pattern):
+            # Files in the index are known to be FITS files
+            if index is not None and path in index:
+                fits_paths.append(path)
+                continue
             try:
                 filetype = sunpy_filetools._detect_filetype(path)
             except (
@@ -762,11 +790,20 @@ def entries_from_dir(fitsdir, recursive=False, pattern='*',
                     sunpy_filetools.InvalidJPEG2000FileExtension):
                 continue
             if filetype == 'fits':
-                for entry in entries_from_file(
-                        path, default_waveunit,
-                        time_string_parse_format=time_string_parse_format
-                ):
-                    yield entry, path
+                fits_paths.append(path)
+        if index is not None:
+            index.update(fits_paths, executor=executor)
+            all_headers = map(index.get_header, fits_paths)
+        elif executor is None:
+            all_headers = map(fits.get_header, fits_paths)
+        else:
+            all_headers = executor.map(fits.get_header, fits_paths)
+        for path, headers in zip(fits_paths, all_headers):
+            for entry in _entries_from_headers(
+                    headers, path, default_waveunit,
+                    time_string_parse_format=time_string_parse_format
+            ):
+                yield entry, path
         if not recursive:
             break
 
@@ -4,6 +4,7 @@
 # the Google Summer of Code (2013).
 
 from collections import Hashable
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 import pytest
@@ -414,6 +415,18 @@ def test_entries_from_dir_recursively_false():
     assert len(entries) == 106
 
 
+def test_entries_from_dir_executor():
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        entries = list(entries_from_dir(testdir, default_waveunit='angstrom',
+                                        time_string_parse_format='%d/%m/%Y',
+                                        executor=executor))
+    expected = list(entries_from_dir(testdir, default_waveunit='angstrom',
+                                     time_string_parse_format='%d/%m/%Y'))
+    assert [path for entry, path in entries] == [path for entry, path in expected]
+    assert ([entry.fits_header_entries for entry, path in entries] ==
+            [entry.fits_header_entries for entry, path in expected])
+
+
 @pytest.mark.remote_data
 def test_entries_from_query_result(query_result):
     entries = list(entries_from_query_result(query_result))
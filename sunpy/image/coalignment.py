@@ -6,7 +6,9 @@ Which is partially inspired by the SSWIDL routine
 `tr_get_disp.pro <http://www.heliodocs.com/php/xdoc_print.php?file=$SSW/trace/idl/util/tr_get_disp.pro>`_.
 
 In this implementation, the template matching is handled via the scikit-image
-routine :func:`skimage.feature.match_template`.
+routine :func:`skimage.feature.match_template`, or by `FFTTemplateMatcher`,
+which calculates the same correlation for many layers at a time reusing the
+Fourier transform of the template.
 
 References
 ----------
@@ -17,23 +19,34 @@ Template matching algorithm:
    Processing and Pattern Recognition Society, Quebec City, Canada, May 15-19,
    1995, p. 120-123 http://www.scribblethink.org/Work/nvisionInterface/vi95_lewis.pdf.
 """
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain, islice
+
 import numpy as np
 from scipy.ndimage.interpolation import shift
 from copy import deepcopy
 from astropy import units as u
 from skimage.feature import match_template
+try:
+    from scipy import fft as scipy_fft
+except ImportError:  # scipy < 1.4, where numpy.fft is used instead
+    scipy_fft = None
 
 # SunPy imports
 import sunpy.map
 from sunpy.map.mapbase import GenericMap
+from sunpy.io.file_tools import DeferredData
 
 
 __all__ = ['calculate_shift', 'clip_edges', 'calculate_clipping',
-           'match_template_to_layer', 'find_best_match_location',
+           'match_template_to_layer', 'FFTTemplateMatcher',
+           'find_best_match_location', 'find_upsampled_correlation_shift',
            'get_correlation_shifts', 'parabolic_turning_point',
            'repair_image_nonfinite', 'apply_shifts',
            'mapsequence_coalign_by_match_template',
-           'calculate_match_template_shift']
+           'calculate_match_template_shift',
+           'calculate_match_template_shift_stream', 'apply_shifts_stream',
+           'coalign_by_match_template_stream']
 
 
 def _default_fmap_function(data):
@@ -195,6 +208,134 @@ def match_template_to_layer(layer, template):
     return match_template(layer, template)
 
 
+class FFTTemplateMatcher(object):
+    """
+    Calculate the correlation arrays of `match_template_to_layer` for many
+    layers using Fourier transforms.
+
+    The template is prepared, and its Fourier transform calculated, once and
+    reused for all the layers, and the layers are transformed in batches with
+    real to complex FFTs which can use several threads. The correlation is
+    the normalised cross-correlation calculated by
+    `skimage.feature.match_template` and agrees with it to within rounding
+    errors.
+
+    Parameters
+    ----------
+    template : `~numpy.ndarray`
+        A numpy array of size (N, M). Non-finite values are repaired with
+        `repair_image_nonfinite`.
+    workers : `int`, optional
+        The number of threads used to calculate the FFTs, passed to
+        `scipy.fft`. Negative values count back from the number of CPUs, so
+        -1 uses all of them. With scipy older than 1.4, which does not have
+        `scipy.fft`, the FFTs are calculated by `numpy.fft` with one thread.
+
+    Examples
+    --------
+    >>> from sunpy.image.coalignment import FFTTemplateMatcher
+    >>> matcher = FFTTemplateMatcher(template, workers=-1)   # doctest: +SKIP
+    >>> correlations = matcher(layers)   # doctest: +SKIP
+    """
+    def __init__(self, template, workers=None):
+        template = repair_image_nonfinite(np.asarray(template, dtype=np.float64))
+        self.template = template
+        self.workers = workers
+        self._template_mean = template.mean()
+        self._template_ssd = np.sum((template - self._template_mean) ** 2)
+        self._template_ffts = {}
+
+    def _template_fft(self, shape):
+        """
+        The complex conjugate of the Fourier transform of the template padded
+        to ``shape``.
+        """
+        if shape not in self._template_ffts:
+            self._template_ffts[shape] = np.conj(self._rfft2(self.template, shape))
+        return self._template_ffts[shape]
+
+    def _rfft2(self, array, shape):
+        if scipy_fft is None:
+            return np.fft.rfft2(array, shape)
+        return scipy_fft.rfft2(array, shape, workers=self.workers)
+
+    def _irfft2(self, array, shape):
+        if scipy_fft is None:
+            return np.fft.irfft2(array, shape)
+        return scipy_fft.irfft2(array, shape, workers=self.workers)
+
+    @staticmethod
+    def _next_fast_len(n):
+        if scipy_fft is None:
+            from scipy.fftpack import next_fast_len
+            return next_fast_len(n)
+        return scipy_fft.next_fast_len(n, True)
+
+    def __call__(self, layers):
+        """
+        Calculate the correlation arrays.
+
+        Parameters
+        ----------
+        layers : `~numpy.ndarray`
+            A numpy array of size (ny, nx), or a stack of layers of size
+            (nt, ny, nx), where N < ny and M < nx.
+
+        Returns
+        -------
+        correlationarray : `~numpy.ndarray`
+            The correlation arrays of size (ny - N + 1, nx - M + 1), or
+            (nt, ny - N + 1, nx - M + 1) for a stack of layers.
+        """
+        layers = np.asarray(layers, dtype=np.float64)
+        ny, nx = layers.shape[-2:]
+        n, m = self.template.shape
+        if n > ny or m > nx:
+            raise ValueError("Image must be larger than template.")
+
+        # The circular cross-correlation of the layers padded to at least
+        # their size does not wrap around for the positions of the template
+        # within the layers.
+        shape = (self._next_fast_len(ny), self._next_fast_len(nx))
+        product = self._rfft2(layers, shape)
+        product *= self._template_fft(shape)
+        xcorr = self._irfft2(product, shape)
+        xcorr = xcorr[..., :ny - n + 1, :nx - m + 1]
+
+        # Sums of the layers and their squares over the template windows
+        window_sum = _window_sum(layers, (n, m))
+        window_sum2 = _window_sum(layers ** 2, (n, m))
+
+        numerator = xcorr - window_sum * self._template_mean
+
+        denominator = window_sum2
+        denominator -= window_sum ** 2 / (n * m)
+        denominator *= self._template_ssd
+        np.maximum(denominator, 0, out=denominator)
+        np.sqrt(denominator, out=denominator)
+
+        response = np.zeros_like(xcorr)
+        mask = denominator > np.finfo(np.float64).eps
+        response[mask] = numerator[mask] / denominator[mask]
+        return response
+
+
+def _window_sum(image, window_shape):
+    """
+    Sum the last two axes of ``image`` over all the windows of
+    ``window_shape`` which lie within it, using cumulative sums.
+    """
+    for width in reversed(window_shape):
+        # Sum over the windows along the last axis, and then swap the last two
+        # axes to do the same for the other one.
+        total = np.cumsum(image, axis=-1)
+        image = np.empty(total.shape[:-1] + (total.shape[-1] - width + 1,))
+        image[..., 0] = total[..., width - 1]
+        np.subtract(total[..., width:], total[..., :-width], out=image[..., 1:])
+        image = np.swapaxes(image, -1, -2)
+    return image
+
+
 def find_best_match_location(corr):
     """
     Calculate an estimate of the location of the peak of the correlation
@@ -228,6 +369,60 @@ def find_best_match_location(corr):
     return y_shift_relative_to_correlation_array, x_shift_relative_to_correlation_array
 
 
+def find_upsampled_correlation_shift(window, template, upsample_factor, template_fft=None,
+                                     normalization=None):
+    """
+    Calculate the subpixel shift of a window of a layer relative to the
+    template by cross-correlation or phase correlation.
+
+    The peak of the correlation within one pixel of zero shift is found to a
+    precision of ``1 / upsample_factor`` pixels by evaluating its Fourier
+    series on an upsampled grid, following Guizar-Sicairos et al., Optics
+    Letters 33, 156 (2008). This is used to refine the location of the
+    maximum of the correlation array, with the window being the part of the
+    layer the template is found to match to the nearest pixel.
+
+    Parameters
+    ----------
+    window : `~numpy.ndarray`
+        A numpy array of the same size (N, M) as the template.
+    template : `~numpy.ndarray`
+        A numpy array of size (N, M).
+    upsample_factor : `int`
+        The shift is found to within ``1 / upsample_factor`` pixels.
+    template_fft : `~numpy.ndarray`, optional
+        The complex conjugate of the Fourier transform of the template, which
+        can be given to avoid calculating it again for many windows.
+    normalization : {None | 'phase'}
+        If 'phase', the cross-power spectrum is normalised to give the phase
+        correlation, which is sharper but more sensitive to noise. Smooth
+        images are better matched with the default cross-correlation.
+
+    Returns
+    -------
+    shift : `~astropy.units.Quantity`
+        The shift amounts (y, x) of the window relative to the template, in
+        image pixels.
+    """
+    if template_fft is None:
+        template_fft = np.conj(np.fft.fft2(template))
+
+    cross_power = np.fft.fft2(window) * template_fft
+    if normalization == 'phase':
+        cross_power /= np.maximum(np.abs(cross_power), np.finfo(np.float64).tiny)
+    elif normalization is not None:
+        raise ValueError("normalization must be None or 'phase'.")
+
+    # Evaluate the inverse transform at shifts between -1 and 1 pixels
+    shifts = np.arange(-upsample_factor, upsample_factor + 1) / upsample_factor
+    kernels = [np.exp(2j * np.pi * np.outer(shifts, np.fft.fftfreq(size)))
+               for size in window.shape]
+    correlation = (kernels[0] @ cross_power @ kernels[1].T).real
+
+    iy, ix = np.unravel_index(np.argmax(correlation), correlation.shape)
+    return shifts[iy] * u.pix, shifts[ix] * u.pix
+
+
 def get_correlation_shifts(array):
     """
     Estimate the location of the maximum of a fit to the input array.  The
@@ -347,8 +542,16 @@ def repair_image_nonfinite(image):
     return repaired_image
 
 
+def _shift_layer(data, yshift, xshift, kwargs):
+    """
+    Shift a layer with `scipy.ndimage.interpolation.shift`, for use with an
+    executor.
+    """
+    return shift(data, [yshift, xshift], **kwargs)
+
+
 @u.quantity_input(yshift=u.pix, xshift=u.pix)
-def apply_shifts(mc, yshift, xshift, clip=True, **kwargs):
+def apply_shifts(mc, yshift, xshift, clip=True, executor=None, **kwargs):
     """
     Apply a set of pixel shifts to a `~sunpy.map.MapSequence`, and return a new
     `~sunpy.map.MapSequence`.
@@ -370,6 +573,12 @@ def apply_shifts(mc, yshift, xshift, clip=True, **kwargs):
         If True, then clip off x, y edges of the maps in the sequence that are
         potentially affected by edges effects.
 
+    executor : `concurrent.futures.Executor`, optional
+        If given, the layers are shifted concurrently using this executor,
+        for example a `concurrent.futures.ThreadPoolExecutor` or a
+        `concurrent.futures.ProcessPoolExecutor` with the number of workers
+        to use. The order of the layers is unchanged.
+
     All other keywords are passed to `scipy.ndimage.interpolation.shift`.
 
     Returns
@@ -377,37 +586,75 @@ def apply_shifts(mc, yshift, xshift, clip=True, **kwargs):
     newmapsequence : `sunpy.map.MapSequence`
         A `~sunpy.map.MapSequence` of the same shape as the input.  All layers in
         the `~sunpy.map.MapSequence` have been shifted according the input shifts.
+        If all the layers have the same shape, their data are views of a
+        single (nt, ny, nx) array.
     """
-    # New mapsequence will be constructed from this list
-    new_mc = []
+    maps = list(mc)
+    nt = len(maps)
+    yshift = yshift.to_value(u.pix)
+    xshift = xshift.to_value(u.pix)
 
     # Calculate the clipping
     if clip:
-        yclips, xclips = calculate_clipping(-yshift, -xshift)
+        yclips, xclips = calculate_clipping(-yshift * u.pix, -xshift * u.pix)
+
+    # The shifted layers are written into a preallocated cube if they all
+    # have the same shape. Only threads can write to it directly, other
+    # executors return the shifted layers, which are then copied into it.
+    shapes = set(m.data.shape for m in maps)
+    if len(shapes) == 1:
+        cube = np.empty((nt,) + shapes.pop(), dtype=np.result_type(*[m.data for m in maps]))
+    else:
+        cube = [None] * nt
+    in_place = not isinstance(cube, list) and (executor is None or
+                                               isinstance(executor, ThreadPoolExecutor))
+
+    def shift_layer(i):
+        if in_place:
+            shift(maps[i].data, [yshift[i], xshift[i]], output=cube[i], **kwargs)
+        else:
+            cube[i] = shift(maps[i].data, [yshift[i], xshift[i]], **kwargs)
+
+    if executor is None:
+        list(map(shift_layer, range(nt)))
+    elif in_place:
+        list(executor.map(shift_layer, range(nt)))
+    else:
+        shifted = executor.map(_shift_layer, [m.data for m in maps], yshift, xshift,
+                               [kwargs] * nt)
+        for i, shifted_data in enumerate(shifted):
+            cube[i] = shifted_data
 
-    # Shift the data and construct the mapsequence
-    for i, m in enumerate(mc):
-        shifted_data = shift(deepcopy(m.data), [yshift[i].value, xshift[i].value], **kwargs)
-        new_meta = deepcopy(m.meta)
-        # Clip if required.  Use the submap function to return the appropriate
-        # portion of the data.
-        if clip:
-            shifted_data = clip_edges(shifted_data, yclips, xclips)
-            new_meta['naxis1'] = shifted_data.shape[1]
-            new_meta['naxis2'] = shifted_data.shape[0]
-            new_meta['crpix1'] = m.reference_pixel.x.value + xshift[i].value - xshift[0].value
-            new_meta['crpix2'] = m.reference_pixel.y.value + yshift[i].value - yshift[0].value
-
-        new_map = sunpy.map.Map(shifted_data, new_meta)
-
-        # Append to the list
-        new_mc.append(new_map)
+    # Construct the mapsequence
+    clips = (yclips, xclips) if clip else None
+    new_mc = [_shifted_map(m, cube[i], yshift[i] - yshift[0], xshift[i] - xshift[0], clips)
+              for i, m in enumerate(maps)]
 
     return sunpy.map.Map(new_mc, sequence=True)
 
 
+def _shifted_map(m, shifted_data, yoffset, xoffset, clips):
+    """
+    Create the map of the shifted data of the map ``m``, clipping the edges
+    if ``clips`` gives the ([y0, y1], [x0, x1]) clipping.  The offsets are
+    the pixel shifts relative to the first layer, which are added to the
+    reference pixel of clipped maps.
+    """
+    new_meta = deepcopy(m.meta)
+    # Clip if required.
+    if clips is not None:
+        shifted_data = clip_edges(shifted_data, *clips)
+        new_meta['naxis1'] = shifted_data.shape[1]
+        new_meta['naxis2'] = shifted_data.shape[0]
+        new_meta['crpix1'] = m.reference_pixel.x.value + xoffset
+        new_meta['crpix2'] = m.reference_pixel.y.value + yoffset
+
+    return m._new_instance(shifted_data, new_meta, m.plot_settings)
+
+
 def calculate_match_template_shift(mc, template=None, layer_index=0,
-                                   func=_default_fmap_function):
+                                   func=_default_fmap_function, backend='skimage',
+                                   upsample_factor=None, executor=None, normalization=None):
     """
     Calculate the arcsecond shifts necessary to co-register the layers in a
     `~sunpy.map.MapSequence` according to a template taken from that
@@ -446,27 +693,45 @@ def calculate_match_template_shift(mc, template=None, layer_index=0,
         func = F(data).  The default function ensures that the data are
         floats.
 
+    backend : {'skimage' | 'fft' | `FFTTemplateMatcher`}
+        How the correlation of the template with the layers is calculated.
+        'skimage' uses `match_template_to_layer` for each layer, while 'fft'
+        uses a `FFTTemplateMatcher` using all the CPUs, which is much faster
+        for long sequences. A `FFTTemplateMatcher` of the template can also be
+        passed, for example to choose the number of threads it uses.
+
+    upsample_factor : {None | int}
+        If None, the location of the best match is estimated to subpixel
+        precision with `find_best_match_location`. Otherwise it is refined
+        by the upsampled cross-correlation of the template and the part of
+        the layer it matches, using `find_upsampled_correlation_shift`, to a
+        precision of 1 / upsample_factor pixels.
+
+    executor : `concurrent.futures.Executor`, optional
+        If given, the layers are matched to the template concurrently using
+        this executor, for example a `concurrent.futures.ThreadPoolExecutor`
+        or a `concurrent.futures.ProcessPoolExecutor` with the number of
+        workers to use. The function ``func`` must be picklable to use a
+        process pool.
+
+    normalization : {None | 'phase'}
+        If 'phase', the shifts are refined by phase correlation rather than
+        cross-correlation when ``upsample_factor`` is given, see
+        `find_upsampled_correlation_shift`.
     """
 
+    if normalization not in (None, 'phase'):
+        raise ValueError("normalization must be None or 'phase'.")
+
     # Size of the data
     ny = mc.maps[layer_index].data.shape[0]
     nx = mc.maps[layer_index].data.shape[1]
     nt = len(mc.maps)
 
-    # Calculate a template.  If no template is passed then define one
-    # from the index layer.
-    if template is None:
-        tplate = mc.maps[layer_index].data[int(ny/4): int(3*ny/4),
-                                           int(nx/4): int(3*nx/4)]
-    elif isinstance(template, GenericMap):
-        tplate = template.data
-    elif isinstance(template, np.ndarray):
-        tplate = template
-    else:
-        raise ValueError('Invalid template.')
-
-    # Apply the function to the template
-    tplate = func(tplate)
+    # With an executor the FFTs of each batch of layers use one thread
+    tplate, backend = _template_and_backend(template, lambda: mc.maps[layer_index].data,
+                                            func, backend,
+                                            workers=-1 if executor is None else None)
 
     # Storage for the pixel shift
     xshift_keep = np.zeros(nt) * u.pix
@@ -476,15 +741,25 @@ def calculate_match_template_shift(mc, template=None, layer_index=0,
     xshift_arcseconds = np.zeros(nt) * u.arcsec
     yshift_arcseconds = np.zeros_like(xshift_arcseconds)
 
-    # Match the template and calculate shifts
-    for i, m in enumerate(mc.maps):
-        # Get the next 2-d data array
-        this_layer = func(m.data)
-
-        # Calculate the y and x shifts in pixels
-        yshift, xshift = calculate_shift(this_layer, tplate)
+    # Match the template and calculate shifts. The FFT backend correlates
+    # batches of layers of about 16 million pixels at a time, or 4 million
+    # pixels with an executor so that there are more batches to share out.
+    if backend == 'skimage':
+        batch_size = 1
+    else:
+        batch_size = max((2**24 if executor is None else 2**22) // (ny * nx), 1)
+    batches = [[m.data for m in mc.maps[start:start + batch_size]]
+               for start in range(0, nt, batch_size)]
+    nbatches = len(batches)
+    args = (batches, [tplate] * nbatches, [backend] * nbatches, [func] * nbatches,
+            [upsample_factor] * nbatches, [normalization] * nbatches)
+    if executor is None:
+        locations = map(_match_template_batch, *args)
+    else:
+        locations = executor.map(_match_template_batch, *args)
 
-        # Keep shifts in pixels
+    # Keep shifts in pixels
+    for i, (yshift, xshift) in enumerate(chain.from_iterable(locations)):
         yshift_keep[i] = yshift
         xshift_keep[i] = xshift
 
@@ -501,10 +776,79 @@ def calculate_match_template_shift(mc, template=None, layer_index=0,
     return {"x": xshift_arcseconds, "y": yshift_arcseconds}
 
 
+def _template_and_backend(template, layer_data, func, backend, workers):
+    """
+    Return the template, with ``func`` applied and any non-finite values
+    repaired, and the backend which correlates it with the layers, for
+    `calculate_match_template_shift` and
+    `calculate_match_template_shift_stream`. ``layer_data`` is a function
+    returning the data of the layer the template is taken from if no
+    template is given, and ``workers`` the number of threads of a
+    `FFTTemplateMatcher` created for the 'fft' backend.
+    """
+    # Calculate a template.  If no template is passed then define one
+    # from the index layer, keeping a copy so that the layer can be released.
+    if template is None:
+        data = layer_data()
+        ny, nx = data.shape
+        tplate = np.array(data[int(ny/4): int(3*ny/4), int(nx/4): int(3*nx/4)])
+        del data
+    elif isinstance(template, GenericMap):
+        tplate = template.data
+    elif isinstance(template, np.ndarray):
+        tplate = template
+    else:
+        raise ValueError('Invalid template.')
+
+    # Apply the function to the template
+    tplate = func(tplate)
+
+    if backend == 'fft':
+        backend = FFTTemplateMatcher(tplate, workers=workers)
+    elif backend != 'skimage' and not isinstance(backend, FFTTemplateMatcher):
+        raise ValueError("backend must be 'skimage', 'fft' or a FFTTemplateMatcher.")
+    # Repair any NANs, Infs, etc in the template
+    return repair_image_nonfinite(tplate), backend
+
+
+def _match_template_batch(layers, template, backend, func, upsample_factor,
+                          normalization=None):
+    """
+    Return the locations (y, x) of the best match of the template in each of
+    the layers, for `calculate_match_template_shift`.
+    """
+    # Get the 2-d data arrays
+    layers = [repair_image_nonfinite(func(layer)) for layer in layers]
+    if backend == 'skimage':
+        corrs = [match_template_to_layer(layer, template) for layer in layers]
+    elif len(set(layer.shape for layer in layers)) == 1:
+        corrs = backend(np.stack(layers))
+    else:
+        corrs = [backend(layer) for layer in layers]
+    if upsample_factor is not None:
+        template_fft = np.conj(np.fft.fft2(template))
+
+    # Calculate the y and x locations in pixels
+    locations = []
+    for layer, corr in zip(layers, corrs):
+        if upsample_factor is None:
+            locations.append(find_best_match_location(corr))
+        else:
+            iy, ix = np.unravel_index(np.argmax(corr), corr.shape)
+            window = layer[iy:iy + template.shape[0], ix:ix + template.shape[1]]
+            yshift, xshift = find_upsampled_correlation_shift(window, template,
+                                                              upsample_factor, template_fft,
+                                                              normalization=normalization)
+            locations.append((yshift + iy * u.pix, xshift + ix * u.pix))
+    return locations
+
+
 # Coalignment by matching a template
 def mapsequence_coalign_by_match_template(mc, template=None, layer_index=0,
                                           func=_default_fmap_function, clip=True,
-                                          shift=None, **kwargs):
+                                          shift=None, backend='skimage',
+                                          upsample_factor=None, executor=None,
+                                          normalization=None, **kwargs):
     """
     Co-register the layers in a `~sunpy.map.MapSequence` according to a template
     taken from that `~sunpy.map.MapSequence`.  This method REQUIRES that
@@ -554,6 +898,22 @@ def mapsequence_coalign_by_match_template(mc, template=None, layer_index=0,
         `~sunpy.map.MapSequence`.  If a shift is passed in to the function, that
         shift is applied to the input `~sunpy.map.MapSequence` and the template
         matching algorithm is not used.
+    backend : {'skimage' | 'fft' | `FFTTemplateMatcher`}
+        How the correlation of the template with the layers is calculated,
+        see `calculate_match_template_shift`.
+    upsample_factor : {None | int}
+        If given, the template matches are refined by an upsampled
+        cross-correlation to a precision of 1 / upsample_factor pixels, see
+        `calculate_match_template_shift`.
+    executor : `concurrent.futures.Executor`, optional
+        If given, the layers are matched to the template and shifted
+        concurrently using this executor, for example a
+        `concurrent.futures.ThreadPoolExecutor` or a
+        `concurrent.futures.ProcessPoolExecutor` with the number of workers
+        to use.
+    normalization : {None | 'phase'}
+        If 'phase', the template matches are refined by phase correlation
+        rather than cross-correlation, see `calculate_match_template_shift`.
 
     The remaining keyword arguments are sent to `sunpy.image.coalignment.apply_shifts`.
 
@@ -572,6 +932,7 @@ def mapsequence_coalign_by_match_template(mc, template=None, layer_index=0,
     >>> coaligned_mc = mc_coalign(mc, template=sunpy_map)   # doctest: +SKIP
     >>> coaligned_mc = mc_coalign(mc, template=two_dimensional_ndarray)   # doctest: +SKIP
     >>> coaligned_mc = mc_coalign(mc, func=np.log)   # doctest: +SKIP
+    >>> coaligned_mc = mc_coalign(mc, backend='fft')   # doctest: +SKIP
     """
 
     # Number of maps
@@ -584,7 +945,10 @@ def mapsequence_coalign_by_match_template(mc, template=None, layer_index=0,
     if shift is None:
         shifts = calculate_match_template_shift(mc, template=template,
                                                 layer_index=layer_index,
-                                                func=func)
+                                                func=func, backend=backend,
+                                                upsample_factor=upsample_factor,
+                                                executor=executor,
+                                                normalization=normalization)
         xshift_arcseconds = shifts['x']
         yshift_arcseconds = shifts['y']
     else:
@@ -597,4 +961,312 @@ def mapsequence_coalign_by_match_template(mc, template=None, layer_index=0,
         yshift_keep[i] = (yshift_arcseconds[i] / m.scale[1])
 
     # Apply the shifts and return the coaligned mapsequence
-    return apply_shifts(mc, -yshift_keep, -xshift_keep, clip=clip, **kwargs)
+    return apply_shifts(mc, -yshift_keep, -xshift_keep, clip=clip, executor=executor, **kwargs)
+
+
+def _load_map(item, map_kwargs):
+    """
+    Return ``item`` if it is a map, otherwise read the map from it with
+    `sunpy.map.Map`.
+    """
+    if isinstance(item, GenericMap):
+        return item
+    return sunpy.map.Map(item, **map_kwargs)
+
+
+def _map_data(m):
+    """
+    The data of the map ``m``, read without keeping them on the map if it
+    was loaded lazily.
+    """
+    if isinstance(m.data, DeferredData):
+        return m.data.read()
+    return m.data
+
+
+def _iterate_maps(maps):
+    """
+    Return a new iterator over ``maps``, which is either an iterable or a
+    function returning an iterable.
+    """
+    return iter(maps() if callable(maps) else maps)
+
+
+def _check_reiterable(maps):
+    """
+    Raise a `TypeError` if ``maps`` can only be iterated over once.
+    """
+    if not callable(maps) and iter(maps) is maps:
+        raise TypeError("The maps are iterated over more than once, so they can not be "
+                        "given as an iterator. Give a list of file paths or maps, or a "
+                        "function returning a new iterator over the maps.")
+
+
+def _match_template_pixel_shifts(maps, template, layer_index, func, backend,
+                                 upsample_factor, normalization, map_kwargs):
+    """
+    Return the y and x pixel shifts of each of the re-iterable ``maps``
+    relative to the map indexed by ``layer_index``, and the (nt, 2) array of
+    the x and y scales of the maps in arcseconds per pixel, for
+    `calculate_match_template_shift_stream`.
+    """
+    def layer_data():
+        index = layer_index
+        if index < 0:
+            index += sum(1 for _ in _iterate_maps(maps))
+        items = islice(_iterate_maps(maps), index, None)
+        return _map_data(_load_map(next(items), map_kwargs))
+
+    tplate, backend = _template_and_backend(template, layer_data, func, backend, workers=-1)
+
+    yshift_keep = []
+    xshift_keep = []
+    scales = []
+
+    # Match the template to batches of layers read one map at a time, with
+    # the batch size chosen as in calculate_match_template_shift.
+    batch = []
+    items = _iterate_maps(maps)
+    item = next(items, None)
+    while item is not None:
+        m = _load_map(item, map_kwargs)
+        scales.append((m.scale[0].to_value(u.arcsec / u.pix),
+                       m.scale[1].to_value(u.arcsec / u.pix)))
+        batch.append(_map_data(m))
+        del m
+        item = next(items, None)
+        if backend == 'skimage':
+            batch_size = 1
+        else:
+            batch_size = max(2**24 // batch[0].size, 1)
+        if len(batch) == batch_size or item is None:
+            for yshift, xshift in _match_template_batch(batch, tplate, backend, func,
+                                                        upsample_factor, normalization):
+                yshift_keep.append(yshift.to_value(u.pix))
+                xshift_keep.append(xshift.to_value(u.pix))
+            batch = []
+
+    # Calculate shifts relative to the template layer
+    yshift_keep = np.array(yshift_keep)
+    xshift_keep = np.array(xshift_keep)
+    yshift_keep -= yshift_keep[layer_index]
+    xshift_keep -= xshift_keep[layer_index]
+    return yshift_keep, xshift_keep, np.array(scales)
+
+
+def calculate_match_template_shift_stream(maps, template=None, layer_index=0,
+                                          func=_default_fmap_function, backend='skimage',
+                                          upsample_factor=None, map_kwargs=None,
+                                          normalization=None):
+    """
+    Calculate the arcsecond shifts necessary to co-register a series of maps
+    according to a template, reading the maps one at a time.
+
+    This calculates the same shifts as `calculate_match_template_shift`
+    without holding all the maps in memory: only the template and the
+    layers of the batch being matched are kept, and the shifts can be passed
+    to `apply_shifts_stream` or `coalign_by_match_template_stream`.
+
+    Parameters
+    ----------
+    maps : iterable or function
+        The maps, or the file paths of the maps, in order. File paths are
+        read with `sunpy.map.Map` as they are needed, and the data of lazily
+        loaded maps are read without being kept on the maps. The maps are
+        iterated over twice if no template is given, so instead of an
+        iterator, give a function which returns a new iterator over the maps
+        each time it is called.
+
+    template : {None | `~sunpy.map.Map` | `~numpy.ndarray`}
+        The template used in the matching.  If None, the central part of the
+        map indexed by ``layer_index`` is used.
+
+    layer_index : int
+        The shifts of all the maps are relative to the map indexed by the
+        value of "layer_index".
+
+    func : function
+        A function which is applied to the data values before the coalignment
+        method is applied, see `calculate_match_template_shift`.
+
+    backend : {'skimage' | 'fft' | `FFTTemplateMatcher`}
+        How the correlation of the template with the layers is calculated,
+        see `calculate_match_template_shift`.
+
+    upsample_factor : {None | int}
+        If given, the template matches are refined by an upsampled
+        cross-correlation to a precision of 1 / upsample_factor pixels, see
+        `calculate_match_template_shift`.
+
+    map_kwargs : dict, optional
+        Keyword arguments passed to `sunpy.map.Map` when reading the maps
+        from files, for example ``{'memmap': True}``.
+
+    normalization : {None | 'phase'}
+        If 'phase', the template matches are refined by phase correlation
+        rather than cross-correlation, see `calculate_match_template_shift`.
+
+    Returns
+    -------
+    shifts : dict
+        A dictionary with keys 'x' and 'y' of the shifts of each map in
+        arcseconds, as returned by `calculate_match_template_shift`.
+    """
+    if normalization not in (None, 'phase'):
+        raise ValueError("normalization must be None or 'phase'.")
+    if template is None:
+        _check_reiterable(maps)
+    map_kwargs = {} if map_kwargs is None else map_kwargs
+    yshift, xshift, scales = _match_template_pixel_shifts(maps, template, layer_index, func,
+                                                          backend, upsample_factor,
+                                                          normalization, map_kwargs)
+    return {"x": xshift * scales[:, 0] * u.arcsec,
+            "y": yshift * scales[:, 1] * u.arcsec}
+
+
+@u.quantity_input(yshift=u.pix, xshift=u.pix)
+def apply_shifts_stream(maps, yshift, xshift, clip=True, map_kwargs=None, **kwargs):
+    """
+    Apply a set of pixel shifts to a series of maps, reading and yielding the
+    shifted maps one at a time.
+
+    This is the streaming equivalent of `apply_shifts`. The clipping is
+    calculated from all the shifts before any map is shifted, so all the
+    maps are clipped consistently and have the same shape.
+
+    Parameters
+    ----------
+    maps : iterable or function
+        The maps, or the file paths of the maps, in order, or a function
+        returning an iterator over them. File paths are read with
+        `sunpy.map.Map` as they are needed, and the data of lazily loaded
+        maps are read without being kept on the maps.
+
+    yshift : `~astropy.units.Quantity` instance
+        An array of pixel shifts in the y-direction for each map.
+
+    xshift : `~astropy.units.Quantity` instance
+        An array of pixel shifts in the x-direction for each map.
+
+    clip : bool
+        If True, then clip off x, y edges of the maps that are potentially
+        affected by edges effects.
+
+    map_kwargs : dict, optional
+        Keyword arguments passed to `sunpy.map.Map` when reading the maps
+        from files.
+
+    All other keywords are passed to `scipy.ndimage.interpolation.shift`.
+
+    Yields
+    ------
+    `~sunpy.map.GenericMap`
+        The shifted maps, in the order of the input.
+    """
+    map_kwargs = {} if map_kwargs is None else map_kwargs
+    yshift = yshift.to_value(u.pix)
+    xshift = xshift.to_value(u.pix)
+
+    clips = None
+    if clip:
+        clips = calculate_clipping(-yshift * u.pix, -xshift * u.pix)
+
+    for i, item in enumerate(_iterate_maps(maps)):
+        m = _load_map(item, map_kwargs)
+        shifted_data = shift(_map_data(m), [yshift[i], xshift[i]], **kwargs)
+        yield _shifted_map(m, shifted_data, yshift[i] - yshift[0], xshift[i] - xshift[0], clips)
+
+
+def coalign_by_match_template_stream(maps, template=None, layer_index=0,
+                                     func=_default_fmap_function, clip=True, shift=None,
+                                     backend='skimage', upsample_factor=None,
+                                     map_kwargs=None, normalization=None, **kwargs):
+    """
+    Co-register a series of maps according to a template, reading and
+    yielding the coaligned maps one at a time.
+
+    This is the streaming equivalent of
+    `mapsequence_coalign_by_match_template`, for series of maps too long to
+    hold in memory. The maps are read twice: once to calculate the shifts,
+    as `calculate_match_template_shift_stream` does, or to read the scales of
+    the maps if the shifts are given, and once by `apply_shifts_stream` to
+    shift them. Only the template, the shifts and the maps being processed
+    are kept in memory.
+
+    Parameters
+    ----------
+    maps : iterable or function
+        The maps, or the file paths of the maps, in order. As they are
+        iterated over twice, an iterator can not be used; instead give a
+        function which returns a new iterator over the maps each time it is
+        called.
+    template : {None | sunpy.map.Map | `~numpy.ndarray`}
+        The template used in the matching, see
+        `calculate_match_template_shift_stream`.
+    layer_index : int
+        The shifts of all the maps are relative to the map indexed by the
+        value of "layer_index".
+    func : function
+        A function which is applied to the data values before the coalignment
+        method is applied, see `mapsequence_coalign_by_match_template`.
+    clip : bool
+        If True, then clip off x, y edges of the maps that are potentially
+        affected by edges effects.
+    shift : dict
+        A dictionary with two keys, 'x' and 'y', of the shifts in arcseconds
+        to apply to the maps, as returned by
+        `calculate_match_template_shift_stream`.  If given, the template
+        matching algorithm is not used.
+    backend : {'skimage' | 'fft' | `FFTTemplateMatcher`}
+        How the correlation of the template with the layers is calculated,
+        see `calculate_match_template_shift`.
+    upsample_factor : {None | int}
+        If given, the template matches are refined by an upsampled
+        cross-correlation to a precision of 1 / upsample_factor pixels, see
+        `calculate_match_template_shift`.
+    map_kwargs : dict, optional
+        Keyword arguments passed to `sunpy.map.Map` when reading the maps
+        from files, for example ``{'memmap': True}``.
+    normalization : {None | 'phase'}
+        If 'phase', the template matches are refined by phase correlation
+        rather than cross-correlation, see `calculate_match_template_shift`.
+
+    The remaining keyword arguments are sent to `scipy.ndimage.interpolation.shift`.
+
+    Returns
+    -------
+    output : generator
+        A generator of the coaligned maps, in the order of the input, which
+        reads and shifts each map as it is requested.
+
+    Examples
+    --------
+    >>> from sunpy.image.coalignment import coalign_by_match_template_stream
+    >>> for i, m in enumerate(coalign_by_match_template_stream(files)):   # doctest: +SKIP
+    ...     m.save('coaligned_{:05d}.fits'.format(i))   # doctest: +SKIP
+    """
+    if normalization not in (None, 'phase'):
+        raise ValueError("normalization must be None or 'phase'.")
+    _check_reiterable(maps)
+    map_kwargs = {} if map_kwargs is None else map_kwargs
+
+    # The clipping needs the pixel shifts of all the maps before any of them
+    # is shifted.
+    if shift is None:
+        yshift_keep, xshift_keep, _ = _match_template_pixel_shifts(
+            maps, template, layer_index, func, backend, upsample_factor, normalization,
+            map_kwargs)
+    else:
+        # These only need the scales of the maps, so only the headers of
+        # files are read.
+        yshift_keep = []
+        xshift_keep = []
+        for i, item in enumerate(_iterate_maps(maps)):
+            m = _load_map(item, dict(map_kwargs, lazy=True))
+            yshift_keep.append((shift['y'][i] / m.scale[1]).to_value(u.pix))
+            xshift_keep.append((shift['x'][i] / m.scale[0]).to_value(u.pix))
+        yshift_keep = np.array(yshift_keep)
+        xshift_keep = np.array(xshift_keep)
+
+    return apply_shifts_stream(maps, -yshift_keep * u.pix, -xshift_keep * u.pix, clip=clip,
+                               map_kwargs=map_kwargs, **kwargs)
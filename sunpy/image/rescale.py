@@ -81,34 +81,24 @@ def resample(orig, dimensions, method='linear', center=False, minusone=False):
 def _resample_nearest_linear(orig, dimensions, method, offset, m1):
     """Resample Map using either linear or nearest interpolation."""
 
-    dimlist = []
-
-    # calculate new dims
-    for i in range(orig.ndim):
+    new_data = orig
+
+    # One 1-D interpolation along each axis, skipping axes whose size does not
+    # change (the interpolation points are then the original pixels), so that
+    # a stack of images can be resampled along its image axes only.
+    for i in range(orig.ndim - 1, -1, -1):
+        if dimensions[i] == orig.shape[i]:
+            continue
         base = np.arange(dimensions[i])
-        dimlist.append((orig.shape[i] - m1) / (dimensions[i] - m1) *
-                       (base + offset) - offset)
-
-    # specify old coordinates
-    old_coords = [np.arange(i, dtype=np.float) for i in orig.shape]
+        new_coords = (orig.shape[i] - m1) / (dimensions[i] - m1) * (base + offset) - offset
+        old_coords = np.arange(orig.shape[i], dtype=np.float64)
 
-    # first interpolation - for ndims = any
-    mint = scipy.interpolate.interp1d(old_coords[-1], orig, bounds_error=False,
-                                      fill_value=min(old_coords[-1]), kind=method)
+        mint = scipy.interpolate.interp1d(old_coords, new_data, axis=i, bounds_error=False,
+                                          fill_value=min(old_coords), kind=method)
+        new_data = mint(new_coords)
 
-    new_data = mint(dimlist[-1])
-
-    trorder = [orig.ndim - 1] + list(range(orig.ndim - 1))
-    for i in range(orig.ndim - 2, -1, -1):
-        new_data = new_data.transpose(trorder)
-
-        mint = scipy.interpolate.interp1d(old_coords[i], new_data,
-                                          bounds_error=False, fill_value=min(old_coords[i]), kind=method)
-        new_data = mint(dimlist[i])
-
-    if orig.ndim > 1:
-        # need one more transpose to return to original dimensions
-        new_data = new_data.transpose(trorder)
+    if new_data is orig:
+        new_data = orig.copy()
 
     return new_data
 
@@ -120,12 +110,11 @@ def _resample_neighbor(orig, dimensions, offset, m1):
     dimensions = np.asarray(dimensions, dtype=int)
 
     for i in range(orig.ndim):
-        base = np.indices(dimensions)[i]
-        dimlist.append((orig.shape[i] - m1) / (dimensions[i] - m1) *
-                       (base + offset) - offset)
-    cd = np.array(dimlist).round().astype(int)
+        base = np.arange(dimensions[i])
+        dimlist.append(((orig.shape[i] - m1) / (dimensions[i] - m1) *
+                        (base + offset) - offset).round().astype(int))
 
-    return orig[list(cd)]
+    return orig[np.ix_(*dimlist)]
 
 
 def _resample_spline(orig, dimensions, offset, m1):
@@ -137,7 +126,7 @@ def _resample_spline(orig, dimensions, offset, m1):
     nslices = [slice(0, j) for j in list(dimensions)]
     newcoords = np.mgrid[nslices]
 
-    newcoords_dims = list(range(np.rank(newcoords)))
+    newcoords_dims = list(range(np.ndim(newcoords)))
 
     # make first index last
     newcoords_dims.append(newcoords_dims.pop(0))
@@ -193,7 +182,9 @@ def reshape_image_to_4d_superpixel(img, dimensions, offset):
     Parameters
     ----------
     img : `numpy.ndarray`
-        A two-dimensional `~numpy.ndarray` of the form (y, x).
+        A two-dimensional `~numpy.ndarray` of the form (y, x). Arrays with
+        more dimensions are treated as a stack of images in the last two
+        dimensions, and the leading dimensions are kept in the output.
 
     dimensions : array-like
         A two element array-like object containing integers that describe the
@@ -207,7 +198,8 @@ def reshape_image_to_4d_superpixel(img, dimensions, offset):
     Returns
     -------
     A four dimensional `~numpy.ndarray` that can be used to easily create
-    two-dimensional arrays of superpixels of the input image.
+    two-dimensional arrays of superpixels of the input image. For a stack of
+    images, the four superpixel dimensions follow the leading dimensions.
 
     References
     ----------
@@ -219,13 +211,14 @@ def reshape_image_to_4d_superpixel(img, dimensions, offset):
     dimensions = [int(dim) for dim in dimensions]
 
     # New dimensions of the final image
-    na = int(np.floor((img.shape[0] - offset[0]) / dimensions[0]))
-    nb = int(np.floor((img.shape[1] - offset[1]) / dimensions[1]))
+    na = int(np.floor((img.shape[-2] - offset[0]) / dimensions[0]))
+    nb = int(np.floor((img.shape[-1] - offset[1]) / dimensions[1]))
 
     # Reshape up to a higher dimensional array which is useful for higher
     # level operations
-    return (img[int(offset[0]):int(offset[0] + na * dimensions[0]),
-                int(offset[1]):int(offset[1] + nb * dimensions[1])]).reshape(na, dimensions[0], nb, dimensions[1])
+    return (img[..., int(offset[0]):int(offset[0] + na * dimensions[0]),
+                int(offset[1]):int(offset[1] + nb * dimensions[1])]).reshape(
+                    img.shape[:-2] + (na, dimensions[0], nb, dimensions[1]))
 
 
 class UnrecognizedInterpolationMethod(ValueError):
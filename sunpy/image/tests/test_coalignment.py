@@ -4,6 +4,9 @@
 # functionality relies on the scikit-image function "match_template".
 #
 
+from itertools import product
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
 import numpy as np
 from astropy import units as u
 from numpy.testing import assert_allclose, assert_array_almost_equal
@@ -15,9 +18,12 @@ import sunpy.data.test
 from sunpy.image.coalignment import parabolic_turning_point, \
     repair_image_nonfinite, _default_fmap_function, _lower_clip, _upper_clip, \
     calculate_clipping, get_correlation_shifts, find_best_match_location, \
-    match_template_to_layer, clip_edges, \
+    match_template_to_layer, clip_edges, FFTTemplateMatcher, \
+    find_upsampled_correlation_shift, \
     calculate_match_template_shift,\
-    mapsequence_coalign_by_match_template, apply_shifts
+    mapsequence_coalign_by_match_template, apply_shifts, \
+    calculate_match_template_shift_stream, apply_shifts_stream, \
+    coalign_by_match_template_stream
 
 @pytest.fixture
 def aia171_test_clipping():
@@ -87,6 +93,56 @@ def test_match_template_to_layer(aia171_test_map_layer,
     assert_allclose(np.max(result), 1.00, rtol=1e-2, atol=0)
 
 
+def test_fft_template_matcher(aia171_test_map_layer, aia171_test_template):
+    expected = match_template_to_layer(aia171_test_map_layer, aia171_test_template)
+    matcher = FFTTemplateMatcher(aia171_test_template)
+    result = matcher(aia171_test_map_layer)
+    assert result.shape == expected.shape
+    assert_allclose(result, expected, atol=1e-10)
+
+    # A stack of layers is correlated in one go
+    layers = np.stack([aia171_test_map_layer, 2 * aia171_test_map_layer + 1])
+    result = matcher(layers)
+    assert result.shape == (2,) + expected.shape
+    assert_allclose(result[0], expected, atol=1e-10)
+    assert_allclose(result[1], expected, atol=1e-10)
+
+    # Templates which are not square
+    template = aia171_test_map_layer[40:60, 30:90]
+    assert_allclose(FFTTemplateMatcher(template)(aia171_test_map_layer),
+                    match_template_to_layer(aia171_test_map_layer, template), atol=1e-10)
+
+    with pytest.raises(ValueError):
+        matcher(aia171_test_template[:10, :10])
+
+
+def test_fft_template_matcher_numpy(aia171_test_map_layer, aia171_test_template, monkeypatch):
+    # Without scipy.fft the FFTs are calculated by numpy.fft
+    expected = FFTTemplateMatcher(aia171_test_template)(aia171_test_map_layer)
+    monkeypatch.setattr(sunpy.image.coalignment, 'scipy_fft', None)
+    result = FFTTemplateMatcher(aia171_test_template, workers=-1)(aia171_test_map_layer)
+    assert_allclose(result, expected, atol=1e-10)
+
+
+def test_find_upsampled_correlation_shift():
+    # A smooth image shifted by a known subpixel amount
+    y, x = np.mgrid[0:63, 0:63]
+    template = np.exp(-((x - 30.0)**2 + (y - 25.0)**2) / 50.)
+    window = np.exp(-((x - 29.55)**2 + (y - 25.3)**2) / 50.)
+    yshift, xshift = find_upsampled_correlation_shift(window, template, 100)
+    assert_allclose(yshift.value, 0.3, atol=0.01)
+    assert_allclose(xshift.value, -0.45, atol=0.01)
+
+    # Phase correlation of an image with a sharp feature
+    template = np.zeros((63, 63))
+    template[20:30, 40:45] = 1
+    window = np.roll(template, (1, -1), axis=(0, 1))
+    yshift, xshift = find_upsampled_correlation_shift(window, template, 10,
+                                                      normalization='phase')
+    assert_allclose(yshift.value, 1, atol=0.01)
+    assert_allclose(xshift.value, -1, atol=0.01)
+
+
 def test_get_correlation_shifts():
     # Input array is 3 by 3, the most common case
     test_array = np.zeros((3, 3))
@@ -215,6 +271,35 @@ def test_calculate_match_template_shift(aia171_test_mc,
         dummy_return_value = calculate_match_template_shift(aia171_test_mc, template='broken')
 
 
+def test_calculate_match_template_shift_backends(aia171_test_mc,
+                                                 aia171_mc_arcsec_displacements):
+    expected = calculate_match_template_shift(aia171_test_mc)
+
+    # The FFT backend gives the same shifts as scikit-image
+    test_displacements = calculate_match_template_shift(aia171_test_mc, backend='fft')
+    assert_allclose(test_displacements['x'], expected['x'], atol=1e-6 * u.arcsec)
+    assert_allclose(test_displacements['y'], expected['y'], atol=1e-6 * u.arcsec)
+    template = aia171_test_mc[0].data[32:96, 32:96]
+    test_displacements = calculate_match_template_shift(
+        aia171_test_mc, template=template, backend=FFTTemplateMatcher(template, workers=2))
+    assert_allclose(test_displacements['x'], expected['x'], atol=1e-6 * u.arcsec)
+    assert_allclose(test_displacements['y'], expected['y'], atol=1e-6 * u.arcsec)
+
+    # Refining the shifts by upsampled cross-correlation and phase correlation
+    for backend, normalization in product(['skimage', 'fft'], [None, 'phase']):
+        test_displacements = calculate_match_template_shift(aia171_test_mc, backend=backend,
+                                                            upsample_factor=20,
+                                                            normalization=normalization)
+        assert_allclose(test_displacements['x'], aia171_mc_arcsec_displacements['x'], rtol=5e-2, atol=0)
+        assert_allclose(test_displacements['y'], aia171_mc_arcsec_displacements['y'], rtol=5e-2, atol=0)
+
+    with pytest.raises(ValueError):
+        calculate_match_template_shift(aia171_test_mc, upsample_factor=20, normalization='broken')
+
+    with pytest.raises(ValueError):
+        calculate_match_template_shift(aia171_test_mc, backend='broken')
+
+
 def test_mapsequence_coalign_by_match_template(aia171_test_mc,
                                            aia171_test_map_layer_shape):
     # Define these local variables to make the code more readable
@@ -325,3 +410,84 @@ def test_apply_shifts(aia171_test_map):
                             order=2, mode='reflect')
     test_mc2 = apply_shifts(mc, astropy_displacements["y"], astropy_displacements["x"], clip=False)
     assert(np.all(test_mc1[1].data[:, -1] != test_mc2[1].data[:, -1]))
+
+
+@pytest.mark.parametrize('executor_class', [ThreadPoolExecutor, ProcessPoolExecutor])
+def test_coalign_executor(aia171_test_mc, executor_class):
+    expected_shifts = calculate_match_template_shift(aia171_test_mc)
+    expected = mapsequence_coalign_by_match_template(aia171_test_mc)
+    for backend in ['skimage', 'fft']:
+        with executor_class(max_workers=2) as executor:
+            shifts = calculate_match_template_shift(aia171_test_mc, backend=backend,
+                                                    executor=executor)
+            coaligned = mapsequence_coalign_by_match_template(aia171_test_mc, backend=backend,
+                                                              executor=executor)
+        assert_allclose(shifts['x'], expected_shifts['x'], atol=1e-6 * u.arcsec)
+        assert_allclose(shifts['y'], expected_shifts['y'], atol=1e-6 * u.arcsec)
+        assert len(coaligned) == len(expected)
+        for m, expected_map in zip(coaligned, expected):
+            assert m.date == expected_map.date
+            assert_allclose(m.data, expected_map.data, atol=1e-6)
+
+
+def test_apply_shifts_cube(aia171_test_map):
+    mc = Map([aia171_test_map, aia171_test_map], sequence=True)
+    yshift = [0.0, -10.4] * u.pix
+    xshift = [0.0, -2.7] * u.pix
+    test_mc = apply_shifts(mc, yshift, xshift)
+    # The layers are views of one array
+    assert test_mc[0].data.base is test_mc[1].data.base
+    assert_allclose(test_mc[1].data, sp_shift(aia171_test_map.data, [-10.4, -2.7])[0:-11, 0:-3])
+
+
+def test_coalign_by_match_template_stream(aia171_test_mc, tmpdir):
+    expected_shifts = calculate_match_template_shift(aia171_test_mc)
+    expected = mapsequence_coalign_by_match_template(aia171_test_mc)
+
+    # Maps are read from files as they are needed
+    files = []
+    for i, m in enumerate(aia171_test_mc):
+        files.append(str(tmpdir.join('layer{}.fits'.format(i))))
+        m.save(files[-1])
+
+    for maps in [aia171_test_mc.maps, files, lambda: iter(files)]:
+        for backend in ['skimage', 'fft']:
+            shifts = calculate_match_template_shift_stream(maps, backend=backend)
+            assert_allclose(shifts['x'], expected_shifts['x'], atol=1e-6 * u.arcsec)
+            assert_allclose(shifts['y'], expected_shifts['y'], atol=1e-6 * u.arcsec)
+
+        shifts = calculate_match_template_shift_stream(maps, upsample_factor=20,
+                                                       normalization='phase')
+        phase_shifts = calculate_match_template_shift(aia171_test_mc, upsample_factor=20,
+                                                      normalization='phase')
+        assert_allclose(shifts['x'], phase_shifts['x'], atol=1e-6 * u.arcsec)
+        assert_allclose(shifts['y'], phase_shifts['y'], atol=1e-6 * u.arcsec)
+
+        coaligned = coalign_by_match_template_stream(maps)
+        count = 0
+        for m, expected_map in zip(coaligned, expected):
+            assert m.data.shape == expected_map.data.shape
+            assert_allclose(m.data, expected_map.data, atol=1e-6)
+            assert_allclose(m.reference_pixel.x, expected_map.reference_pixel.x)
+            count += 1
+        assert count == len(expected)
+
+    # The data of lazily loaded maps are not kept on the maps
+    lazy_maps = Map(files, sequence=True, lazy=True).maps
+    for m in coalign_by_match_template_stream(lazy_maps):
+        pass
+    assert not any(m.data.loaded for m in lazy_maps)
+
+    # The maps are iterated over twice
+    with pytest.raises(TypeError):
+        coalign_by_match_template_stream(iter(files))
+
+
+def test_apply_shifts_stream(aia171_test_map):
+    maps = [aia171_test_map, aia171_test_map]
+    yshift = [0.0, -10.4] * u.pix
+    xshift = [0.0, -2.7] * u.pix
+    expected = apply_shifts(Map(maps, sequence=True), yshift, xshift)
+    for m, expected_map in zip(apply_shifts_stream(maps, yshift, xshift), expected):
+        assert_allclose(m.data, expected_map.data)
+        assert m.meta['crpix1'] == expected_map.meta['crpix1']
@@ -1,4 +1,4 @@
-from sunpy.image.transform import affine_transform
+from sunpy.image.transform import affine_transform, coordinate_cache
 import numpy as np
 from skimage import transform as tf
 import skimage.data as images
@@ -218,3 +218,106 @@ def test_int(identity):
     in_arr = np.array([[100]], dtype=int)
     out_arr = affine_transform(in_arr, rmatrix=identity)
     assert np.issubdtype(out_arr.dtype, np.float)
+
+
+@pytest.mark.parametrize("use_scipy", [False, True])
+def test_float32(use_scipy):
+    # Test that float32 images are not cast to float64
+    in_arr = original.astype(np.float32)
+    rmatrix = np.array([[0.0, -1.0], [1.0, 0.0]])
+    out_arr = affine_transform(in_arr, rmatrix=rmatrix, order=1, use_scipy=use_scipy)
+    expected = affine_transform(original, rmatrix=rmatrix, order=1, use_scipy=use_scipy)
+    assert out_arr.dtype == np.float32
+    assert np.allclose(out_arr, expected, rtol=1e-5, atol=1e-3)
+
+
+def test_int_nearest(identity):
+    # Test that integer arrays keep their dtype for nearest-neighbour rotation
+    in_arr = np.arange(16, dtype=np.int16).reshape(4, 4)
+    out_arr = affine_transform(in_arr, rmatrix=identity, order=0)
+    assert out_arr.dtype == np.int16
+    assert np.all(out_arr == in_arr)
+
+
+@pytest.mark.parametrize("use_scipy", [False, True])
+def test_output_shape(use_scipy):
+    # Test that a larger output shape is the same as padding the image
+    angle = np.radians(30)
+    c = np.cos(angle); s = np.sin(angle)
+    rmatrix = np.array([[c, -s], [s, c]])
+    padded = np.pad(original, ((20, 20), (10, 10)), mode='constant')
+    expected = affine_transform(padded, rmatrix=rmatrix, order=1, use_scipy=use_scipy)
+    output = np.empty(padded.shape)
+    out_arr = affine_transform(original, rmatrix=rmatrix, order=1, use_scipy=use_scipy,
+                               output=output)
+    assert out_arr is output
+    assert np.allclose(out_arr, expected, atol=1e-8)
+
+
+@pytest.mark.parametrize("use_scipy, order", [(False, 4), (True, 1), (True, 3)])
+def test_coordinate_cache(use_scipy, order):
+    # Test that repeated transformations are cached and give the same result
+    angle = np.radians(20)
+    c = np.cos(angle); s = np.sin(angle)
+    rmatrix = np.array([[c, -s], [s, c]])
+    kwargs = dict(rmatrix=rmatrix, order=order, scale=1.2, use_scipy=use_scipy,
+                  image_center=(200.5, 300.0), output_shape=(400, 600))
+    coordinate_cache.clear()
+    first = affine_transform(original, **kwargs)
+    assert len(coordinate_cache) == 0
+    second = affine_transform(original, **kwargs)
+    assert len(coordinate_cache) == 1
+    assert coordinate_cache.nbytes == 16 * 400 * 600
+    third = affine_transform(original, **kwargs)
+    assert np.allclose(second, first, atol=1e-6)
+    assert np.array_equal(third, second)
+
+    # The least recently used coordinates are removed to keep within the limit
+    old_max_bytes = coordinate_cache.max_bytes
+    try:
+        coordinate_cache.max_bytes = 16 * 400 * 600
+        for i in range(2):
+            affine_transform(original, **dict(kwargs, scale=2.0))
+        assert len(coordinate_cache) == 1
+    finally:
+        coordinate_cache.max_bytes = old_max_bytes
+        coordinate_cache.clear()
+
+
+@pytest.mark.parametrize("order", [2, 4, 5])
+def test_coordinate_cache_edges(order):
+    # Test that the cached scikit-image transformation treats the pixels
+    # beyond the edges of the image as the uncached one does
+    angle = np.radians(30)
+    c = np.cos(angle); s = np.sin(angle)
+    rmatrix = np.array([[c, -s], [s, c]])
+    image = np.ones((64, 64))
+    coordinate_cache.clear()
+    try:
+        first = affine_transform(image, rmatrix=rmatrix, order=order, missing=0.0)
+        second = affine_transform(image, rmatrix=rmatrix, order=order, missing=0.0)
+        assert len(coordinate_cache) == 1
+        assert np.allclose(second, first, atol=1e-6)
+    finally:
+        coordinate_cache.clear()
+
+
+@pytest.mark.parametrize("order", [2, 4, 5])
+def test_skimage_map_coordinates(order):
+    # Test that the orders which are interpolated with map_coordinates match
+    # skimage.transform.warp
+    angle = np.radians(30)
+    c = np.cos(angle); s = np.sin(angle)
+    rmatrix = np.array([[c, -s], [s, c]])
+    center = (np.array(original.shape)[::-1] - 1) / 2.0
+    skmatrix = np.eye(3)
+    skmatrix[:2, :2] = rmatrix
+    skmatrix[:2, 2] = center - np.dot(rmatrix, center)
+    expected = tf.warp(original, tf.AffineTransform(skmatrix), order=order, mode='constant',
+                       cval=0.0, preserve_range=True)
+    coordinate_cache.clear()
+    output = np.empty(original.shape)
+    out_arr = affine_transform(original, rmatrix=rmatrix, order=order, output=output)
+    coordinate_cache.clear()
+    assert out_arr is output
+    assert np.allclose(out_arr, expected, atol=1e-6)
@@ -2,7 +2,9 @@
 Functions for geometrical image transformation and warping.
 """
 
+import threading
 import warnings
+from collections import OrderedDict
 
 import numpy as np
 import scipy.ndimage.interpolation
@@ -14,11 +16,29 @@ except ImportError:  # pragma: no cover
                   ImportWarning)
     scikit_image_not_found = True  # pragma: no cover
 
-__all__ = ['affine_transform']
+
+def _warp_ndimage_mode():
+    """
+    The mode of :func:`scipy.ndimage.map_coordinates` which
+    :func:`skimage.transform.warp` uses for ``mode='constant'``, which is
+    ``'grid-constant'`` for the versions of scikit-image which translate the
+    modes, and ``'constant'`` for older ones.
+    """
+    try:
+        from skimage._shared.utils import _to_ndimage_mode
+    except ImportError:
+        return 'constant'
+    return _to_ndimage_mode('constant')
+
+
+_WARP_MODE = 'constant' if scikit_image_not_found else _warp_ndimage_mode()
+
+__all__ = ['affine_transform', 'CoordinateCache', 'coordinate_cache']
 
 
 def affine_transform(image, rmatrix, order=3, scale=1.0, image_center=None,
-                     recenter=False, missing=0.0, use_scipy=False):
+                     recenter=False, missing=0.0, use_scipy=False, output_shape=None,
+                     output=None):
     """
     Rotates, shifts and scales an image using :func:`skimage.transform.warp`,
     or :func:`scipy.ndimage.interpolation.affine_transform` if specified. Falls
@@ -52,6 +72,16 @@ def affine_transform(image, rmatrix, order=3, scale=1.0, image_center=None,
         Force use of :func:`scipy.ndimage.interpolation.affine_transform`.
         Will set all NaNs in image to zero before doing the transform.
         Default: False, unless scikit-image can't be imported
+    output_shape : tuple
+        The shape of the output image. The centers of the input and output
+        arrays are aligned, so a larger shape is equivalent to padding the
+        image evenly on both sides before the transformation, and a smaller
+        one to clipping the edges afterwards, without the copies.
+        Default: the shape of the input image.
+    output : `numpy.ndarray`
+        An array of the output shape to write the transformed image into.
+        Its dtype is used for the result. The scipy transformation writes
+        into it directly.
 
     Returns
     -------
@@ -70,9 +100,26 @@ def affine_transform(image, rmatrix, order=3, scale=1.0, image_center=None,
     replaced with zero prior to rotation.  No attempt is made to retain the NaN
     values.
 
-    Input arrays with integer data are cast to float64 and can be re-cast using
+    Floating point input arrays are transformed without being copied or cast
+    and the output has the same dtype, so float32 images stay float32.  Input
+    arrays with integer data keep their dtype for nearest-neighbour
+    interpolation (order 0) when ``missing`` is a whole number.  Otherwise
+    they are cast to float64 and can be re-cast using
     :func:`numpy.ndarray.astype` if desired.
 
+    For order 2, 4 or 5, :func:`skimage.transform.warp` interpolates with
+    :func:`scipy.ndimage.map_coordinates`, so this is called directly, writing
+    straight into the output array. For order 0, 1 or 3 scikit-image
+    interpolates with its own function, which returns a new array, float64
+    for integer images, that is then copied into the output array.
+
+    The source pixel coordinates of transformations which are repeated with
+    the same image shape, output shape, matrix, scale and center are kept in
+    `coordinate_cache`, so the transformation is reduced to a
+    :func:`scipy.ndimage.map_coordinates` interpolation of the cached
+    coordinates. This is done for the scipy transformation and for the
+    scikit-image one with order 2, 4 or 5.
+
     Although this function is analogous to the IDL's rot() function, it does not
     use the same algorithm as the IDL rot() function.
     IDL's rot() calls the `POLY_2D <http://www.harrisgeospatial.com/docs/poly_2d.html>`_
@@ -85,6 +132,11 @@ def affine_transform(image, rmatrix, order=3, scale=1.0, image_center=None,
     rmatrix = rmatrix / scale
     array_center = (np.array(image.shape)[::-1]-1)/2.0
 
+    if output is not None:
+        output_shape = output.shape
+    elif output_shape is None:
+        output_shape = image.shape
+
     # Make sure the image center is an array and is where it's supposed to be
     if image_center is not None:
         image_center = np.asanyarray(image_center)
@@ -97,36 +149,202 @@ def affine_transform(image, rmatrix, order=3, scale=1.0, image_center=None,
     else:
         rot_center = image_center
 
-    displacement = np.dot(rmatrix, rot_center)
+    # The output pixel coordinates are offset from the input ones by the
+    # difference of the array centers
+    output_offset = (np.array(output_shape)[::-1] - 1) / 2.0 - array_center
+
+    displacement = np.dot(rmatrix, rot_center + output_offset)
     shift = image_center - displacement
 
-    if use_scipy or scikit_image_not_found:
+    if output is None:
+        output = np.empty(output_shape, dtype=_output_dtype(image.dtype, order, missing))
+
+    use_scipy = use_scipy or scikit_image_not_found
+    # The fast scikit-image transformations do not calculate the coordinates
+    coords = None
+    if use_scipy or order not in (0, 1, 3):
+        coords = coordinate_cache.get(image.shape, output_shape, rmatrix, shift)
+
+    if use_scipy:
         if np.any(np.isnan(image)):
             warnings.warn("Setting NaNs to 0 for SciPy rotation", RuntimeWarning)
-        # Transform the image using the scipy affine transform
-        rotated_image = scipy.ndimage.interpolation.affine_transform(
-                np.nan_to_num(image).T, rmatrix, offset=shift, order=order,
-                mode='constant', cval=missing).T
-    else:
-        # Make the rotation matrix 3x3 to include translation of the image
-        skmatrix = np.zeros((3, 3))
-        skmatrix[:2, :2] = rmatrix
-        skmatrix[2, 2] = 1.0
-        skmatrix[:2, 2] = shift
-        tform = skimage.transform.AffineTransform(skmatrix)
-
-        # Transform the image using the skimage function
-        if not np.issubdtype(image.dtype, np.float64):
-            warnings.warn("Input data has been cast to float64", RuntimeWarning)
-            adjusted_image = image.astype(np.float64)
+            image = np.nan_to_num(image)
+        if coords is not None:
+            scipy.ndimage.map_coordinates(image, coords, output=output, order=order,
+                                          mode='constant', cval=missing)
         else:
-            adjusted_image = image.copy()
-        if np.any(np.isnan(adjusted_image)) and order >= 4:
+            # Transform the image using the scipy affine transform, straight
+            # into the output array
+            scipy.ndimage.interpolation.affine_transform(
+                    image.T, rmatrix, offset=shift, output=output.T, order=order,
+                    mode='constant', cval=missing)
+    else:
+        # Transform the image as the skimage function does, which does not
+        # modify the image, so it only needs to be copied to replace NaNs
+        if order >= 4 and np.any(np.isnan(image)):
             warnings.warn("Setting NaNs to 0 for higher-order scikit-image rotation",
                           RuntimeWarning)
-            adjusted_image = np.nan_to_num(adjusted_image)
+            image = np.nan_to_num(image)
+
+        if order not in (0, 1, 3):
+            # skimage.transform.warp interpolates these orders with
+            # map_coordinates, so interpolate and clip as it does, straight
+            # into the output array
+            if coords is None:
+                coords = _source_coordinates(output_shape, rmatrix, shift)
+            scipy.ndimage.map_coordinates(image, coords, output=output, order=order,
+                                          mode=_WARP_MODE, cval=missing)
+            _clip_warp_output(image, output, missing)
+        else:
+            if not np.issubdtype(image.dtype, np.floating) and output.dtype == np.float64:
+                warnings.warn("Input data has been cast to float64", RuntimeWarning)
+                image = image.astype(np.float64)
+            # Make the rotation matrix 3x3 to include translation of the image
+            skmatrix = np.zeros((3, 3))
+            skmatrix[:2, :2] = rmatrix
+            skmatrix[2, 2] = 1.0
+            skmatrix[:2, 2] = shift
+            tform = skimage.transform.AffineTransform(skmatrix)
+
+            output[...] = skimage.transform.warp(image, tform, output_shape=output_shape,
+                                                 order=order, mode='constant', cval=missing,
+                                                 preserve_range=True)
+
+    return output
 
-        rotated_image = skimage.transform.warp(adjusted_image, tform, order=order,
-                                               mode='constant', cval=missing)
 
-    return rotated_image
+def _clip_warp_output(image, output, missing):
+    """
+    Clip the output to the range of the image, apart from pixels with the
+    value ``missing``, as :func:`skimage.transform.warp` does.
+    """
+    min_val = np.nanmin(image)
+    max_val = np.nanmax(image)
+    preserve_missing = not min_val <= missing <= max_val
+    if preserve_missing:
+        missing_mask = output == missing
+    np.clip(output, min_val, max_val, out=output)
+    if preserve_missing:
+        output[missing_mask] = missing
+
+
+class CoordinateCache(object):
+    """
+    A least recently used cache of the source pixel coordinates of the
+    transformations done by `affine_transform`.
+
+    A transformation is only cached the second time it is seen, so
+    transformations which are done once do not use any extra memory. The
+    coordinates of an output of shape (ny, nx) take ``16 * ny * nx`` bytes,
+    and the least recently used coordinates are removed to keep the cache
+    within ``max_bytes``.
+
+    Parameters
+    ----------
+    max_bytes : `int`
+        The largest number of bytes of coordinates kept. 0 disables the cache.
+
+    Examples
+    --------
+    >>> from sunpy.image.transform import coordinate_cache
+    >>> coordinate_cache.max_bytes = 2**30   # doctest: +SKIP
+    >>> coordinate_cache.clear()   # doctest: +SKIP
+    """
+    # The number of transformations which have been seen once remembered
+    _max_seen = 64
+
+    def __init__(self, max_bytes=2**29):
+        self.max_bytes = max_bytes
+        self._coords = OrderedDict()
+        self._seen = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._coords)
+
+    @property
+    def nbytes(self):
+        """
+        The number of bytes of the cached coordinates.
+        """
+        return sum(coords.nbytes for coords in self._coords.values())
+
+    def clear(self):
+        """
+        Remove all the cached coordinates.
+        """
+        with self._lock:
+            self._coords.clear()
+            self._seen.clear()
+
+    def get(self, image_shape, output_shape, rmatrix, shift):
+        """
+        Return the (2, ny, nx) array of the (row, column) coordinates in the
+        image of the pixels of the output, or None if the transformation is
+        not cached.
+
+        Parameters
+        ----------
+        image_shape : `tuple`
+            The shape of the image.
+        output_shape : `tuple`
+            The shape (ny, nx) of the output.
+        rmatrix : `numpy.ndarray`
+            The 2x2 matrix of the transformation, including the scale.
+        shift : `numpy.ndarray`
+            The offset of the transformation.
+        """
+        output_shape = tuple(int(n) for n in output_shape)
+        if 16 * np.prod(output_shape) > self.max_bytes:
+            return None
+        key = (tuple(image_shape), output_shape,
+               np.asarray(rmatrix, dtype=np.float64).tobytes(),
+               np.asarray(shift, dtype=np.float64).tobytes())
+
+        with self._lock:
+            if key in self._coords:
+                self._coords.move_to_end(key)
+                return self._coords[key]
+            # Only transformations which are repeated are cached
+            if key not in self._seen:
+                self._seen[key] = None
+                while len(self._seen) > self._max_seen:
+                    self._seen.popitem(last=False)
+                return None
+            del self._seen[key]
+
+        coords = _source_coordinates(output_shape, rmatrix, shift)
+        with self._lock:
+            self._coords[key] = coords
+            while self.nbytes > self.max_bytes:
+                self._coords.popitem(last=False)
+        return coords
+
+
+def _source_coordinates(output_shape, rmatrix, shift):
+    """
+    Calculate the (row, column) coordinates in the image of the pixels of an
+    output of ``output_shape`` for the transformation of `affine_transform`,
+    which maps the (column, row) coordinates of the output to the image.
+    """
+    rows = np.arange(output_shape[0], dtype=np.float64)[:, np.newaxis]
+    columns = np.arange(output_shape[1], dtype=np.float64)
+    coords = np.empty((2,) + tuple(output_shape))
+    for axis, matrix_row, offset in ((0, rmatrix[1], shift[1]), (1, rmatrix[0], shift[0])):
+        np.add(matrix_row[0] * columns + offset, matrix_row[1] * rows, out=coords[axis])
+    return coords
+
+
+coordinate_cache = CoordinateCache()
+
+
+def _output_dtype(dtype, order, missing):
+    """
+    The dtype of the result of `affine_transform` for an image of ``dtype``.
+    """
+    if np.issubdtype(dtype, np.floating):
+        return dtype
+    if (order == 0 and np.issubdtype(dtype, np.integer) and np.isfinite(missing) and
+            float(missing).is_integer()):
+        return dtype
+    return np.float64
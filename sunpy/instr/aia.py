@@ -2,21 +2,26 @@
 """
 Provides processing routines for data captured with the AIA instrument on SDO.
 """
+import pathlib
+from collections import deque
+
 import numpy as np
 import astropy.units as u
 
+import sunpy.map
+from sunpy.image.transform import affine_transform
 from sunpy.map.sources.sdo import AIAMap, HMIMap
 
 __all__ = ['aiaprep']
 
 
-def aiaprep(aiamap):
+def aiaprep(aiamap, executor=None, output=None, max_pending=None):
     """
     Processes a level 1 `~sunpy.map.sources.sdo.AIAMap` into a level 1.5
     `~sunpy.map.sources.sdo.AIAMap`. Rotates, scales and
     translates the image so that solar North is aligned with the y axis, each
     pixel is 0.6 arcsec across, and the center of the sun is at the center of
-    the image. The actual transformation is done by Map's
+    the image. The transformation is the one done by Map's
     :meth:`~sunpy.map.mapbase.GenericMap.rotate` method.
 
     This function is similar in functionality to aia_prep() in SSWIDL, but
@@ -24,46 +29,156 @@ def aiaprep(aiamap):
     the meta data differently. It should therefore not be expected to produce
     the same results.
 
+    Many maps can be processed at once by passing a
+    `~sunpy.map.MapSequence`, or a list or iterator of maps or file paths.
+    Maps processed in the same process with the same transformation reuse
+    its source pixel coordinates, see `sunpy.image.transform.coordinate_cache`.
+
     Parameters
     ----------
-    aiamap : `~sunpy.map.sources.sdo.AIAMap` instance
-        A `sunpy.map.Map` from AIA
+    aiamap : `~sunpy.map.sources.sdo.AIAMap`, `~sunpy.map.MapSequence`, `str` or iterable
+        A `sunpy.map.Map` from AIA, a `~sunpy.map.MapSequence` of them, the
+        path of a file which is read with `sunpy.map.Map`, or an iterable of
+        AIA maps or of file paths.
+    executor : `concurrent.futures.Executor`, optional
+        If given, the maps are read and processed concurrently using this
+        executor, for example a `concurrent.futures.ThreadPoolExecutor` or a
+        `concurrent.futures.ProcessPoolExecutor` with the number of workers
+        to use. The order of the maps is unchanged.
+    output : `str`, optional
+        If given, each level 1.5 map is saved to the file path given by
+        ``output.format(index)``, where ``index`` is the position of the map
+        in the input, for example ``'aia_lev15_{:05d}.fits'``. For an
+        iterable input the file paths are returned instead of the maps.
+    max_pending : `int`, optional
+        The largest number of maps of an iterable being processed by the
+        executor at once, which bounds the memory used. Defaults to twice
+        ``executor._max_workers`` if it is available, or 8.
 
     Returns
     -------
     newmap : A level 1.5 copy of `~sunpy.map.sources.sdo.AIAMap`
+        For a `~sunpy.map.MapSequence` a `~sunpy.map.MapSequence` of the
+        level 1.5 maps is returned. For any other iterable a generator is
+        returned, which yields the level 1.5 maps, or their file paths, in
+        order as they are processed, so only a few maps are in memory at a
+        time.
 
     Notes
     -----
-    This routine makes use of Map's :meth:`~sunpy.map.mapbase.GenericMap.rotate`
-    method, which modifies the header information to the standard PCi_j WCS
-    formalism.
+    This routine uses the transformation of Map's
+    :meth:`~sunpy.map.mapbase.GenericMap.rotate` method, which modifies the
+    header information to the standard PCi_j WCS formalism. The image is
+    transformed straight into the level 1.5 image, rather than rotated and
+    then cut out with :meth:`~sunpy.map.mapbase.GenericMap.submap`.
     The FITS header resulting in saving a file after this procedure will
     therefore differ from the original file.
+
+    Examples
+    --------
+    >>> from concurrent.futures import ProcessPoolExecutor
+    >>> from sunpy.instr.aia import aiaprep
+    >>> with ProcessPoolExecutor(4) as executor:   # doctest: +SKIP
+    ...     for path in aiaprep(files, executor=executor,
+    ...                         output='aia_lev15_{:05d}.fits'):   # doctest: +SKIP
+    ...         print(path)   # doctest: +SKIP
     """
+    if isinstance(aiamap, (str, pathlib.Path)):
+        # A file path is not an iterable of file paths
+        aiamap = sunpy.map.Map(str(aiamap))
+
+    if isinstance(aiamap, sunpy.map.GenericMap):
+        newmap = _prep_map(aiamap)
+        if output is not None:
+            newmap.save(output.format(0))
+        return newmap
 
+    if isinstance(aiamap, sunpy.map.MapSequence):
+        maps = list(_prep_maps(aiamap.maps, executor, None, max_pending))
+        if output is not None:
+            for index, newmap in enumerate(maps):
+                newmap.save(output.format(index))
+        return sunpy.map.MapSequence(maps)
+
+    return _prep_maps(aiamap, executor, output, max_pending)
+
+
+def _prep_maps(items, executor, output, max_pending):
+    """
+    Yield the level 1.5 maps of an iterable of maps or files, or their file
+    paths if ``output`` is given, keeping at most ``max_pending`` maps in the
+    executor at a time.
+    """
+    args = ((item, output, index) for index, item in enumerate(items))
+
+    if executor is None:
+        for arg in args:
+            yield _prep_item(*arg)
+        return
+
+    if max_pending is None:
+        max_pending = 2 * getattr(executor, '_max_workers', 4)
+    pending = deque()
+    for arg in args:
+        pending.append(executor.submit(_prep_item, *arg))
+        if len(pending) >= max_pending:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def _prep_item(item, output, index):
+    """
+    Read a map if needed and return its level 1.5 map, or save it to the path
+    ``output.format(index)`` and return the path.
+    """
+    aiamap = item if isinstance(item, sunpy.map.GenericMap) else sunpy.map.Map(item)
+    newmap = _prep_map(aiamap)
+    if output is None:
+        return newmap
+    path = output.format(index)
+    newmap.save(path)
+    return path
+
+
+def _prep_map(aiamap):
+    """
+    Return the level 1.5 map of a level 1 map.
+    """
     if not isinstance(aiamap, (AIAMap, HMIMap)):
         raise ValueError("Input must be an AIAMap")
 
+    rmatrix, scale_factor, output_center = _prep_transform(aiamap)
+
+    # Rotate around the reference pixel as rotate(recenter=True) does, into
+    # an image of the original size with the reference pixel at its center.
+    pixel_rotation_center = u.Quantity(aiamap.world_to_pixel(aiamap.reference_coordinate,
+                                                             origin=0)).value
+    new_data = affine_transform(aiamap.data.T, rmatrix, order=4, scale=scale_factor,
+                                image_center=np.flipud(pixel_rotation_center),
+                                recenter=True, missing=aiamap.min(),
+                                output_shape=aiamap.data.shape[::-1]).T
+
+    new_meta = aiamap._rotated_meta(rmatrix, scale_factor, output_center)
+    new_meta['r_sun'] = new_meta['rsun_obs'] / new_meta['cdelt1']
+    new_meta['lvl_num'] = 1.5
+    new_meta['bitpix'] = -64
+
+    return aiamap._new_instance(new_data, new_meta, aiamap.plot_settings)
+
+
+def _prep_transform(aiamap):
+    """
+    Return the rotation matrix, scale factor and new reference pixel of the
+    level 1.5 transformation of a map.
+    """
     # Target scale is 0.6 arcsec/pixel, but this needs to be adjusted if the map
     # has already been rescaled.
     if (aiamap.scale[0] / 0.6).round() != 1.0 * u.arcsec and aiamap.data.shape != (4096, 4096):
         scale = (aiamap.scale[0] / 0.6).round() * 0.6 * u.arcsec
     else:
         scale = 0.6 * u.arcsec  # pragma: no cover # can't test this because it needs a full res image
-    scale_factor = aiamap.scale[0] / scale
-
-    tempmap = aiamap.rotate(recenter=True, scale=scale_factor.value, missing=aiamap.min())
-
-    # extract center from padded aiamap.rotate output
-    # crpix1 and crpix2 will be equal (recenter=True), as aiaprep does not work with submaps
-    center = np.floor(tempmap.meta['crpix1'])
-    range_side = (center + np.array([-1, 1]) * aiamap.data.shape[0] / 2) * u.pix
-    newmap = tempmap.submap(u.Quantity([range_side[0], range_side[0]]),
-                            u.Quantity([range_side[1], range_side[1]]))
-
-    newmap.meta['r_sun'] = newmap.meta['rsun_obs'] / newmap.meta['cdelt1']
-    newmap.meta['lvl_num'] = 1.5
-    newmap.meta['bitpix'] = -64
+    scale_factor = (aiamap.scale[0] / scale).value
 
-    return newmap
+    output_center = (np.flipud(aiamap.data.shape) - 1) / 2.0
+    return np.asarray(aiamap.rotation_matrix), scale_factor, output_center
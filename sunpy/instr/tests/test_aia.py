@@ -1,4 +1,6 @@
+import pathlib
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
 
 import pytest
 import numpy as np
@@ -59,3 +61,42 @@ def test_filesave(prep_map):
         prep_map.rotation_matrix, np.identity(2), rtol=1e-5, atol=1e-8)
     # Check level number
     assert load_map.meta['lvl_num'] == 1.5
+
+
+def test_aiaprep_batch(original, prep_map, tmpdir):
+    filename = str(tmpdir.join('original.fits'))
+    original.save(filename)
+
+    # A MapSequence gives a MapSequence
+    prep_sequence = aiaprep(sunpy.map.Map([original, original], sequence=True))
+    assert isinstance(prep_sequence, sunpy.map.MapSequence)
+    for m in prep_sequence:
+        np.testing.assert_allclose(m.data, prep_map.data)
+
+    # Files are read and processed concurrently in order
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        prep_maps = list(aiaprep([filename, original, filename], executor=executor,
+                                 max_pending=2))
+    assert len(prep_maps) == 3
+    for m in prep_maps:
+        np.testing.assert_allclose(m.data, prep_map.data)
+        assert m.meta['crpix1'] == prep_map.meta['crpix1']
+
+    # A single file path is read as one map
+    for path in (filename, pathlib.Path(filename)):
+        single = aiaprep(path)
+        assert isinstance(single, sunpy.map.GenericMap)
+        np.testing.assert_allclose(single.data, prep_map.data)
+
+    # The prepped maps are saved as they are processed
+    output = str(tmpdir.join('prep_{:02d}.fits'))
+    paths = list(aiaprep(iter([filename, filename]), output=output))
+    assert paths == [output.format(0), output.format(1)]
+    load_map = sunpy.map.Map(paths[1])
+    assert load_map.meta['lvl_num'] == 1.5
+    np.testing.assert_allclose(load_map.data, prep_map.data)
+
+
+def test_aiaprep_not_aia(original):
+    with pytest.raises(ValueError):
+        aiaprep(sunpy.map.GenericMap(original.data, original.meta))
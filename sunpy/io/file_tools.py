@@ -2,6 +2,9 @@ import re
 import os
 import collections
 
+import numpy as np
+from numpy.lib.mixins import NDArrayOperatorsMixin
+
 try:
     from . import fits
 except ImportError:
@@ -74,18 +77,7 @@ def read_file(filepath, filetype=None, **kwargs):
     -----
     Other keyword arguments are passed to the reader used.
     """
-    # Use the explicitly passed filetype
-    if filetype is not None:
-        return _readers[filetype].read(filepath, **kwargs)
-
-    # Go through the known extensions
-    for extension, readername in _known_extensions.items():
-        if filepath.endswith(extension) or filetype in extension:
-            return _readers[readername].read(filepath, **kwargs)
-
-    # If filetype is not apparent from the extension, attempt to detect it
-    readername = _detect_filetype(filepath)
-    return _readers[readername].read(filepath, **kwargs)
+    return _readers[_get_reader_name(filepath, filetype)].read(filepath, **kwargs)
 
 
 def read_file_header(filepath, filetype=None, **kwargs):
@@ -110,18 +102,7 @@ def read_file_header(filepath, filetype=None, **kwargs):
     headers : `list`
         A list of headers
     """
-    # Use the explicitly passed filetype
-    if filetype is not None:
-        return _readers[filetype].get_header(filepath, **kwargs)
-
-    # Go through the known extensions
-    for extension, readername in _known_extensions.items():
-        if filepath.endswith(extension) or filetype in extension:
-            return _readers[readername].get_header(filepath, **kwargs)
-
-    # If filetype is not apparent from the extension, attempt to detect it
-    readername = _detect_filetype(filepath)
-    return _readers[readername].get_header(filepath, **kwargs)
+    return _readers[_get_reader_name(filepath, filetype)].get_header(filepath, **kwargs)
 
 
 def write_file(fname, data, header, filetype='auto', **kwargs):
@@ -164,6 +145,36 @@ def write_file(fname, data, header, filetype='auto', **kwargs):
     raise ValueError("This filetype is not supported")
 
 
+def _get_reader_name(filepath, filetype=None):
+    """
+    Work out which reader should be used for a file.
+
+    Parameters
+    ----------
+    filepath : `str`
+        Where the file is.
+
+    filetype : `str`, optional
+        Supported reader to manually specify the filetype.
+
+    Returns
+    -------
+    readername : `str`
+        The name of the reader, one of ('fits', 'jp2', 'ana').
+    """
+    # Use the explicitly passed filetype
+    if filetype is not None:
+        return filetype
+
+    # Go through the known extensions
+    for extension, readername in _known_extensions.items():
+        if filepath.endswith(extension):
+            return readername
+
+    # If filetype is not apparent from the extension, attempt to detect it
+    return _detect_filetype(filepath)
+
+
 def _detect_filetype(filepath):
     """
     Attempts to determine the type of data contained in a file.  This is only
@@ -223,6 +234,142 @@ def _detect_filetype(filepath):
                                     "supported by SunPy.")
 
 
+class DeferredData(NDArrayOperatorsMixin):
+    """
+    An array-like placeholder for the data of one HDU in a file, which is only
+    read from disk the first time the values of the array are needed.
+
+    The shape and dtype are known without reading the file, so this can be
+    used as the data of a `~sunpy.map.GenericMap` which has been constructed
+    from the file header alone. Once read, the array is kept in memory.
+
+    Parameters
+    ----------
+    filepath : `str`
+        The file containing the data.
+    index : `int`
+        The index of the (data, header) pair returned by `read_file` which
+        holds the data.
+    shape : `tuple`
+        The shape of the array. If the array in the file has more dimensions
+        than this, only the first element of each of the leading dimensions is
+        used, in the same way as `~sunpy.map.GenericMap` truncates its data.
+    dtype : `numpy.dtype`, optional
+        The dtype of the array. If not given it will be determined by reading
+        the data.
+
+    Other Parameters
+    ----------------
+    **kwargs :
+        Keyword arguments passed to `read_file` when the data are read.
+    """
+    # ndarray attributes which are looked up on the array after it is read.
+    _delegated = frozenset(['T', 'astype', 'copy', 'flatten', 'max', 'mean', 'min',
+                            'nbytes', 'ravel', 'reshape', 'std', 'sum', 'tolist'])
+
+    def __init__(self, filepath, index, shape, dtype=None, **kwargs):
+        self.filepath = filepath
+        self.index = index
+        self._shape = tuple(int(n) for n in shape)
+        self._dtype = None if dtype is None else np.dtype(dtype)
+        self._kwargs = kwargs
+        self._array = None
+
+    @property
+    def loaded(self):
+        """
+        `True` if the data have been read from the file.
+        """
+        return self._array is not None
+
+    def read(self, section=None):
+        """
+        Return the data as an array, reading them from the file if they have
+        not been read yet, without keeping them in memory.
+
+        Parameters
+        ----------
+        section : `tuple` of `slice`, optional
+            If given, only this (y, x) section of the data is returned, and
+            only this section is read from a FITS or JPEG2000 file (see
+            `sunpy.io.fits.read` and `sunpy.io.jp2.read`). Other files are
+            read in full and the section is cut from the array.
+        """
+        if self._array is not None:
+            return self._array if section is None else self._array[section].copy()
+        if section is None:
+            array = read_file(self.filepath, **self._kwargs)[self.index][0]
+            shape = self._shape
+        else:
+            array = read_file(self.filepath, hdus=[self.index], section=section,
+                              **self._kwargs)[0][0]
+            shape = tuple(len(range(*item.indices(n))) for item, n in zip(section, self._shape))
+        if array.ndim > len(shape):
+            array = array[(0,) * (array.ndim - len(shape))]
+        if section is not None and array.shape != shape and array.shape == self._shape:
+            # The reader does not support sections and has read the whole array
+            array = array[section].copy()
+        if array.shape != shape:
+            raise ValueError("The data in {} have shape {}, but the header describes "
+                             "shape {}.".format(self.filepath, array.shape, shape))
+        self._dtype = array.dtype
+        return array
+
+    def _load(self):
+        if self._array is None:
+            self._array = self.read()
+        return self._array
+
+    @property
+    def shape(self):
+        return self._shape
+
+    @property
+    def ndim(self):
+        return len(self._shape)
+
+    @property
+    def size(self):
+        return int(np.prod(self._shape))
+
+    @property
+    def dtype(self):
+        if self._dtype is None:
+            self._load()
+        return self._dtype
+
+    def __len__(self):
+        return self._shape[0]
+
+    def __array__(self, dtype=None):
+        array = self._load()
+        if dtype is not None:
+            array = array.astype(dtype, copy=False)
+        return array
+
+    def __getitem__(self, key):
+        return self._load()[key]
+
+    def __array_ufunc__(self, ufunc, method, *inputs, **kwargs):
+        inputs = tuple(np.asarray(x) if isinstance(x, DeferredData) else x for x in inputs)
+        if 'out' in kwargs:
+            kwargs['out'] = tuple(np.asarray(x) if isinstance(x, DeferredData) else x
+                                  for x in kwargs['out'])
+        return getattr(ufunc, method)(*inputs, **kwargs)
+
+    def __getattr__(self, name):
+        if name in self._delegated:
+            return getattr(self._load(), name)
+        raise AttributeError("'{}' object has no attribute '{}'".format(type(self).__name__,
+                                                                        name))
+
+    def __repr__(self):
+        if self.loaded:
+            return repr(self._array)
+        return "<{} shape={} dtype={} from {!r}>".format(type(self).__name__, self._shape,
+                                                         self._dtype, self.filepath)
+
+
 class UnrecognizedFileTypeError(IOError):
     """Exception to raise when an unknown file type is encountered"""
     pass
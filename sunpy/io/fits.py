@@ -23,6 +23,13 @@ FITS
     invalid header tags will result in an error so verifying it early on
     makes the header easier to work with later.
 
+    [4] When only the headers of a file are needed `get_header` reads them
+    straight from the 2880 byte header blocks of the file, skipping over the
+    data, without verifying them. Only if a header cannot be parsed is the
+    file opened and verified with `~astropy.io.fits` as above. The
+    KEYCOMMENTS of these headers are only extracted from the cards when
+    they are used.
+
 References
 ----------
 | https://stackoverflow.com/questions/456672/class-factory-in-python
@@ -30,9 +37,13 @@ References
 import os
 import re
 import sys
+import gzip
 import warnings
 import traceback
 import collections
+import collections.abc
+from functools import reduce
+from operator import mul
 
 from astropy.io import fits
 
@@ -46,7 +57,7 @@ __email__ = "keith.hughitt@nasa.gov"
 HDPair = collections.namedtuple('HDPair', ['data', 'header'])
 
 
-def read(filepath, hdus=None, memmap=None, **kwargs):
+def read(filepath, hdus=None, memmap=None, section=None, **kwargs):
     """
     Read a fits file
 
@@ -56,6 +67,14 @@ def read(filepath, hdus=None, memmap=None, **kwargs):
         The fits file to be read
     hdu: `int` or iterable
         The HDU indexes to read from the file
+    memmap : `bool`, optional
+        If `True` the data arrays are memory mapped, so pixels are only read
+        from disk when they are accessed. The arrays remain valid after the
+        file has been closed.
+    section : `tuple` of `slice`, optional
+        If given, only this (y, x) section of the last two axes of each image
+        is read. The headers are updated to describe the section, with the
+        reference pixel (CRPIX1, CRPIX2) moved to match.
 
     Returns
     -------
@@ -68,22 +87,37 @@ def read(filepath, hdus=None, memmap=None, **kwargs):
     data and a FileHeader instance for each one.
     Also all comments in the original file are concatenated into a single
     'comment' key in the returned FileHeader.
+
+    Memory mapping is only possible for uncompressed images that are not
+    scaled with the BSCALE and BZERO keywords, for any other HDU the data are
+    read into memory as normal.
+
+    Sections of uncompressed images are read without reading the rest of the
+    image. Sections of tile compressed images only decompress the tiles
+    which overlap the section, if the installed version of astropy supports
+    sections of compressed images, otherwise the whole image is decompressed.
     """
     with fits.open(filepath, ignore_blank=True, memmap=memmap) as hdulist:
-        if hdus is not None:
-            if isinstance(hdus, int):
-                hdulist = hdulist[hdus]
-            elif isinstance(hdus, collections.Iterable):
-                hdulist = [hdulist[i] for i in hdus]
+        if hdus is None:
+            hdus = range(len(hdulist))
+        elif isinstance(hdus, int):
+            hdus = [hdus]
+        else:
+            hdus = list(hdus)
 
         hdulist.verify('silentfix+warn')
 
-        headers = get_header(hdulist)
+        headers = get_header(hdulist, hdus=hdus)
         pairs = []
 
-        for i, (hdu, header) in enumerate(zip(hdulist, headers)):
+        for i, header in zip(hdus, headers):
+            hdu = hdulist[i]
             try:
-                pairs.append(HDPair(hdu.data, header))
+                if section is None:
+                    data = hdu.data
+                else:
+                    data = _read_section(hdu, header, section)
+                pairs.append(HDPair(data, header))
             except (KeyError, ValueError) as e:
                 message = "Error when reading HDU {}. Skipping.\n".format(i)
                 for line in traceback.format_tb(sys.exc_info()[2]):
@@ -95,7 +129,40 @@ def read(filepath, hdus=None, memmap=None, **kwargs):
     return pairs
 
 
-def get_header(afile):
+def _read_section(hdu, header, section):
+    """
+    Read the (y, x) ``section`` of the image in ``hdu`` and update ``header``
+    to describe it. The data of HDUs which are not images are read in full.
+    """
+    is_image = hdu.is_image or isinstance(hdu, fits.CompImageHDU)
+    if not is_image or len(hdu.shape) < 2:
+        return hdu.data
+
+    shape = hdu.shape
+    key = []
+    for item, n in zip(section, shape[-2:]):
+        start, stop, step = item.indices(n)
+        if step != 1:
+            raise ValueError("Sections must be contiguous.")
+        key.append(slice(start, max(start, stop)))
+    key = (slice(None),) * (len(shape) - 2) + tuple(key)
+
+    if hasattr(hdu, 'section'):
+        data = hdu.section[key]
+    else:
+        data = hdu.data[key]
+
+    yslice, xslice = key[-2:]
+    if 'CRPIX1' in header:
+        header['CRPIX1'] = header['CRPIX1'] - xslice.start
+    if 'CRPIX2' in header:
+        header['CRPIX2'] = header['CRPIX2'] - yslice.start
+    header['NAXIS1'] = data.shape[-1]
+    header['NAXIS2'] = data.shape[-2]
+    return data
+
+
+def get_header(afile, hdus=None, fast=True):
     """
     Read a fits file and return just the headers for all HDU's. In each header,
     the key WAVEUNIT denotes the wavelength unit which is used to describe the
@@ -105,12 +172,26 @@ def get_header(afile):
     ----------
     afile : `str` or fits.HDUList
         The file to be read, or HDUList to process.
+    hdus : `int` or iterable, optional
+        The HDU indexes to read the headers of. Defaults to all the HDUs.
+    fast : `bool`, optional
+        If `True`, the default, the headers of a file are parsed directly
+        from the file, reading only as far as the last HDU requested, and
+        are not verified unless they cannot be parsed, see note [4] of this
+        module.
 
     Returns
     -------
     headers : `list`
         A list of FileHeader headers.
     """
+    if fast and isinstance(afile, str):
+        try:
+            return [_file_header(header) for header in _read_headers(afile, hdus)]
+        except Exception:
+            # Fall back to reading and verifying the file with astropy
+            pass
+
     if isinstance(afile, fits.HDUList):
         hdulist = afile
         close = False
@@ -120,34 +201,240 @@ def get_header(afile):
         close = True
 
     try:
-        headers= []
-        for hdu in hdulist:
-            try:
-                comment = "".join(hdu.header['COMMENT']).strip()
-            except KeyError:
-                comment = ""
-            try:
-                history = "".join(hdu.header['HISTORY']).strip()
-            except KeyError:
-                history = ""
+        if hdus is None:
+            hdus = range(len(hdulist))
+        elif isinstance(hdus, int):
+            hdus = [hdus]
+        headers = [_file_header(hdulist[i].header, KeyComments(hdulist[i].header).copy())
+                   for i in hdus]
+    finally:
+        if close:
+            hdulist.close()
+    return headers
+
+
+def _file_header(fits_header, keycomments=None):
+    """
+    Convert an `astropy.io.fits.Header` to a FileHeader.
+    """
+    try:
+        comment = "".join(fits_header['COMMENT']).strip()
+    except KeyError:
+        comment = ""
+    try:
+        history = "".join(fits_header['HISTORY']).strip()
+    except KeyError:
+        history = ""
+
+    header = FileHeader(fits_header)
+    header['COMMENT'] = comment
+    header['HISTORY'] = history
+    if keycomments is None:
+        keycomments = KeyComments(fits_header)
+    header['KEYCOMMENTS'] = keycomments
+    header['WAVEUNIT'] = extract_waveunit(header)
+    return header
 
-            header = FileHeader(hdu.header)
-            header['COMMENT'] = comment
-            header['HISTORY'] = history
 
-            # Strip out KEYCOMMENTS to a dict, the hard way
-            keydict = {}
-            for card in hdu.header.cards:
+class KeyComments(collections.abc.MutableMapping):
+    """
+    The comments of the cards of a FITS header, keyed by the keyword of the
+    card, which are only extracted from the cards when they are needed.
+
+    Looking up the comment of a single keyword only parses that card, while
+    iterating over or changing the comments parses the comments of all the
+    cards once.
+
+    Until the comments of all the cards have been parsed, the mapping keeps a
+    reference to the header, which is shared with deep copies of the mapping
+    rather than copied, as it is never changed. The reference is dropped once
+    all the comments have been parsed.
+
+    Parameters
+    ----------
+    fits_header : `astropy.io.fits.Header`
+        The header to take the comments from.
+    """
+    def __init__(self, fits_header):
+        self._header = fits_header
+        self._comments = None
+
+    def _all(self):
+        if self._comments is None:
+            comments = {}
+            for card in self._header.cards:
                 if card.comment != '':
-                    keydict.update({card.keyword:card.comment})
-            header['KEYCOMMENTS'] = keydict
-            header['WAVEUNIT'] = extract_waveunit(header)
+                    comments[card.keyword] = card.comment
+            self._comments = comments
+            self._header = None
+        return self._comments
+
+    def __getitem__(self, key):
+        if self._comments is not None:
+            return self._comments[key]
+        if not isinstance(key, str) or key not in self._header:
+            raise KeyError(key)
+        comment = self._header.comments[key]
+        if comment == '':
+            raise KeyError(key)
+        return comment
 
+    def __setitem__(self, key, value):
+        self._all()[key] = value
+
+    def __delitem__(self, key):
+        del self._all()[key]
+
+    def __iter__(self):
+        return iter(self._all())
+
+    def __len__(self):
+        return len(self._all())
+
+    def copy(self):
+        """
+        Return the comments as a `dict`.
+        """
+        return dict(self._all())
+
+    def __deepcopy__(self, memo):
+        new = type(self).__new__(type(self))
+        new._header = self._header
+        new._comments = None if self._comments is None else dict(self._comments)
+        return new
+
+    def __repr__(self):
+        return repr(self._all())
+
+
+_BLOCK_SIZE = 2880
+_CARD_SIZE = 80
+_END_CARD = 'END' + ' ' * (_CARD_SIZE - 3)
+
+
+def _read_headers(filepath, hdus=None):
+    """
+    Parse the headers of the HDUs ``hdus`` of a FITS file straight from its
+    header blocks, seeking over the data of the HDUs. The file may be
+    compressed with gzip.
+
+    Returns a list of `astropy.io.fits.Header`, in which the headers of tile
+    compressed images are converted to image headers.
+    """
+    if isinstance(hdus, int):
+        hdus = [hdus]
+    last = None if hdus is None else max(hdus)
+
+    filepath = os.path.expanduser(filepath)
+    with open(filepath, 'rb') as fileobj:
+        opener = gzip.open if fileobj.read(2) == b'\x1f\x8b' else open
+
+    headers = []
+    with opener(filepath, 'rb') as fileobj:
+        while last is None or len(headers) <= last:
+            try:
+                header = _read_header_blocks(fileobj)
+            except ValueError:
+                # As astropy does, ignore anything after the last extension
+                if not headers:
+                    raise
+                header = None
+            if header is None or (headers and 'XTENSION' not in header):
+                break
             headers.append(header)
-    finally:
-        if close:
-            hdulist.close()
-    return headers
+            fileobj.seek(_data_size(header), 1)
+
+    if not headers or 'SIMPLE' not in headers[0]:
+        raise ValueError("{} is not a FITS file.".format(filepath))
+    if hdus is None:
+        hdus = range(len(headers))
+    return [_image_header(headers[i]) for i in hdus]
+
+
+def _read_header_blocks(fileobj):
+    """
+    Read the header blocks at the position of ``fileobj``, returning the
+    parsed header, or `None` at the end of the file.
+    """
+    cards = []
+    while True:
+        block = fileobj.read(_BLOCK_SIZE)
+        if not block:
+            if cards:
+                raise ValueError("The file ends before the END card of a header.")
+            return None
+        if len(block) < _BLOCK_SIZE:
+            raise ValueError("The file ends in the middle of a header block.")
+        block = block.decode('ascii')
+        cards.append(block)
+        end = block.find(_END_CARD)
+        while end != -1 and end % _CARD_SIZE:
+            end = block.find(_END_CARD, end + 1)
+        if end != -1:
+            cards[-1] = block[:end]
+            return fits.Header.fromstring(''.join(cards))
+
+
+def _data_size(header):
+    """
+    The size in bytes of the data following ``header``, including padding.
+    """
+    naxis = header.get('NAXIS', 0)
+    if naxis == 0:
+        return 0
+    shape = [header['NAXIS{}'.format(i)] for i in range(1, naxis + 1)]
+    # Random groups have NAXIS1 = 0
+    if header.get('GROUPS', False) and shape[0] == 0:
+        shape = shape[1:]
+    size = (abs(header['BITPIX']) // 8 * header.get('GCOUNT', 1) *
+            (header.get('PCOUNT', 0) + reduce(mul, shape, 1)))
+    return -(-size // _BLOCK_SIZE) * _BLOCK_SIZE
+
+
+# Keywords of the binary table of a tile compressed image which are renamed
+# in the image header, see the FITS tiled image compression convention.
+_COMPRESSED_KEYWORDS = {'ZSIMPLE': 'SIMPLE', 'ZTENSION': 'XTENSION', 'ZBITPIX': 'BITPIX',
+                        'ZNAXIS': 'NAXIS', 'ZEXTEND': 'EXTEND', 'ZBLOCKED': 'BLOCKED',
+                        'ZPCOUNT': 'PCOUNT', 'ZGCOUNT': 'GCOUNT', 'ZHECKSUM': 'CHECKSUM',
+                        'ZDATASUM': 'DATASUM'}
+# Keywords which only describe the binary table or the compression
+_TABLE_KEYWORD = re.compile(r'^(XTENSION|SIMPLE|BITPIX|NAXIS\d*|PCOUNT|GCOUNT|TFIELDS|THEAP|'
+                            r'CHECKSUM|DATASUM|EXTEND|BLOCKED|'
+                            r'T(TYPE|FORM|UNIT|NULL|SCAL|ZERO|DIM|DISP)\d+|'
+                            r'ZIMAGE|ZCMPTYPE|ZTILE\d+|ZNAME\d+|ZVAL\d+|ZMASKCMP|'
+                            r'ZQUANTIZ|ZDITHER0)$')
+
+
+def _image_header(header):
+    """
+    Convert the binary table header of a tile compressed image to the header
+    of the image, as `astropy.io.fits` shows it. Other headers are returned
+    unchanged.
+    """
+    if not header.get('ZIMAGE', False):
+        return header
+
+    image = fits.Header()
+    if 'ZSIMPLE' in header:
+        image['SIMPLE'] = header['ZSIMPLE']
+    else:
+        image['XTENSION'] = header.get('ZTENSION', 'IMAGE')
+    image['BITPIX'] = header['ZBITPIX']
+    image['NAXIS'] = header['ZNAXIS']
+    for i in range(1, header['ZNAXIS'] + 1):
+        image['NAXIS{}'.format(i)] = header['ZNAXIS{}'.format(i)]
+    if 'XTENSION' in image:
+        image['PCOUNT'] = header.get('ZPCOUNT', 0)
+        image['GCOUNT'] = header.get('ZGCOUNT', 1)
+    for key in ('ZEXTEND', 'ZBLOCKED', 'ZHECKSUM', 'ZDATASUM'):
+        if key in header:
+            image[_COMPRESSED_KEYWORDS[key]] = header[key]
+
+    for card in header.cards:
+        if not (_TABLE_KEYWORD.match(card.keyword) or card.keyword in _COMPRESSED_KEYWORDS or
+                card.keyword.startswith('ZNAXIS')):
+            image.append(card)
+    return image
 
 
 def write(fname, data, header, **kwargs):
@@ -191,7 +478,7 @@ def write(fname, data, header, **kwargs):
         else:
             fits_header.append(fits.Card(k, v))
 
-    if isinstance(key_comments, dict):
+    if isinstance(key_comments, collections.abc.Mapping):
         for k, v in key_comments.items():
             # Check that the Card for the comment exists before trying to write to it.
             if k in fits_header:
@@ -0,0 +1,293 @@
+"""
+A persistent index of the headers of FITS files.
+"""
+import os
+import zlib
+import sqlite3
+import threading
+
+import astropy.units as u
+from astropy.io import fits as astropy_fits
+
+from sunpy.io import fits
+from sunpy.time import parse_time
+
+__all__ = ['HeaderIndex']
+
+# The columns of the index, and the header keys they are taken from
+_COLUMNS = {'date_obs': ('DATE-OBS', 'DATE_OBS'),
+            'wavelnth': ('WAVELNTH',),
+            'waveunit': ('WAVEUNIT',),
+            'instrume': ('INSTRUME',),
+            'naxis1': ('NAXIS1',),
+            'naxis2': ('NAXIS2',),
+            'ctype1': ('CTYPE1',),
+            'ctype2': ('CTYPE2',),
+            'cunit1': ('CUNIT1',),
+            'cunit2': ('CUNIT2',),
+            'crpix1': ('CRPIX1',),
+            'crpix2': ('CRPIX2',),
+            'crval1': ('CRVAL1',),
+            'crval2': ('CRVAL2',),
+            'cdelt1': ('CDELT1',),
+            'cdelt2': ('CDELT2',)}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    size INTEGER,
+    mtime REAL
+);
+CREATE TABLE IF NOT EXISTS headers (
+    path TEXT REFERENCES files(path) ON DELETE CASCADE,
+    hdu INTEGER,
+    {columns},
+    header BLOB,
+    PRIMARY KEY (path, hdu)
+);
+CREATE INDEX IF NOT EXISTS headers_date_obs ON headers (date_obs);
+""".format(columns=',\n    '.join(_COLUMNS))
+
+
+class HeaderIndex(object):
+    """
+    A persistent index of the headers of FITS files, stored in an SQLite
+    database.
+
+    The headers of each file are stored with the size and modification time
+    of the file, and are only read from the file again when these change, so
+    an archive of files can be rescanned with `update` by checking the
+    status of the files alone. The most commonly used keys of the headers,
+    the observation time, wavelength, instrument and the WCS keys of the
+    first two axes, are stored in columns of their own so files can be
+    selected with `search` without reading any headers.
+
+    The index can be passed to `sunpy.map.Map` with ``lazy=True`` and to
+    `sunpy.database.tables.entries_from_dir` or
+    `sunpy.database.Database.add_from_dir`, which then take the headers of
+    files from the index rather than opening the files.
+
+    Parameters
+    ----------
+    filepath : `str`
+        The file of the database, which is created if it does not exist. Use
+        ``':memory:'`` for an index which is not saved.
+
+    Examples
+    --------
+    >>> import glob
+    >>> from sunpy.io.header_index import HeaderIndex
+    >>> index = HeaderIndex('~/aia_headers.sqlite')   # doctest: +SKIP
+    >>> index.update(glob.glob('/data/aia/**/*.fits', recursive=True))   # doctest: +SKIP
+    >>> files = index.search(start='2011-06-07', end='2011-06-08', instrument='AIA_3')   # doctest: +SKIP
+    >>> sequence = sunpy.map.Map(files, sequence=True, lazy=True, index=index)   # doctest: +SKIP
+    """
+    def __init__(self, filepath):
+        if filepath != ':memory:':
+            filepath = os.path.expanduser(filepath)
+        self.filepath = filepath
+        self._connection = sqlite3.connect(filepath, check_same_thread=False)
+        self._connection.execute('PRAGMA foreign_keys = ON')
+        self._connection.executescript(_SCHEMA)
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        """
+        The number of files in the index.
+        """
+        with self._lock:
+            return self._connection.execute('SELECT COUNT(*) FROM files').fetchone()[0]
+
+    def __contains__(self, path):
+        with self._lock:
+            return self._connection.execute('SELECT 1 FROM files WHERE path = ?',
+                                            (_normpath(path),)).fetchone() is not None
+
+    def close(self):
+        """
+        Close the database.
+        """
+        with self._lock:
+            self._connection.close()
+
+    def get_header(self, path):
+        """
+        Return the headers of the FITS file ``path``, as returned by
+        `sunpy.io.fits.get_header`.
+
+        The headers are read from the file, and added to the index, if the
+        file is not in the index or has changed since it was indexed.
+        """
+        path = _normpath(path)
+        self.update([path])
+        with self._lock:
+            rows = self._connection.execute(
+                'SELECT header FROM headers WHERE path = ? ORDER BY hdu', (path,)).fetchall()
+        return [fits._file_header(_decode(row[0])) for row in rows]
+
+    def update(self, paths, executor=None):
+        """
+        Add the files ``paths`` to the index, reading the headers of the files
+        which are not in the index or have changed since they were indexed.
+
+        Parameters
+        ----------
+        paths : iterable of `str`
+            The paths of FITS files.
+        executor : `concurrent.futures.Executor`, optional
+            If given, the headers of the new or changed files are read
+            concurrently using this executor, for example a
+            `concurrent.futures.ThreadPoolExecutor`.
+
+        Returns
+        -------
+        updated : `list`
+            The paths of the files which were read.
+        """
+        status = {}
+        for path in paths:
+            path = _normpath(path)
+            stat = os.stat(path)
+            status[path] = (stat.st_size, stat.st_mtime)
+
+        with self._lock:
+            updated = [path for path in status if self._connection.execute(
+                'SELECT size, mtime FROM files WHERE path = ?', (path,)).fetchone() != status[path]]
+
+        if executor is None:
+            all_headers = map(_read_fits_headers, updated)
+        else:
+            all_headers = executor.map(_read_fits_headers, updated)
+
+        with self._lock, self._connection:
+            for path, headers in zip(updated, all_headers):
+                self._connection.execute('DELETE FROM files WHERE path = ?', (path,))
+                self._connection.execute('INSERT INTO files VALUES (?, ?, ?)',
+                                         (path,) + status[path])
+                self._connection.executemany(
+                    'INSERT INTO headers VALUES ({})'.format(', '.join('?' * (len(_COLUMNS) + 3))),
+                    [(path, hdu) + _columns(header) + (_encode(header),)
+                     for hdu, header in enumerate(headers)])
+        return updated
+
+    def prune(self):
+        """
+        Remove the files which no longer exist from the index.
+
+        Returns
+        -------
+        removed : `list`
+            The paths of the files which were removed.
+        """
+        with self._lock, self._connection:
+            removed = [path for (path,) in self._connection.execute('SELECT path FROM files')
+                       if not os.path.exists(path)]
+            self._connection.executemany('DELETE FROM files WHERE path = ?',
+                                         [(path,) for path in removed])
+        return removed
+
+    def search(self, start=None, end=None, instrument=None, wavelength=None):
+        """
+        Return the paths of the indexed files with a header matching all the
+        criteria given, ordered by the observation time.
+
+        Parameters
+        ----------
+        start, end : `str`, `~astropy.time.Time` or `datetime.datetime`, optional
+            The range of the observation time, DATE-OBS, of the headers,
+            including the ends.
+        instrument : `str`, optional
+            The instrument of the headers, INSTRUME.
+        wavelength : `~astropy.units.Quantity` or `float`, optional
+            The wavelength of the headers, WAVELNTH. A float is compared with
+            the value of WAVELNTH in the header, a Quantity is converted to
+            the unit of the header.
+
+        Returns
+        -------
+        paths : `list`
+        """
+        conditions = []
+        values = []
+        if start is not None:
+            conditions.append('date_obs >= ?')
+            values.append(parse_time(start).isot)
+        if end is not None:
+            conditions.append('date_obs <= ?')
+            values.append(parse_time(end).isot)
+        if instrument is not None:
+            conditions.append('instrume = ?')
+            values.append(instrument)
+        where = ' AND '.join(conditions) or '1'
+
+        with self._lock:
+            rows = self._connection.execute(
+                'SELECT path, wavelnth, waveunit FROM headers WHERE {} '
+                'ORDER BY date_obs, path, hdu'.format(where), values).fetchall()
+
+        paths = []
+        for path, wavelnth, waveunit in rows:
+            if wavelength is not None and not _same_wavelength(wavelength, wavelnth, waveunit):
+                continue
+            if path not in paths:
+                paths.append(path)
+        return paths
+
+
+def _normpath(path):
+    return os.path.abspath(os.path.expanduser(path))
+
+
+def _read_fits_headers(path):
+    """
+    The `astropy.io.fits.Header` of each HDU of a FITS file.
+    """
+    try:
+        return fits._read_headers(path)
+    except Exception:
+        # Fall back to reading and verifying the file with astropy
+        with astropy_fits.open(path, ignore_blank=True) as hdulist:
+            hdulist.verify('silentfix')
+            return [hdu.header for hdu in hdulist]
+
+
+def _encode(header):
+    return zlib.compress(header.tostring(endcard=False, padding=False).encode('ascii'))
+
+
+def _decode(blob):
+    return astropy_fits.Header.fromstring(zlib.decompress(blob).decode('ascii'))
+
+
+def _columns(header):
+    """
+    The values of the columns of the index for the `astropy.io.fits.Header`
+    ``header``.
+    """
+    # This sets WAVEUNIT as get_header does
+    header = fits._file_header(header)
+    values = []
+    for column, keys in _COLUMNS.items():
+        value = next((header[key] for key in keys if key in header), None)
+        if column == 'date_obs' and value is not None:
+            try:
+                value = parse_time(value).isot
+            except ValueError:
+                value = None
+        elif not isinstance(value, (str, int, float, type(None))):
+            value = str(value)
+        values.append(value)
+    return tuple(values)
+
+
+def _same_wavelength(wavelength, wavelnth, waveunit):
+    if wavelnth is None:
+        return False
+    if hasattr(wavelength, 'unit'):
+        if waveunit is None:
+            return False
+        try:
+            wavelength = wavelength.to_value(waveunit)
+        except (ValueError, u.UnitsError):
+            return False
+    return abs(wavelength - wavelnth) <= 1e-6 * abs(wavelnth)
@@ -16,7 +16,7 @@ __email__ = "keith.hughitt@nasa.gov"
 HDPair = collections.namedtuple('HDPair', ['data', 'header'])
 
 
-def read(filepath, **kwargs):
+def read(filepath, rlevel=0, section=None, **kwargs):
     """
     Reads a JPEG2000 file
 
@@ -24,17 +24,54 @@ def read(filepath, **kwargs):
     ----------
     filepath : `str`
         The file to be read
+    rlevel : `int`, optional
+        Decode the image at a resolution reduced by a factor of ``2**rlevel``
+        in both directions, which only decodes the part of the file needed
+        for that resolution. Default 0, the full resolution.
+    section : `tuple` of `slice`, optional
+        If given, only this (y, x) section of the image is decoded. The
+        section is in the pixels of the full resolution image, with the first
+        row at the bottom of the image, as in the returned data.
 
     Returns
     -------
     pairs : `list`
         A list of (data, header) tuples
-    """
-    header = get_header(filepath)
-
-    data = Jp2k(filepath).read()[::-1]
 
-    return [HDPair(data, header[0])]
+    Notes
+    -----
+    When ``rlevel`` or ``section`` are given the header is updated to
+    describe the data which were read: NAXIS1 and NAXIS2, the reference
+    pixel (CRPIX1, CRPIX2) and the pixel scale (CDELT1 and CDELT2, or the CD
+    matrix).
+    """
+    jp2 = Jp2k(filepath)
+    header = _get_header(jp2)
+
+    if not rlevel and section is None:
+        return [HDPair(jp2.read()[::-1], header)]
+
+    ny, nx = jp2.shape[:2]
+    step = 2 ** rlevel
+    if section is None:
+        section = (slice(None), slice(None))
+    y0, y1, ystep = section[0].indices(ny)
+    x0, x1, xstep = section[1].indices(nx)
+    if ystep != 1 or xstep != 1:
+        raise ValueError("Sections must be contiguous.")
+    y1 = max(y0, y1)
+    x1 = max(x0, x1)
+
+    # The rows of the file are ordered from the top of the image
+    data = jp2[ny - y1:ny - y0:step, x0:x1:step][::-1]
+
+    # The full resolution pixel at the centre of the first pixel read, the
+    # reduced image is aligned to the first row and column of the file
+    first_row = -(-(ny - y1) // step) + data.shape[0] - 1
+    ystart = ny - 1 - first_row * step - (step - 1) / 2
+    xstart = -(-x0 // step) * step + (step - 1) / 2
+    _update_wcs(header, data.shape, step, xstart, ystart)
+    return [HDPair(data, header)]
 
 
 def get_header(filepath):
@@ -51,7 +88,13 @@ def get_header(filepath):
     headers : list
         A list of headers read from the file
     """
-    jp2 = Jp2k(filepath)
+    return [_get_header(Jp2k(filepath))]
+
+
+def _get_header(jp2):
+    """
+    Read the header from the XML box of the `glymur.Jp2k` file ``jp2``.
+    """
     xml_box = [box for box in jp2.box if box.box_id == 'xml ']
     xmlstring = ET.tostring(xml_box[0].xml.find('fits'))
     pydict = xml_to_dict(xmlstring)["fits"]
@@ -70,7 +113,26 @@ def get_header(filepath):
     # Is this file a Helioviewer Project JPEG2000 file?
     pydict['helioviewer'] = xml_box[0].xml.find('helioviewer') is not None
 
-    return [FileHeader(pydict)]
+    return FileHeader(pydict)
+
+
+def _update_wcs(header, shape, step, xstart, ystart):
+    """
+    Update ``header`` for data of ``shape`` read with one pixel for every
+    ``step`` pixels of the full image, whose first pixel is centred on the
+    0-based full resolution pixel (``xstart``, ``ystart``).
+    """
+    def update(key, func):
+        for name in (key, key.lower()):
+            if name in header:
+                header[name] = func(header[name])
+
+    update('NAXIS1', lambda value: shape[1])
+    update('NAXIS2', lambda value: shape[0])
+    update('CRPIX1', lambda value: (value - 1 - xstart) / step + 1)
+    update('CRPIX2', lambda value: (value - 1 - ystart) / step + 1)
+    for key in ('CDELT1', 'CDELT2', 'CD1_1', 'CD1_2', 'CD2_1', 'CD2_2'):
+        update(key, lambda value: value * step)
 
 
 def write(fname, data, header):
@@ -55,6 +55,23 @@ def read_struct_skeleton(xdrdata):
             tagdict[tt] = [dim] + arr_size
     return tagdict
 
+# The numpy dtypes of the XDR encoding of each IDL type, and of the arrays
+# returned for them. Integers shorter than 4 bytes are padded to 4 bytes.
+# http://www.harrisgeospatial.com/docs/SIZE.html
+_XDR_DTYPES = {
+    2: ('>i4', np.int16),  # int
+    3: ('>i4', np.int32),  # long
+    4: ('>f4', np.float32),
+    5: ('>f8', np.float64),
+    6: ('>c8', np.complex128),
+    9: ('>c16', np.complex64),
+    12: ('>u4', np.uint16),  # unsign int
+    13: ('>u4', np.uint32),  # unsign Long int
+    14: ('>i8', np.int64),  # Long64
+    15: ('>u8', np.uint64),  # unsign Long64
+}
+
+
 def struct_to_data(xdrdata, subskeleton):
     """"
     Converts the dictionary with the keys and IDL's size output to
@@ -63,27 +80,37 @@ def struct_to_data(xdrdata, subskeleton):
     `subskeleton` must contain the size and type of the data that's going to be
     read in the right order (that's why `OrderedDict` is used). Then the data is
     read and the `subskeleton` is updated with the data itself.
+
+    Numeric arrays are read directly from the buffer of ``xdrdata`` with
+    `numpy.frombuffer`. Arrays of structures which do not contain strings
+    are read as numpy structured arrays in the same way.
     """
     #http://www.harrisgeospatial.com/docs/SIZE.html
     types_dict = {
-        2: (xdrdata.unpack_int, np.int16), # int
-        3: (xdrdata.unpack_int, np.int32), # long
-        4: (xdrdata.unpack_float, np.float32),
-        5: (xdrdata.unpack_double, np.float64),
-        6: (xdrdata.unpack_complex, np.complex),
-        7: (xdrdata.unpack_string, None),
-        9: (xdrdata.unpack_complex_double, np.complex64),
-        12: (xdrdata.unpack_uint, np.uint16), # unsign int
-        13: (xdrdata.unpack_uint, np.uint32), # unsign Long int
-        14: (xdrdata.unpack_hyper, np.int64), # Long64
-        15: (xdrdata.unpack_uhyper, np.uint64), # unsign Long64
+        2: xdrdata.unpack_int, # int
+        3: xdrdata.unpack_int, # long
+        4: xdrdata.unpack_float,
+        5: xdrdata.unpack_double,
+        6: xdrdata.unpack_complex,
+        7: xdrdata.unpack_string,
+        9: xdrdata.unpack_complex_double,
+        12: xdrdata.unpack_uint, # unsign int
+        13: xdrdata.unpack_uint, # unsign Long int
+        14: xdrdata.unpack_hyper, # Long64
+        15: xdrdata.unpack_uhyper, # unsign Long64
     }
     for key in subskeleton:
         if isinstance(subskeleton[key], OrderedDict):
             struct_to_data(xdrdata, subskeleton[key])
         elif isinstance(subskeleton[key], np.ndarray):
-            testlist = list()
             struct_shape = subskeleton[key].shape
+            dtypes = _struct_dtypes(subskeleton[key].flat[0])
+            if dtypes is not None:
+                subskeleton[key] = _unpack_array(xdrdata, dtypes[0], dtypes[1],
+                                                 subskeleton[key].size).reshape(struct_shape)
+                continue
+            # Structures with strings do not have a fixed size
+            testlist = list()
             for elem in subskeleton[key].flatten():
                 elem2 = copy.deepcopy(elem)
                 struct_to_data(xdrdata, elem2)
@@ -93,10 +120,55 @@ def struct_to_data(xdrdata, subskeleton):
             sswsize = subskeleton[key]
             sswtype = sswsize[-2]
             if sswsize[0] == 0:
-                subskeleton[key] = types_dict[sswtype][0]()
+                subskeleton[key] = types_dict[sswtype]()
+            elif sswtype == 7:
+                subskeleton[key] = np.array(xdrdata.unpack_farray(sswsize[-1], types_dict[sswtype]),
+                                            dtype=None).reshape(sswsize[1:-2][::-1])
             else:
-                subskeleton[key] = np.array(xdrdata.unpack_farray(sswsize[-1], types_dict[sswtype][0]),
-                                            dtype=types_dict[sswtype][1]).reshape(sswsize[1:-2][::-1])
+                xdr_dtype, dtype = _XDR_DTYPES[sswtype]
+                subskeleton[key] = _unpack_array(xdrdata, xdr_dtype, dtype,
+                                                 sswsize[-1]).reshape(sswsize[1:-2][::-1])
+
+
+def _unpack_array(xdrdata, xdr_dtype, dtype, count):
+    """
+    Read ``count`` elements of ``xdr_dtype`` from the current position of
+    ``xdrdata`` and return them as a new array of ``dtype``.
+    """
+    position = xdrdata.get_position()
+    data = np.frombuffer(xdrdata.get_buffer(), dtype=xdr_dtype, count=count, offset=position)
+    xdrdata.set_position(position + data.nbytes)
+    # The XDR data are big-endian, so on little-endian machines they are
+    # converted in one step. Otherwise they are copied out of the read-only
+    # file buffer.
+    array = data.astype(dtype, copy=False)
+    return array.copy() if array is data else array
+
+
+def _struct_dtypes(skeleton):
+    """
+    The numpy structured dtypes of the XDR encoding of one element of the
+    structure ``skeleton`` and of the values returned for it, or `None` if
+    the structure contains strings and so does not have a fixed size.
+    """
+    xdr_fields = []
+    fields = []
+    for key, value in skeleton.items():
+        if isinstance(value, OrderedDict):
+            dtypes, shape = _struct_dtypes(value), ()
+        elif isinstance(value, np.ndarray):
+            dtypes, shape = _struct_dtypes(value.flat[0]), value.shape
+        elif value[-2] in _XDR_DTYPES:
+            dtypes = _XDR_DTYPES[value[-2]]
+            shape = () if value[0] == 0 else tuple(value[1:-2][::-1])
+        else:
+            return None
+        if dtypes is None:
+            return None
+        xdr_fields.append((key, dtypes[0], shape))
+        fields.append((key, dtypes[1], shape))
+    return np.dtype(xdr_fields), np.dtype(fields)
+
 
 def read_genx(filename):
     """solarsoft genx file reader
@@ -132,6 +204,9 @@ def read_genx(filename):
 
     **Strings** read from genx files are assumed to be UTF-8.
 
+    Arrays of structures which do not contain strings are returned as numpy
+    structured arrays, other arrays of structures as arrays of dictionaries.
+
     """
     with open(filename, mode='rb') as xdrfile:
         xdrdata = SSWUnpacker(xdrfile.read())
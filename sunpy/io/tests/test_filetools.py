@@ -2,6 +2,8 @@
 import numpy as np
 import os
 
+import pytest
+
 import sunpy
 import sunpy.io
 import sunpy.data.test
@@ -125,3 +127,30 @@ class TestFiletools(object):
         os.remove("ana_test_write.fz")
 
     #TODO: Test write jp2
+
+
+def test_deferred_data():
+    data = sunpy.io.file_tools.DeferredData(AIA_171_IMAGE, 0, (128, 128), np.dtype('>f8'))
+    assert data.shape == (128, 128)
+    assert data.ndim == 2
+    assert data.size == 128 * 128
+    assert data.dtype == np.dtype('>f8')
+    assert not data.loaded
+    assert 'DeferredData' in repr(data)
+
+    expected = sunpy.io.read_file(AIA_171_IMAGE)[0][0]
+    # read does not keep the data
+    np.testing.assert_equal(data.read(), expected)
+    assert not data.loaded
+    np.testing.assert_equal(data[10:20, 5], expected[10:20, 5])
+    assert data.loaded
+    np.testing.assert_equal(np.asarray(data), expected)
+    np.testing.assert_equal(data * 2, expected * 2)
+    assert data.mean() == expected.mean()
+    np.testing.assert_equal(data.T, expected.T)
+
+
+def test_deferred_data_wrong_shape():
+    data = sunpy.io.file_tools.DeferredData(AIA_171_IMAGE, 0, (64, 64))
+    with pytest.raises(ValueError):
+        np.asarray(data)
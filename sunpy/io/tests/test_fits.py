@@ -1,3 +1,9 @@
+import copy
+
+import numpy as np
+import pytest
+from astropy.io import fits
+
 import sunpy.io.fits
 from sunpy.io.fits import get_header, extract_waveunit
 
@@ -12,6 +18,7 @@ RHESSI_IMAGE = os.path.join(testpath, 'hsi_image_20101016_191218.fits')
 EIT_195_IMAGE = os.path.join(testpath, 'EIT/efz20040301.000010_s.fits')
 AIA_171_IMAGE = os.path.join(testpath, 'aia_171_level1.fits')
 SWAP_LEVEL1_IMAGE = os.path.join(testpath, 'SWAP/resampled1_swap.fits')
+GZIP_IMAGE = os.path.join(testpath, 'gzip_test.fits.gz')
 
 
 def read_hdus():
@@ -95,3 +102,68 @@ def test_extra_comment_write(tmpdir):
     outfile = tmpdir / "test.fits"
     sunpy.io.fits.write(str(outfile), data, header)
     assert outfile.exists()
+
+
+@pytest.mark.parametrize('filepath', [RHESSI_IMAGE, EIT_195_IMAGE, AIA_171_IMAGE,
+                                      SWAP_LEVEL1_IMAGE, GZIP_IMAGE])
+def test_get_header_fast(filepath):
+    fast = get_header(filepath)
+    verified = get_header(filepath, fast=False)
+    assert len(fast) == len(verified)
+    for fast_header, header in zip(fast, verified):
+        assert isinstance(fast_header['KEYCOMMENTS'], sunpy.io.fits.KeyComments)
+        assert dict(fast_header['KEYCOMMENTS']) == header['KEYCOMMENTS']
+        fast_header.pop('KEYCOMMENTS')
+        header.pop('KEYCOMMENTS')
+        assert fast_header == header
+
+
+def test_get_header_hdus():
+    headers = get_header(RHESSI_IMAGE, hdus=[0, 2])
+    assert len(headers) == 2
+    assert headers[1] == get_header(RHESSI_IMAGE, fast=False)[2]
+    assert get_header(RHESSI_IMAGE, hdus=1) == get_header(RHESSI_IMAGE, hdus=1, fast=False)
+
+
+def test_get_header_compressed(tmpdir):
+    data, header = sunpy.io.fits.read(AIA_171_IMAGE)[0]
+    filepath = str(tmpdir / "compressed.fits")
+    fits.HDUList([fits.PrimaryHDU(),
+                  fits.CompImageHDU(data.astype(np.int16), fits.Header({'TELESCOP': 'SDO'}))]
+                 ).writeto(filepath)
+    fast = get_header(filepath)[1]
+    verified = get_header(filepath, fast=False)[1]
+    assert fast['BITPIX'] == 16
+    assert fast['NAXIS1'] == 128
+    assert fast['TELESCOP'] == 'SDO'
+    for key in ('XTENSION', 'BITPIX', 'NAXIS', 'NAXIS1', 'NAXIS2', 'PCOUNT', 'GCOUNT', 'TELESCOP'):
+        assert fast[key] == verified[key]
+
+
+def test_key_comments():
+    header = get_header(AIA_171_IMAGE)[0]
+    keycomments = header['KEYCOMMENTS']
+    assert keycomments.get('NOT A KEY') is None
+    # Looking up single keys does not parse all the comments
+    assert keycomments._comments is None
+    assert copy.deepcopy(keycomments)._header is keycomments._header
+    keycomments['TEST'] = "Hello world"
+    assert keycomments['TEST'] == "Hello world"
+    assert 'TEST' in dict(keycomments)
+
+
+def test_read_section():
+    data, header = sunpy.io.fits.read(AIA_171_IMAGE)[0]
+    section_data, section_header = sunpy.io.fits.read(
+        AIA_171_IMAGE, section=(slice(10, 30), slice(40, None)))[0]
+    np.testing.assert_equal(section_data, data[10:30, 40:])
+    assert section_header['NAXIS1'] == data.shape[1] - 40
+    assert section_header['NAXIS2'] == 20
+    assert section_header['CRPIX1'] == header['CRPIX1'] - 40
+    assert section_header['CRPIX2'] == header['CRPIX2'] - 10
+
+
+def test_read_hdus():
+    pairs = sunpy.io.fits.read(RHESSI_IMAGE, hdus=[0, 2])
+    assert len(pairs) == 2
+    assert pairs[1].header == get_header(RHESSI_IMAGE, fast=False)[2]
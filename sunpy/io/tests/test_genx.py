@@ -1,4 +1,5 @@
 import os
+import xdrlib
 import datetime
 
 import pytest
@@ -58,9 +59,64 @@ def test_value_slice(slice, value):
                                             (TESTING['MYSTRUCTURE']['MYDCARRAY'], np.complex64)])
 def test_type(myarray, dtype):
     assert myarray.dtype == dtype
+    assert myarray.flags.writeable
 
 
 def test_date():
     creation_str = TESTING['HEADER']['CREATION']
     creation = datetime.datetime.strptime(creation_str, '%a %b %d %H:%M:%S %Y')
     assert int(''.join(chr(x) for x in TESTING['MYSTRUCTURE']['RANDOMNUMBERS'][-4:])) == creation.year
+
+
+def _pack_string(packer, string):
+    # Strings are written by IDL with their length twice
+    data = string.encode('utf-8')
+    packer.pack_uint(len(data))
+    if data:
+        packer.pack_uint(len(data))
+        packer.pack_fstring(len(data), data)
+
+
+def test_structure_array(tmpdir):
+    """
+    Arrays of structures without strings are read as structured arrays.
+    """
+    packer = xdrlib.Packer()
+    packer.pack_int(1)  # version
+    packer.pack_int(1)  # xdr
+    _pack_string(packer, 'Sat Oct 29 08:15:08 2016')
+    _pack_string(packer, 'structure array')
+    packer.pack_int(1)
+    packer.pack_farray(3, [1, 8, 1], packer.pack_int)
+    # Skeleton: VALUES float[3], RESP {A: int, B: double[2]}[4]
+    packer.pack_uint(2)
+    _pack_string(packer, 'VALUES')
+    _pack_string(packer, 'RESP')
+    packer.pack_uint(1)
+    packer.pack_farray(3, [3, 4, 3], packer.pack_int)
+    packer.pack_uint(1)
+    packer.pack_farray(3, [4, 8, 4], packer.pack_int)
+    packer.pack_uint(2)
+    _pack_string(packer, 'A')
+    _pack_string(packer, 'B')
+    packer.pack_uint(0)
+    packer.pack_farray(2, [2, 1], packer.pack_int)
+    packer.pack_uint(1)
+    packer.pack_farray(3, [2, 5, 2], packer.pack_int)
+    # Data
+    packer.pack_farray(3, [0.5, 1.5, 2.5], packer.pack_float)
+    for i in range(4):
+        packer.pack_int(-i)
+        packer.pack_farray(2, [i, 10. * i], packer.pack_double)
+    filename = str(tmpdir / 'structure_array.genx')
+    with open(filename, 'wb') as genxfile:
+        genxfile.write(packer.get_buffer())
+
+    data = genx.read_genx(filename)
+    np.testing.assert_equal(data['VALUES'], [0.5, 1.5, 2.5])
+    assert data['VALUES'].dtype == np.float32
+    assert data['RESP'].shape == (4,)
+    assert data['RESP'].dtype['A'] == np.int16
+    np.testing.assert_equal(data['RESP']['A'], [0, -1, -2, -3])
+    np.testing.assert_equal(data['RESP'][2]['B'], [2., 20.])
+    assert data['HEADER']['TEXT'] == 'structure array'
@@ -0,0 +1,85 @@
+import os
+import glob
+import shutil
+
+import pytest
+
+import sunpy.map
+import sunpy.data.test
+from sunpy.io.fits import get_header
+from sunpy.io.header_index import HeaderIndex
+from sunpy.time import parse_time
+
+testpath = sunpy.data.test.rootdir
+
+
+@pytest.fixture
+def eit_files(tmpdir):
+    files = []
+    for path in sorted(glob.glob(os.path.join(testpath, 'EIT', '*.fits')))[:4]:
+        files.append(str(tmpdir / os.path.basename(path)))
+        shutil.copy(path, files[-1])
+    return files
+
+
+def test_update(eit_files):
+    index = HeaderIndex(':memory:')
+    assert index.update(eit_files) == eit_files
+    assert len(index) == len(eit_files)
+    assert eit_files[0] in index
+    # Nothing has changed
+    assert index.update(eit_files) == []
+
+    stat = os.stat(eit_files[1])
+    os.utime(eit_files[1], (stat.st_atime, stat.st_mtime + 10))
+    assert index.update(eit_files) == [eit_files[1]]
+
+
+def test_get_header(eit_files):
+    index = HeaderIndex(':memory:')
+    headers = index.get_header(eit_files[0])
+    expected = get_header(eit_files[0])
+    assert len(headers) == len(expected)
+    for header, expected_header in zip(headers, expected):
+        assert dict(header.pop('KEYCOMMENTS')) == dict(expected_header.pop('KEYCOMMENTS'))
+        assert header == expected_header
+
+
+def test_persistent(eit_files, tmpdir):
+    filepath = str(tmpdir / 'index.sqlite')
+    index = HeaderIndex(filepath)
+    index.update(eit_files)
+    index.close()
+    assert HeaderIndex(filepath).update(eit_files) == []
+
+
+def test_search(eit_files):
+    index = HeaderIndex(':memory:')
+    index.update(eit_files)
+    dates = [parse_time(get_header(path)[0]['DATE-OBS']) for path in eit_files]
+    assert sorted(index.search(), key=eit_files.index) == eit_files
+    assert index.search(start=max(dates)) == [eit_files[dates.index(max(dates))]]
+    assert index.search(end=min(dates)) == [eit_files[dates.index(min(dates))]]
+    assert index.search(instrument='not an instrument') == []
+    wavelength = get_header(eit_files[0])[0]['WAVELNTH']
+    assert eit_files[0] in index.search(wavelength=wavelength)
+
+
+def test_prune(eit_files):
+    index = HeaderIndex(':memory:')
+    index.update(eit_files)
+    os.remove(eit_files[0])
+    assert index.prune() == [eit_files[0]]
+    assert len(index) == len(eit_files) - 1
+    assert index.search() and eit_files[0] not in index.search()
+
+
+def test_map_lazy(eit_files):
+    index = HeaderIndex(':memory:')
+    sequence = sunpy.map.Map(eit_files, sequence=True, lazy=True, index=index)
+    assert len(index) == len(eit_files)
+    lazy = [m for m in sequence if m.data.filepath == eit_files[0]][0]
+    inmemory = sunpy.map.Map(eit_files[0])
+    assert lazy.date == inmemory.date
+    assert lazy.dimensions == inmemory.dimensions
+    assert not lazy.data.loaded
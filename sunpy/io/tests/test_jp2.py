@@ -3,6 +3,7 @@ JPEG2000 reading tests
 """
 #pylint: disable=C0103,R0904,W0201,W0212,W0232,E1103
 import numpy as np
+import astropy.units as u
 
 from sunpy.data.test import get_test_filepath
 from sunpy.io.header import FileHeader
@@ -34,3 +35,38 @@ def test_read_file():
     SunPy map"""
     map_ = Map(AIA_193_JP2)
     assert isinstance(map_, GenericMap)
+
+@skip_glymur
+def test_read_rlevel_section():
+    """Tests reading the JP2 data at reduced resolution and in a section"""
+    from sunpy.io.jp2 import read
+    data, header = read(AIA_193_JP2)[0]
+    ny, nx = data.shape
+
+    section, section_header = read(AIA_193_JP2, section=(slice(10, 50), slice(20, 60)))[0]
+    np.testing.assert_equal(section, data[10:50, 20:60])
+    assert section_header['NAXIS1'] == 40
+    assert section_header['CRPIX1'] == header['CRPIX1'] - 20
+    assert section_header['CRPIX2'] == header['CRPIX2'] - 10
+
+    reduced, reduced_header = read(AIA_193_JP2, rlevel=1)[0]
+    assert reduced.shape == (-(-ny // 2), -(-nx // 2))
+    assert reduced_header['CDELT1'] == header['CDELT1'] * 2
+    # The reference pixel stays at the same place on the image
+    assert reduced_header['CRPIX1'] == (header['CRPIX1'] - 1.5) / 2 + 1
+
+@skip_glymur
+def test_map_rlevel():
+    """Tests the WCS of a map read at reduced resolution"""
+    full = Map(AIA_193_JP2)
+    reduced = Map(AIA_193_JP2, rlevel=2)
+    assert reduced.data.shape[0] == -(-full.data.shape[0] // 4)
+    assert u.allclose(reduced.scale.axis1, full.scale.axis1 * 4)
+    # The first reduced pixel is centred between the first four full pixels
+    # in x, and the rows of the reduced image are aligned to the top row
+    ny = full.data.shape[0]
+    ystart = ny - 1 - (reduced.data.shape[0] - 1) * 4 - 1.5
+    reduced_coord = reduced.pixel_to_world(0*u.pix, 0*u.pix)
+    full_coord = full.pixel_to_world(1.5*u.pix, ystart*u.pix)
+    assert u.allclose(reduced_coord.Tx, full_coord.Tx)
+    assert u.allclose(reduced_coord.Ty, full_coord.Ty)
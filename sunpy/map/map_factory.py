@@ -1,5 +1,6 @@
 import os
 import glob
+import functools
 from collections import OrderedDict
 import warnings
 
@@ -12,7 +13,7 @@ from sunpy.map.mapbase import GenericMap
 from sunpy.map.compositemap import CompositeMap
 from sunpy.map.mapsequence import MapSequence
 
-from sunpy.io.file_tools import read_file
+from sunpy.io.file_tools import read_file, read_file_header, DeferredData, _get_reader_name
 from sunpy.io.header import FileHeader
 
 from sunpy.util.net import download_file
@@ -122,6 +123,13 @@ class MapFactory(BasicRegistrationFactory):
         """ Read in a file name and return the list of (data, meta) pairs in
             that file. """
 
+        if kwargs.get('rlevel') and _get_reader_name(fname, kwargs.get('filetype')) != 'jp2':
+            raise ValueError("rlevel can only be used for JPEG2000 files, not {}.".format(fname))
+
+        if kwargs.pop('lazy', False):
+            return self._read_file_header(fname, **kwargs)
+        kwargs.pop('index', None)
+
         # File gets read here.  This needs to be generic enough to seamlessly
         # call a fits file or a jpeg2k file, etc
         pairs = read_file(fname, **kwargs)
@@ -137,6 +145,41 @@ class MapFactory(BasicRegistrationFactory):
                 new_pairs.append((data, meta))
         return new_pairs
 
+    def _read_file_header(self, fname, **kwargs):
+        """ Read only the headers in a file and return the list of (data, meta)
+            pairs in that file, where the data are read on first access. """
+
+        # Only FITS headers are guaranteed to describe the data in the file.
+        # The headers describe the whole images, so a section is read
+        # straight away, which only reads the section from the file.
+        filetype = kwargs.get('filetype')
+        if _get_reader_name(fname, filetype) != 'fits' or kwargs.get('section') is not None:
+            return self._read_file(fname, **kwargs)
+
+        header_index = kwargs.pop('index', None)
+        if header_index is not None:
+            headers = header_index.get_header(fname)
+        else:
+            headers = read_file_header(fname, filetype=filetype)
+
+        new_pairs = []
+        for index, fileheader in enumerate(headers):
+            assert isinstance(fileheader, FileHeader)
+            meta = MetaDict(fileheader)
+            naxis = meta.get('naxis', 0)
+            shape = [meta.get('naxis{}'.format(i)) for i in range(naxis, 0, -1)]
+            # If the header does not describe the data we have to read it
+            if None in shape:
+                return self._read_file(fname, **kwargs)
+            # This tests that the data is a more than 1D image, tables are
+            # read as 1D record arrays
+            is_table = str(meta.get('xtension', 'IMAGE')).strip() != 'IMAGE'
+            if naxis > 1 and not is_table:
+                data = DeferredData(fname, index, shape[-2:], _dtype_from_header(meta),
+                                    **kwargs)
+                new_pairs.append((data, meta))
+        return new_pairs
+
     def _validate_meta(self, meta):
         """
         Validate a meta argument.
@@ -148,7 +191,7 @@ class MapFactory(BasicRegistrationFactory):
         else:
             return False
 
-    def _parse_args(self, *args, **kwargs):
+    def _parse_args(self, *args, executor=None, **kwargs):
         """
         Parses an args list for data-header pairs.  args can contain any
         mixture of the following entries:
@@ -162,6 +205,10 @@ class MapFactory(BasicRegistrationFactory):
         * url, which will be downloaded and read
         * lists containing any of the above.
 
+        If ``executor`` is a `concurrent.futures.Executor` the files are read
+        concurrently using it, otherwise they are read one at a time. In both
+        cases the data-header pairs are returned in the order of the input.
+
         Example
         -------
         self._parse_args(data, header,
@@ -173,7 +220,9 @@ class MapFactory(BasicRegistrationFactory):
 
         """
 
-        data_header_pairs = list()
+        # Each entry is either a list of data-header pairs or the path of a
+        # file which is to be read.
+        entries = list()
         already_maps = list()
 
         # Account for nested lists of items
@@ -193,29 +242,26 @@ class MapFactory(BasicRegistrationFactory):
 
                 if self._validate_meta(arg_header):
                     pair = (args[i], OrderedDict(arg_header))
-                    data_header_pairs.append(pair)
+                    entries.append([pair])
                     i += 1    # an extra increment to account for the data-header pairing
 
             # File name
             elif (isinstance(arg, str) and
                   os.path.isfile(os.path.expanduser(arg))):
                 path = os.path.expanduser(arg)
-                pairs = self._read_file(path, **kwargs)
-                data_header_pairs += pairs
+                entries.append(path)
 
             # Directory
             elif (isinstance(arg, str) and
                   os.path.isdir(os.path.expanduser(arg))):
                 path = os.path.expanduser(arg)
                 files = [os.path.join(path, elem) for elem in os.listdir(path)]
-                for afile in files:
-                    data_header_pairs += self._read_file(afile, **kwargs)
+                entries += files
 
             # Glob
             elif (isinstance(arg, str) and '*' in arg):
                 files = glob.glob(os.path.expanduser(arg))
-                for afile in files:
-                    data_header_pairs += self._read_file(afile, **kwargs)
+                entries += files
 
             # Already a Map
             elif isinstance(arg, GenericMap):
@@ -226,18 +272,31 @@ class MapFactory(BasicRegistrationFactory):
                   _is_url(arg)):
                 url = arg
                 path = download_file(url, get_and_create_download_dir())
-                pairs = self._read_file(path, **kwargs)
-                data_header_pairs += pairs
+                entries.append(path)
 
             # A database Entry
             elif isinstance(arg, DatabaseEntry):
-                data_header_pairs += self._read_file(arg.path, **kwargs)
+                entries.append(arg.path)
 
             else:
                 raise ValueError("File not found or invalid input")
 
             i += 1
 
+        # Read all the files, map preserves the order of the input
+        files = [entry for entry in entries if isinstance(entry, str)]
+        read_file = functools.partial(self._read_file, **kwargs)
+        if executor is None:
+            file_pairs = map(read_file, files)
+        else:
+            file_pairs = executor.map(read_file, files)
+
+        data_header_pairs = list()
+        for entry in entries:
+            if isinstance(entry, str):
+                entry = next(file_pairs)
+            data_header_pairs += entry
+
         # TODO:
         # In the end, if there are already maps it should be put in the same
         # order as the input, currently they are not.
@@ -264,6 +323,47 @@ class MapFactory(BasicRegistrationFactory):
         silence_errors : boolean, optional
             If set, ignore data-header pairs which cause an exception.
 
+        executor : `concurrent.futures.Executor`, optional
+            If given, files are read concurrently using this executor, for
+            example a `concurrent.futures.ThreadPoolExecutor` (or a
+            `~concurrent.futures.ProcessPoolExecutor` for readers which hold
+            the GIL) with the number of workers to use. The maps are returned
+            in the same order as they would be without an executor.
+
+        memmap : boolean, optional
+            If set, the data of maps read from FITS files is memory mapped
+            rather than read into memory, so only the pixels which are used
+            (for example by `~sunpy.map.GenericMap.submap`) are read from disk.
+
+        lazy : boolean, optional
+            If set, only the headers of files are read when creating the maps.
+            The data of each map is read from the file the first time it is
+            accessed, so maps can be sorted and filtered on their metadata
+            without reading any pixels.
+
+        index : `~sunpy.io.header_index.HeaderIndex`, optional
+            With ``lazy=True``, the headers of FITS files are taken from this
+            index, and only read from the files which are not in the index
+            or have changed since they were indexed.
+
+        rlevel : `int`, optional
+            Read JPEG2000 files at a resolution reduced by a factor of
+            ``2**rlevel``, which only decodes the part of the file needed for
+            that resolution, see `sunpy.io.jp2.read`. A `ValueError` is
+            raised for other files.
+
+        section : `tuple` of `slice`, optional
+            Only read this (y, x) section of the images in FITS and JPEG2000
+            files, see `sunpy.io.fits.read` and `sunpy.io.jp2.read`. The
+            section is read when the map is created, even with ``lazy=True``.
+
+        region : `tuple`, optional
+            If given, each map is cut out to this region, given as the
+            ``(bottom_left, top_right)`` arguments of
+            `~sunpy.map.GenericMap.submap`. Only the part of the images in
+            FITS files needed for the region is read, and for tile compressed
+            images only the tiles which overlap the region are decompressed.
+
         Notes
         -----
         Extra keyword arguments are passed through to `sunpy.io.read_file` such
@@ -275,8 +375,21 @@ class MapFactory(BasicRegistrationFactory):
 
         sequence = kwargs.pop('sequence', False)
         silence_errors = kwargs.pop('silence_errors', False)
-
-        data_header_pairs, already_maps = self._parse_args(*args, **kwargs)
+        executor = kwargs.pop('executor', None)
+        region = kwargs.pop('region', None)
+        if region is not None:
+            # Read the headers first, so only the region of the data is read
+            kwargs['lazy'] = True
+
+        data_header_pairs, already_maps = self._parse_args(*args, executor=executor, **kwargs)
+
+        # Keyword arguments only understood by the file readers must not be
+        # passed on to the map constructors.
+        kwargs.pop('memmap', None)
+        kwargs.pop('lazy', None)
+        kwargs.pop('index', None)
+        kwargs.pop('section', None)
+        kwargs.pop('rlevel', None)
 
         new_maps = list()
 
@@ -298,6 +411,9 @@ class MapFactory(BasicRegistrationFactory):
 
         new_maps += already_maps
 
+        if region is not None:
+            new_maps = [new_map.submap(*region) for new_map in new_maps]
+
         # If the list is meant to be a sequence, instantiate a map sequence
         if sequence:
             return MapSequence(new_maps, **kwargs)
@@ -339,6 +455,28 @@ class MapFactory(BasicRegistrationFactory):
         return WidgetType(data, meta, **kwargs)
 
 
+def _dtype_from_header(meta):
+    """
+    Work out the dtype of the data described by a header from the BITPIX
+    keyword, returning `None` if it can not be determined.
+    """
+    bitpix = meta.get('bitpix')
+    if bitpix not in (8, 16, 32, 64, -32, -64):
+        return None
+    # Integer data scaled with BSCALE and BZERO are returned as native floats,
+    # except for the common case of unsigned integers stored with an offset.
+    # Unscaled data keep the big-endian byte order of the file.
+    bscale = meta.get('bscale', 1)
+    bzero = meta.get('bzero', 0)
+    if bitpix > 0 and (bscale != 1 or bzero != 0):
+        if bscale == 1 and bitpix > 8 and bzero == 2**(bitpix - 1):
+            return np.dtype('uint{}'.format(bitpix))
+        return np.dtype('float32' if bitpix <= 16 else 'float64')
+    if bitpix < 0:
+        return np.dtype('>f{}'.format(-bitpix // 8))
+    return np.dtype('u1' if bitpix == 8 else '>i{}'.format(bitpix // 8))
+
+
 def _is_url(arg):
     try:
         urlopen(arg)
@@ -17,18 +17,23 @@ from astropy.visualization.wcsaxes import WCSAxes
 from astropy.coordinates import SkyCoord, UnitSphericalRepresentation
 
 import sunpy.io as io
+from sunpy.io.file_tools import DeferredData
 # The next two are not used but are called to register functions with external modules
 import sunpy.coordinates
 import sunpy.cm
 from sunpy import config
 from sunpy.visualization import toggle_pylab, wcsaxes_compat, axis_labels_from_ctype
+from sunpy.visualization.tiles import TiledImage
 from sunpy.sun import constants
 from sunpy.sun import sun
 from sunpy.time import parse_time, is_time
+from sunpy.util import LRUCache
+from sunpy.util.decorators import cached_property_based_on
 from sunpy.image.transform import affine_transform
 from sunpy.image.rescale import reshape_image_to_4d_superpixel
 from sunpy.image.rescale import resample as sunpy_image_resample
 from sunpy.coordinates import get_sun_B0, get_sun_L0, get_sunearth_distance
+from sunpy.coordinates import array_transforms
 
 from astropy.nddata import NDData
 
@@ -36,6 +41,12 @@ TIME_FORMAT = config.get("general", "time_format")
 PixelPair = namedtuple('PixelPair', 'x y')
 SpatialPair = namedtuple('SpatialPair', 'axis1 axis2')
 
+# Coordinates of every pixel of a map, shared between maps with the same
+# coordinate system. See GenericMap.all_coordinates.
+_all_coordinates_cache = LRUCache(
+    maxsize=8, max_bytes=config.getint('map', 'all_coordinates_cache_bytes', fallback=2**30),
+    sizeof=lambda coordinates: sum(c.nbytes for c in coordinates))
+
 __all__ = ['GenericMap']
 
 
@@ -160,7 +171,7 @@ class GenericMap(NDData):
 
             new_2d_slice = [0]*(ndim-2)
             new_2d_slice.extend([slice(None), slice(None)])
-            data = data[new_2d_slice]
+            data = data[tuple(new_2d_slice)]
             # Warn the user that the data has been truncated
             warnings.warn_explicit("This file contains more than 2 dimensions. "
                                    "Only the first two dimensions will be used."
@@ -253,9 +264,48 @@ class GenericMap(NDData):
         return r.lon.to(self.spatial_units[0]), r.lat.to(self.spatial_units[1])
 
     @property
+    def _meta_hash(self):
+        """
+        A hashable snapshot of the map metadata.
+
+        This is used as the key for properties which are expensive to build
+        from the metadata (such as `wcs`) so that they are only rebuilt when
+        ``meta`` has been modified. The ``KEYCOMMENTS`` dictionary is excluded
+        as it does not affect any derived properties. If the metadata contains
+        unhashable values `None` is returned and the properties are not cached.
+        """
+        try:
+            return frozenset((key, value) for key, value in self.meta.items()
+                             if key.lower() != 'keycomments')
+        except TypeError:
+            return None
+
+    @property
+    def _pixel_world_key(self):
+        """
+        A hashable key describing the mapping from pixel to world coordinates
+        of the map, ignoring the observer and the time of the observation.
+
+        Maps with equal keys have the same shape and the same coordinates (in
+        their own coordinate frame) at every pixel, so quantities derived
+        from the pixel grid alone can be shared between them.
+        """
+        return (self.data.shape,
+                tuple(u.Quantity(self.reference_pixel).value),
+                tuple(u.Quantity(self.scale).value),
+                self.meta.get('crval1', 0.), self.meta.get('crval2', 0.),
+                tuple(self.coordinate_system), tuple(self.spatial_units),
+                tuple(np.asarray(self.rotation_matrix).ravel()))
+
+    @cached_property_based_on('_meta_hash')
     def wcs(self):
         """
         The `~astropy.wcs.WCS` property of the map.
+
+        The WCS is built once from the metadata and cached, it is rebuilt
+        automatically if ``meta`` is modified. The same WCS object is returned
+        every time, so it should not be modified; change ``meta`` instead, or
+        modify a copy made with ``wcs.deepcopy()``.
         """
         w2 = astropy.wcs.WCS(naxis=2)
         w2.wcs.crpix = u.Quantity(self.reference_pixel)
@@ -282,7 +332,7 @@ class GenericMap(NDData):
 
         return w2
 
-    @property
+    @cached_property_based_on('_meta_hash')
     def coordinate_frame(self):
         """
         An `astropy.coordinates.BaseFrame` instance created from the coordinate
@@ -621,7 +671,7 @@ class GenericMap(NDData):
 
         return u.Quantity(heliographic_longitude, 'deg')
 
-    @property
+    @cached_property_based_on('_meta_hash')
     def observer_coordinate(self):
         """
         The Heliographic Stonyhurst Coordinate of the observer.
@@ -780,6 +830,88 @@ class GenericMap(NDData):
 
 
 # #### Data conversion routines #### #
+    def all_coordinates(self, frame=None, dtype=np.float64):
+        """
+        The world coordinates of the centre of every pixel in the map.
+
+        The coordinates are calculated once and cached, and the cache is
+        shared between maps with the same coordinate system (and, for
+        heliographic coordinates, the same observer), so a sequence of maps
+        of the same field of view only needs the calculation once. The
+        returned arrays are read only. The cache holds the coordinates of up
+        to eight maps, and at most the number of bytes set by the
+        ``all_coordinates_cache_bytes`` option of the ``[map]`` section of
+        the sunpyrc configuration file, 1 GiB by default.
+
+        Parameters
+        ----------
+        frame : {`None` | 'heliographic_stonyhurst' | 'heliographic_carrington'}
+            The frame of the coordinates. The default, `None`, returns the
+            coordinates in the coordinate frame of the map.
+        dtype : `numpy.dtype`, optional
+            The floating point type of the returned arrays. Defaults to
+            float64, float32 halves the memory used by large maps.
+
+        Returns
+        -------
+        lon, lat : `~astropy.units.Quantity`
+            Two arrays of the same shape as the map data. In the map frame
+            these are in the spatial units of the map, heliographic
+            coordinates are in degrees and are NaN for pixels off the solar
+            disk.
+        """
+        dtype = np.dtype(dtype)
+        if dtype.kind != 'f':
+            raise ValueError('dtype must be a floating point type.')
+        if frame not in (None, 'heliographic_stonyhurst', 'heliographic_carrington'):
+            raise ValueError("frame must be None, 'heliographic_stonyhurst' or "
+                             "'heliographic_carrington'.")
+
+        key = (self._pixel_world_key, frame, dtype.str)
+        if frame is not None:
+            observer = self.observer_coordinate
+            key += (observer.lon.to_value(u.deg), observer.lat.to_value(u.deg),
+                    observer.radius.to_value(u.m), self.rsun_meters.to_value(u.m))
+            if frame == 'heliographic_carrington':
+                # The Carrington longitudes also depend on the time
+                key += (self.date.isot,)
+
+        coordinates = _all_coordinates_cache.get(key)
+        if coordinates is None:
+            if frame is None:
+                ny, nx = self.data.shape
+                x, y = np.meshgrid(np.arange(nx), np.arange(ny))
+                lon, lat = self._get_lon_lat(self.pixel_to_world(x*u.pix, y*u.pix))
+            elif isinstance(self.coordinate_frame, sunpy.coordinates.Helioprojective):
+                # Start from the (cached) coordinates in the map frame, and
+                # transform them without the overhead of coordinate objects
+                lon, lat = self.all_coordinates()
+                hpc_frame = self.coordinate_frame
+                lon, lat, _ = array_transforms.hpc_to_hgs(lon.to_value(u.deg), lat.to_value(u.deg),
+                                                          hpc_frame.observer,
+                                                          rsun=hpc_frame.rsun.to_value(u.m),
+                                                          dtype=dtype)
+                if frame == 'heliographic_carrington':
+                    lon += get_sun_L0(self.date).to_value(u.deg)
+                    np.mod(lon, 360, out=lon)
+                lon, lat = lon * u.deg, lat * u.deg
+            else:
+                lon, lat = self.all_coordinates()
+                with warnings.catch_warnings():
+                    # Pixels off the disk have no heliographic coordinates
+                    warnings.simplefilter('ignore')
+                    coordinates = SkyCoord(lon, lat, frame=self.coordinate_frame).transform_to(frame)
+                lon, lat = coordinates.lon.to(u.deg), coordinates.lat.to(u.deg)
+            coordinates = []
+            for value in (lon, lat):
+                value = value.astype(dtype, copy=False)
+                value.flags.writeable = False
+                coordinates.append(value)
+            coordinates = tuple(coordinates)
+            _all_coordinates_cache[key] = coordinates
+
+        return coordinates
+
     def world_to_pixel(self, coordinate, origin=0):
         """
         Convert a world (data) coordinate to a pixel coordinate by using
@@ -916,34 +1048,46 @@ class GenericMap(NDData):
         # Note: "center" defaults to True in this function because data
         #   coordinates in a Map are at pixel centers
 
-        # Make a copy of the original data and perform resample
-        new_data = sunpy_image_resample(self.data.copy().T, dimensions,
+        # Perform the resample, this does not modify the original data so
+        # there is no need to copy it (which would also force memory mapped
+        # data to be read in full)
+        new_data = sunpy_image_resample(self.data.T, dimensions,
                                         method, center=True)
         new_data = new_data.T
 
-        scale_factor_x = float(self.dimensions[0] / dimensions[0])
-        scale_factor_y = float(self.dimensions[1] / dimensions[1])
-
         # Update image scale and number of pixels
         new_meta = self.meta.copy()
+        new_meta.update(self._resample_meta(dimensions))
+
+        # Create new map instance
+        new_map = self._new_instance(new_data, new_meta, self.plot_settings)
+        return new_map
+
+    def _resample_meta(self, dimensions):
+        """
+        The metadata keywords which change when the map is resampled to
+        ``dimensions``.
+
+        These only depend on the pixel to world mapping of the map, so they
+        can be shared between maps with the same ``_pixel_world_key``.
+        """
+        scale_factor_x = float(self.dimensions[0] / dimensions[0])
+        scale_factor_y = float(self.dimensions[1] / dimensions[1])
 
-        # Update metadata
-        new_meta['cdelt1'] *= scale_factor_x
-        new_meta['cdelt2'] *= scale_factor_y
-        if 'CD1_1' in new_meta:
-            new_meta['CD1_1'] *= scale_factor_x
-            new_meta['CD2_1'] *= scale_factor_x
-            new_meta['CD1_2'] *= scale_factor_y
-            new_meta['CD2_2'] *= scale_factor_y
+        new_meta = {}
+        new_meta['cdelt1'] = self.meta['cdelt1'] * scale_factor_x
+        new_meta['cdelt2'] = self.meta['cdelt2'] * scale_factor_y
+        if 'CD1_1' in self.meta:
+            new_meta['CD1_1'] = self.meta['CD1_1'] * scale_factor_x
+            new_meta['CD2_1'] = self.meta['CD2_1'] * scale_factor_x
+            new_meta['CD1_2'] = self.meta['CD1_2'] * scale_factor_y
+            new_meta['CD2_2'] = self.meta['CD2_2'] * scale_factor_y
         new_meta['crpix1'] = (dimensions[0].value + 1) / 2.
         new_meta['crpix2'] = (dimensions[1].value + 1) / 2.
         lon, lat = self._get_lon_lat(self.center.frame)
         new_meta['crval1'] = lon.value
         new_meta['crval2'] = lat.value
-
-        # Create new map instance
-        new_map = self._new_instance(new_data, new_meta, self.plot_settings)
-        return new_map
+        return new_meta
 
     def rotate(self, angle=None, rmatrix=None, order=4, scale=1.0,
                recenter=False, missing=0.0, use_scipy=False):
@@ -1040,13 +1184,6 @@ class GenericMap(NDData):
         if order not in range(6):
             raise ValueError("Order must be between 0 and 5")
 
-        # The FITS-WCS transform is by definition defined around the
-        # reference coordinate in the header.
-        lon, lat = self._get_lon_lat(self.reference_coordinate.frame)
-        rotation_center = u.Quantity([lon, lat])
-
-        # Copy meta data
-        new_meta = self.meta.copy()
         if angle is not None:
             # Calculate the parameters for the affine_transform
             c = np.cos(np.deg2rad(angle))
@@ -1060,28 +1197,24 @@ class GenericMap(NDData):
 
         # Calculate the needed padding or unpadding
         diff = np.asarray(np.ceil((extent - self.data.shape) / 2), dtype=int).ravel()
-        # Pad the image array
+        # The image is transformed as if it were padded and then unpadded,
+        # which affine_transform does without copying the array by aligning
+        # the centers of the input and output arrays.
         pad_x = int(np.max((diff[1], 0)))
         pad_y = int(np.max((diff[0], 0)))
+        unpad_x = -np.min((diff[1], 0))
+        unpad_y = -np.min((diff[0], 0))
+        output_shape = (self.data.shape[0] + 2 * diff[0], self.data.shape[1] + 2 * diff[1])
 
-        new_data = np.pad(self.data,
-                          ((pad_y, pad_y), (pad_x, pad_x)),
-                          mode='constant',
-                          constant_values=(missing, missing))
-        new_meta['crpix1'] += pad_x
-        new_meta['crpix2'] += pad_y
-
-        # All of the following pixel calculations use a pixel origin of 0
-
-        pixel_array_center = (np.flipud(new_data.shape) - 1) / 2.0
+        # All of the following pixel calculations use a pixel origin of 0,
+        # and are in the pixel coordinates of the padded image
 
-        # Create a temporary map so we can use it for the data to pixel calculation.
-        temp_map = self._new_instance(new_data, new_meta, self.plot_settings)
+        pixel_array_center = (np.flipud(self.data.shape) + 2 * np.array([pad_x, pad_y]) - 1) / 2.0
 
         # Convert the axis of rotation from data coordinates to pixel coordinates
-        pixel_rotation_center = u.Quantity(temp_map.world_to_pixel(self.reference_coordinate,
-                                                                   origin=0)).value
-        del temp_map
+        pixel_rotation_center = u.Quantity(self.world_to_pixel(self.reference_coordinate,
+                                                               origin=0)).value
+        pixel_rotation_center = pixel_rotation_center + np.array([pad_x, pad_y])
 
         if recenter:
             pixel_center = pixel_rotation_center
@@ -1089,12 +1222,12 @@ class GenericMap(NDData):
             pixel_center = pixel_array_center
 
         # Apply the rotation to the image data
-        new_data = affine_transform(new_data.T,
+        new_data = affine_transform(self.data.T,
                                     np.asarray(rmatrix),
                                     order=order, scale=scale,
-                                    image_center=np.flipud(pixel_center),
+                                    image_center=np.flipud(pixel_center - np.array([pad_x, pad_y])),
                                     recenter=recenter, missing=missing,
-                                    use_scipy=use_scipy).T
+                                    use_scipy=use_scipy, output_shape=output_shape[::-1]).T
 
         if recenter:
             new_reference_pixel = pixel_array_center
@@ -1104,21 +1237,36 @@ class GenericMap(NDData):
                                                         pixel_rotation_center - pixel_center)
             new_reference_pixel = np.array(new_reference_pixel).ravel()
 
+        # Define the new reference_pixel, in the pixel coordinates of the
+        # unpadded output
+        new_reference_pixel = new_reference_pixel - np.array([unpad_x, unpad_y])
+        new_meta = self._rotated_meta(rmatrix, scale, new_reference_pixel)
+
+        # Create new map with the modification
+        new_map = self._new_instance(new_data, new_meta, self.plot_settings)
+
+        return new_map
+
+    def _rotated_meta(self, rmatrix, scale, reference_pixel):
+        """
+        Return a copy of the metadata updated for the data of the map being
+        rotated by ``rmatrix`` and scaled by ``scale`` around the reference
+        coordinate, which is moved to the ``(x, y)`` pixel
+        ``reference_pixel`` with a pixel origin of 0.
+        """
+        # The FITS-WCS transform is by definition defined around the
+        # reference coordinate in the header.
+        lon, lat = self._get_lon_lat(self.reference_coordinate.frame)
+        rotation_center = u.Quantity([lon, lat])
+
+        # Copy meta data
+        new_meta = self.meta.copy()
+
         # Define the new reference_pixel
         new_meta['crval1'] = rotation_center[0].value
         new_meta['crval2'] = rotation_center[1].value
-        new_meta['crpix1'] = new_reference_pixel[0] + 1  # FITS pixel origin is 1
-        new_meta['crpix2'] = new_reference_pixel[1] + 1  # FITS pixel origin is 1
-
-        # Unpad the array if necessary
-        unpad_x = -np.min((diff[1], 0))
-        if unpad_x > 0:
-            new_data = new_data[:, unpad_x:-unpad_x]
-            new_meta['crpix1'] -= unpad_x
-        unpad_y = -np.min((diff[0], 0))
-        if unpad_y > 0:
-            new_data = new_data[unpad_y:-unpad_y, :]
-            new_meta['crpix2'] -= unpad_y
+        new_meta['crpix1'] = reference_pixel[0] + 1  # FITS pixel origin is 1
+        new_meta['crpix2'] = reference_pixel[1] + 1  # FITS pixel origin is 1
 
         # Calculate the new rotation matrix to store in the header by
         # "subtracting" the rotation matrix used in the rotate from the old one
@@ -1144,10 +1292,7 @@ class GenericMap(NDData):
         new_meta.pop('CD2_1', None)
         new_meta.pop('CD2_2', None)
 
-        # Create new map with the modification
-        new_map = self._new_instance(new_data, new_meta, self.plot_settings)
-
-        return new_map
+        return new_meta
 
     def submap(self, bottom_left, top_right=None):
         """
@@ -1283,7 +1428,11 @@ class GenericMap(NDData):
         # Get ndarray representation of submap
         xslice = slice(int(x_pixels[0]), int(x_pixels[1]))
         yslice = slice(int(y_pixels[0]), int(y_pixels[1]))
-        new_data = self.data[yslice, xslice].copy()
+        if isinstance(self.data, DeferredData):
+            # Only read the pixels of the submap from the file
+            new_data = self.data.read(section=(yslice, xslice))
+        else:
+            new_data = self.data[yslice, xslice].copy()
 
         # Make a copy of the header with updated centering information
         new_meta = self.meta.copy()
@@ -1344,39 +1493,21 @@ class GenericMap(NDData):
         if (offset.value[0] < 0) or (offset.value[1] < 0):
             raise ValueError("Offset is strictly non-negative.")
 
-        # Make a copy of the original data, perform reshaping, and apply the
-        # function.
+        # Perform reshaping on a view of the original data, and apply the
+        # function. Only the pixels covered by the superpixels are read.
         if self.mask is not None:
-            reshaped = reshape_image_to_4d_superpixel(np.ma.array(self.data.copy(), mask=self.mask),
+            reshaped = reshape_image_to_4d_superpixel(np.ma.array(self.data, mask=self.mask),
                                                       [dimensions.value[1], dimensions.value[0]],
                                                       [offset.value[1], offset.value[0]])
         else:
-            reshaped = reshape_image_to_4d_superpixel(self.data.copy(),
+            reshaped = reshape_image_to_4d_superpixel(self.data,
                                                       [dimensions.value[1], dimensions.value[0]],
                                                       [offset.value[1], offset.value[0]])
         new_array = func(func(reshaped, axis=3), axis=1)
 
         # Update image scale and number of pixels
-
-        # create copy of new meta data
         new_meta = self.meta.copy()
-
-        new_nx = new_array.shape[1]
-        new_ny = new_array.shape[0]
-
-        # Update metadata
-        new_meta['cdelt1'] = (dimensions[0] * self.scale[0]).value
-        new_meta['cdelt2'] = (dimensions[1] * self.scale[1]).value
-        if 'CD1_1' in new_meta:
-            new_meta['CD1_1'] *= dimensions[0].value
-            new_meta['CD2_1'] *= dimensions[0].value
-            new_meta['CD1_2'] *= dimensions[1].value
-            new_meta['CD2_2'] *= dimensions[1].value
-        new_meta['crpix1'] = (new_nx + 1) / 2.
-        new_meta['crpix2'] = (new_ny + 1) / 2.
-        lon, lat = self._get_lon_lat(self.center.frame)
-        new_meta['crval1'] = lon.to(self.spatial_units[0]).value + 0.5*(offset[0]*self.scale[0]).to(self.spatial_units[0]).value
-        new_meta['crval2'] = lat.to(self.spatial_units[1]).value + 0.5*(offset[1]*self.scale[1]).to(self.spatial_units[1]).value
+        new_meta.update(self._superpixel_meta(dimensions, offset, new_array.shape))
 
         # Create new map instance
         if self.mask is not None:
@@ -1390,6 +1521,77 @@ class GenericMap(NDData):
         new_map = self._new_instance(new_data, new_meta, self.plot_settings, mask=new_mask)
         return new_map
 
+    def _superpixel_meta(self, dimensions, offset, new_shape):
+        """
+        The metadata keywords which change when superpixels of size
+        ``dimensions`` are formed starting at ``offset``, giving data of shape
+        ``new_shape``.
+
+        These only depend on the pixel to world mapping of the map, so they
+        can be shared between maps with the same ``_pixel_world_key``.
+        """
+        new_meta = {}
+        new_meta['cdelt1'] = (dimensions[0] * self.scale[0]).value
+        new_meta['cdelt2'] = (dimensions[1] * self.scale[1]).value
+        if 'CD1_1' in self.meta:
+            new_meta['CD1_1'] = self.meta['CD1_1'] * dimensions[0].value
+            new_meta['CD2_1'] = self.meta['CD2_1'] * dimensions[0].value
+            new_meta['CD1_2'] = self.meta['CD1_2'] * dimensions[1].value
+            new_meta['CD2_2'] = self.meta['CD2_2'] * dimensions[1].value
+        new_meta['crpix1'] = (new_shape[-1] + 1) / 2.
+        new_meta['crpix2'] = (new_shape[-2] + 1) / 2.
+        lon, lat = self._get_lon_lat(self.center.frame)
+        new_meta['crval1'] = lon.to(self.spatial_units[0]).value + 0.5*(offset[0]*self.scale[0]).to(self.spatial_units[0]).value
+        new_meta['crval2'] = lat.to(self.spatial_units[1]).value + 0.5*(offset[1]*self.scale[1]).to(self.spatial_units[1]).value
+        return new_meta
+
+    @cached_property_based_on('_meta_hash')
+    def _pyramid(self):
+        """
+        The levels of the image pyramid of the map built so far, keyed by
+        level and starting with the map itself, see `pyramid_level`.
+        """
+        return {0: self}
+
+    def pyramid_level(self, level):
+        """
+        Returns the map at a lower resolution from its image pyramid.
+
+        Level ``n`` of the pyramid is the map downsampled by a factor of
+        ``2**n`` in both directions, made of the means of 2x2 superpixels of
+        level ``n - 1`` (a row or column left over at the top or right edge
+        is dropped, as in `superpixel`). Level 0 is the map itself. The
+        levels are built as they are needed and cached with the map, so
+        plotting and coarse-to-fine algorithms can read the resolution they
+        need without resampling the full resolution data each time. The
+        cache is discarded if the metadata of the map is modified, but not
+        if its data is modified in place.
+
+        Parameters
+        ----------
+        level : `int`
+            The level of the pyramid.
+
+        Returns
+        -------
+        out : `~sunpy.map.GenericMap` or subclass
+            A map of the level, with metadata describing its coordinates.
+        """
+        if int(level) != level or level < 0:
+            raise ValueError("The level must be a non-negative integer.")
+
+        # Levels may be built by several threads at once, for example when
+        # plotting, and the first one built is kept.
+        pyramid = self._pyramid
+        for n in range(1, int(level) + 1):
+            if n not in pyramid:
+                previous = pyramid[n - 1]
+                if min(previous.data.shape) < 2:
+                    raise ValueError("The map is too small to have a pyramid level "
+                                     "{}.".format(level))
+                pyramid.setdefault(n, previous.superpixel((2, 2) * u.pix, func=np.mean))
+        return pyramid[int(level)]
+
 # #### Visualization #### #
 
     @u.quantity_input(grid_spacing=u.deg)
@@ -1629,8 +1831,17 @@ class GenericMap(NDData):
 
         figure.show()
 
+    @property
+    def _plot_data(self):
+        """
+        The data passed to matplotlib to plot the map, with the mask applied.
+        """
+        if self.mask is None:
+            return self.data
+        return np.ma.array(np.asarray(self.data), mask=self.mask)
+
     @toggle_pylab
-    def plot(self, annotate=True, axes=None, title=True, **imshow_kwargs):
+    def plot(self, annotate=True, axes=None, title=True, tiled=False, **imshow_kwargs):
         """
         Plots the map object using matplotlib, in a method equivalent
         to plt.imshow() using nearest neighbour interpolation.
@@ -1645,6 +1856,14 @@ class GenericMap(NDData):
             If provided the image will be plotted on the given axes. Else the
             current matplotlib axes will be used.
 
+        tiled : bool
+            If True, only the part of the map visible in the axes is passed to
+            matplotlib, taken from the image pyramid of the map (see
+            `pyramid_level`) at about the resolution of the screen, using a
+            `~sunpy.visualization.tiles.TiledImage`. The image is updated when
+            the axes are zoomed, panned or resized, which makes large maps
+            much faster to draw and browse.
+
         **imshow_kwargs  : dict
             Any additional imshow arguments that should be used
             when plotting.
@@ -1708,10 +1927,13 @@ class GenericMap(NDData):
             imshow_args.update({'extent': x_range + y_range})
         imshow_args.update(imshow_kwargs)
 
-        if self.mask is None:
-            ret = axes.imshow(self.data, **imshow_args)
+        if tiled:
+            extent = imshow_args.pop('extent', None)
+            ret = TiledImage(axes, self.data.shape,
+                             lambda key, level: self.pyramid_level(level)._plot_data,
+                             extent=extent, **imshow_args).image
         else:
-            ret = axes.imshow(np.ma.array(np.asarray(self.data), mask=self.mask), **imshow_args)
+            ret = axes.imshow(self._plot_data, **imshow_args)
 
         if wcsaxes_compat.is_wcsaxes(axes):
             wcsaxes_compat.default_wcs_grid(axes, units=self.spatial_units,
@@ -6,11 +6,15 @@ from copy import deepcopy
 import numpy as np
 import matplotlib.animation
 import numpy.ma as ma
+from numpy.lib.mixins import NDArrayOperatorsMixin
 
 import astropy.units as u
 
 from sunpy.map import GenericMap
-from sunpy.visualization.animator.mapsequenceanimator import MapSequenceAnimator
+from sunpy.io.file_tools import DeferredData
+from sunpy.image.rescale import reshape_image_to_4d_superpixel
+from sunpy.image.rescale import resample as sunpy_image_resample
+from sunpy.visualization.animator.mapsequenceanimator import MapSequenceAnimator, MapFrames
 from sunpy.visualization import wcsaxes_compat
 from sunpy.visualization import axis_labels_from_ctype
 from sunpy.util import expand_list
@@ -31,7 +35,10 @@ class MapSequence(object):
     sortby : `datetime.datetime`
         Method by which the MapSequence should be sorted along the z-axis.
     derotate : `bool`
-        Apply a derotation to the data. Default to False.
+        Apply solar differential rotation to the data of each map, so that
+        solar features stay on the same pixels of every map, using
+        `~sunpy.physics.differential_rotation.diffrot_maps`. The maps are
+        rotated to the time of the first map. Default to False.
 
     To coalign a mapsequence so that solar features remain on the same pixels,
     please see the "Coalignment of MapSequences" note below.
@@ -46,6 +53,15 @@ class MapSequence(object):
     >>> import sunpy.map
     >>> mapsequence = sunpy.map.Map('images/*.fits', sequence=True)   # doctest: +SKIP
 
+    Sequences which are too large to fit in memory can be worked with by only
+    reading the headers of the files, and accessing the data as a memory mapped
+    (ny, nx, nt) cube.
+
+    >>> mapsequence = sunpy.map.Map('images/*.fits', sequence=True,
+    ...                             lazy=True, memmap=True)   # doctest: +SKIP
+    >>> cube = mapsequence.as_array(lazy=True)   # doctest: +SKIP
+    >>> region = cube[100:200, 100:200, :]   # doctest: +SKIP
+
     MapSequences can be co-aligned using the routines in sunpy.image.coalignment.
     """
     #pylint: disable=W0613,E1101
@@ -94,7 +110,9 @@ class MapSequence(object):
 
     def _derotate(self):
         """Derotates the layers in the MapSequence"""
-        pass
+        # Import here to avoid a circular import
+        from sunpy.physics.differential_rotation import diffrot_maps
+        self.maps = list(diffrot_maps(self.maps))
 
     def plot(self, axes=None, resample=None, annotate=True,
              interval=200, plot_function=None, **kwargs):
@@ -110,8 +128,9 @@ class MapSequence(object):
         resample: list or False
             Draws the map at a lower resolution to increase the speed of
             animation. Specify a list as a fraction i.e. [0.25, 0.25] to
-            plot at 1/4 resolution.
-            [Note: this will only work where the map arrays are the same size]
+            plot at 1/4 resolution. Fractions of 1/2, 1/4, 1/8 and so on
+            are read from the image pyramids of the maps. Each map is
+            resampled when it is first shown.
 
         annotate: bool
             Annotate the figure with scale and titles
@@ -177,20 +196,15 @@ class MapSequence(object):
             axes.set_ylabel(axis_labels_from_ctype(self[i].coordinate_system[1],
                                                    self[i].spatial_units[1]))
 
-        if resample:
-            if self.all_maps_same_shape():
-                resample = u.Quantity(self.maps[0].dimensions) * np.array(resample)
-                ani_data = [amap.resample(resample) for amap in self.maps]
-            else:
-                raise ValueError('Maps in mapsequence do not all have the same shape.')
-        else:
-            ani_data = self.maps
+        # The maps are read, and resampled, as they are shown
+        ani_data = MapFrames(self.maps, resample=resample)
 
         im = ani_data[0].plot(axes=axes, **kwargs)
 
         def updatefig(i, im, annotate, ani_data, removes):
             while removes:
                 removes.pop(0).remove()
+            ani_data.prefetch(ani_data.following(i, 4))
 
             im.set_array(ani_data[i].data)
             im.set_cmap(ani_data[i].plot_settings['cmap'])
@@ -237,8 +251,9 @@ class MapSequence(object):
         resample: list or False
             Draws the map at a lower resolution to increase the speed of
             animation. Specify a list as a fraction i.e. [0.25, 0.25] to
-            plot at 1/4 resolution.
-            [Note: this will only work where the map arrays are the same size]
+            plot at 1/4 resolution. Fractions of 1/2, 1/4, 1/8 and so on
+            are read from the image pyramids of the maps. Each map is
+            resampled when it is first shown.
 
         annotate: bool
             Annotate the figure with scale and titles
@@ -293,18 +308,7 @@ class MapSequence(object):
         >>> mplani = ani.get_animation()   # doctest: +SKIP
         """
 
-        if resample:
-            if self.all_maps_same_shape():
-                plot_sequence = MapSequence()
-                resample = u.Quantity(self.maps[0].dimensions) * np.array(resample)
-                for amap in self.maps:
-                    plot_sequence.maps.append(amap.resample(resample))
-            else:
-                raise ValueError('Maps in mapsequence do not all have the same shape.')
-        else:
-            plot_sequence = self
-
-        return MapSequenceAnimator(plot_sequence, **kwargs)
+        return MapSequenceAnimator(self, resample=resample, **kwargs)
 
     def all_maps_same_shape(self):
         """
@@ -319,7 +323,7 @@ class MapSequence(object):
         """
         return np.any([m.mask is not None for m in self.maps])
 
-    def as_array(self):
+    def as_array(self, lazy=False, out=None, frame_axis=-1, mask='dense'):
         """
         If all the map shapes are the same, their image data is rendered
         into the appropriate numpy object.  If none of the maps have masks,
@@ -330,22 +334,370 @@ class MapSequence(object):
         with masks copied from maps as appropriately; maps that do not have a
         mask are supplied with a mask that is full of False entries.
         If all the map shapes are not the same, a ValueError is thrown.
+
+        The data of each map is copied directly into the output array, so
+        only one copy of the data is made.
+
+        Parameters
+        ----------
+        lazy : `bool`, optional
+            If `True`, return a `~sunpy.map.mapsequence.DeferredCube` which
+            reads the data of each map only when that part of the cube is
+            indexed, instead of copying all the data into memory. Combined
+            with maps created using ``Map(..., lazy=True, memmap=True)`` this
+            allows sequences which are larger than the available memory to
+            be worked with. Defaults to `False`.
+        out : `numpy.ndarray`, optional
+            An array of the shape of the output to write the data into. The
+            data is cast to the dtype of ``out`` if needed. Can not be used
+            with ``lazy=True``.
+        frame_axis : `int`, optional
+            The axis of the output which indexes the maps. The default, -1,
+            gives a (ny, nx, nt) array, while 0 gives a (nt, ny, nx) array,
+            in which each map is contiguous in memory. The lazy cube is
+            always (ny, nx, nt).
+        mask : {'dense' | 'frames'}, optional
+            How the masks of the maps are returned. With 'dense', the
+            default, a masked array is returned as described above. With
+            'frames', the data is returned as an unmasked array along with a
+            list of the mask of each map, which is `None` for maps without a
+            mask, as a ``(data, masks)`` tuple.
         """
-        if self.all_maps_same_shape():
-            data = np.swapaxes(np.swapaxes(np.asarray([m.data for m in self.maps]), 0, 1).copy(), 1, 2).copy()
-            if self.at_least_one_map_has_mask():
-                mask_sequence = np.zeros_like(data, dtype=bool)
-                for im, m in enumerate(self.maps):
-                    if m.mask is not None:
-                        mask_sequence[:, :, im] = m.mask
-                return ma.masked_array(data, mask=mask_sequence)
-            else:
-                return data
+        if mask not in ('dense', 'frames'):
+            raise ValueError("mask must be one of 'dense' or 'frames'.")
+        if frame_axis not in (0, 2, -1):
+            raise ValueError('frame_axis must be 0 or -1.')
+        if not self.all_maps_same_shape():
+            raise ValueError('Not all maps have the same shape.')
+
+        frames = [m.data for m in self.maps]
+        masks = [m.mask for m in self.maps]
+        dense_mask = mask == 'dense' and any(m is not None for m in masks)
+
+        if lazy:
+            if out is not None:
+                raise ValueError('out can not be used with lazy=True.')
+            if frame_axis == 0:
+                raise ValueError('The lazy cube is always ordered (ny, nx, nt).')
+            cube = DeferredCube(frames, masks=masks if dense_mask else None)
+            return cube if mask == 'dense' else (cube, masks)
+
+        if frame_axis == 0:
+            shape = (len(frames),) + frames[0].shape
         else:
+            shape = frames[0].shape + (len(frames),)
+        if out is None:
+            out = np.empty(shape, dtype=np.result_type(*[frame.dtype for frame in frames]))
+        elif out.shape != shape:
+            raise ValueError('out has shape {}, but the output has shape {}.'.format(out.shape,
+                                                                                    shape))
+
+        def frame_index(i):
+            return i if frame_axis == 0 else (Ellipsis, i)
+
+        for i, frame in enumerate(frames):
+            out[frame_index(i)] = frame
+
+        if mask == 'frames':
+            return out, masks
+        if not dense_mask:
+            return out
+        mask_sequence = np.zeros(shape, dtype=bool)
+        for i, frame_mask in enumerate(masks):
+            if frame_mask is not None:
+                mask_sequence[frame_index(i)] = frame_mask
+        return ma.masked_array(out, mask=mask_sequence)
+
+    def _new_sequence(self, new_data, new_masks, meta_function):
+        """
+        Create a new MapSequence from the (nt, ny, nx) array ``new_data``,
+        with the metadata of each map updated by the keywords returned by
+        ``meta_function(amap)``. These are only computed once for maps which
+        have the same pixel to world mapping.
+        """
+        meta_updates = {}
+        new_maps = []
+        for i, amap in enumerate(self.maps):
+            key = amap._pixel_world_key
+            if key not in meta_updates:
+                meta_updates[key] = meta_function(amap)
+            new_meta = amap.meta.copy()
+            new_meta.update(meta_updates[key])
+            new_mask = None if new_masks is None else new_masks[i]
+            new_maps.append(amap._new_instance(new_data[i], new_meta, amap.plot_settings,
+                                               mask=new_mask))
+        return MapSequence(new_maps, sortby=None)
+
+    def superpixel(self, dimensions, offset=(0, 0)*u.pixel, func=np.sum):
+        """
+        Returns a new MapSequence of the maps in this MapSequence, each
+        consisting of superpixels formed by applying 'func' to the original
+        map data.
+
+        The maps are the same as those returned by
+        `sunpy.map.GenericMap.superpixel`, but the superpixels of all the maps
+        are calculated in a single operation on the data cube, and the new
+        metadata is only calculated once for maps which share the same
+        coordinate system. All the maps must have the same shape.
+
+        Parameters
+        ----------
+        dimensions : tuple
+            One superpixel in the new maps is equal to (dimension[0],
+            dimension[1]) pixels of the original maps.
+            Note: the first argument corresponds to the 'x' axis and the second
+            argument corresponds to the 'y' axis.
+        offset : tuple
+            Offset from (0,0) in original map pixels used to calculate where
+            the data used to make the resulting superpixel maps starts.
+        func : function applied to the original data
+            The function 'func' must take a numpy array as its first argument,
+            and support the axis keyword with the meaning of a numpy axis
+            keyword (see the description of `~numpy.sum` for an example.)
+            The default value of 'func' is `~numpy.sum`.
+
+        Returns
+        -------
+        out : `~sunpy.map.MapSequence`
+            A new MapSequence of maps which have superpixels of the required
+            size.
+        """
+        if (offset.value[0] < 0) or (offset.value[1] < 0):
+            raise ValueError("Offset is strictly non-negative.")
+        if not self.all_maps_same_shape():
             raise ValueError('Not all maps have the same shape.')
 
+        cube = self.as_array(frame_axis=0)
+        reshaped = reshape_image_to_4d_superpixel(cube,
+                                                  [dimensions.value[1], dimensions.value[0]],
+                                                  [offset.value[1], offset.value[0]])
+        new_cube = func(func(reshaped, axis=-1), axis=-2)
+
+        new_masks = None
+        if self.at_least_one_map_has_mask():
+            new_mask_cube = np.ma.getmaskarray(new_cube)
+            new_masks = [None if m.mask is None else new_mask_cube[i]
+                         for i, m in enumerate(self.maps)]
+
+        return self._new_sequence(
+            np.ma.getdata(new_cube), new_masks,
+            lambda amap: amap._superpixel_meta(dimensions, offset, new_cube.shape))
+
+    def resample(self, dimensions, method='linear'):
+        """
+        Returns a new MapSequence of the maps in this MapSequence resampled
+        up or down to the given dimensions.
+
+        The maps are the same as those returned by
+        `sunpy.map.GenericMap.resample`, but all the maps are resampled in a
+        single operation on the data cube, and the new metadata is only
+        calculated once for maps which share the same coordinate system. All
+        the maps must have the same shape.
+
+        Parameters
+        ----------
+        dimensions : `~astropy.units.Quantity`
+            Pixel dimensions that the new maps should have.
+            Note: the first argument corresponds to the 'x' axis and the second
+            argument corresponds to the 'y' axis.
+        method : {'neighbor' | 'nearest' | 'linear' | 'spline'}
+            Method to use for resampling interpolation, see
+            `sunpy.map.GenericMap.resample`.
+
+        Returns
+        -------
+        out : `~sunpy.map.MapSequence`
+            A new MapSequence of maps which have been resampled to the
+            desired dimensions.
+        """
+        if not self.all_maps_same_shape():
+            raise ValueError('Not all maps have the same shape.')
+
+        # As in GenericMap.resample the (nt, ny, nx) cube is transposed so
+        # that the x axis comes first, and the time axis is left unchanged.
+        cube, _ = self.as_array(frame_axis=0, mask='frames')
+        new_cube = sunpy_image_resample(cube.T, [dimensions[0].value, dimensions[1].value,
+                                                 len(self.maps)],
+                                        method, center=True).T
+
+        return self._new_sequence(new_cube, None,
+                                  lambda amap: amap._resample_meta(dimensions))
+
     def all_meta(self):
         """
         Return all the meta objects as a list.
         """
         return [m.meta for m in self.maps]
+
+
+class DeferredCube(NDArrayOperatorsMixin):
+    """
+    A lazily evaluated (ny, nx, nt) array of the data of a sequence of maps.
+
+    Nothing is copied when the cube is created. Indexing the cube only
+    touches the frames, and the parts of those frames, which are selected,
+    so a single frame or a small region of a long sequence can be extracted
+    without reading the whole sequence into memory. Indexing with slices,
+    integers and one-dimensional index arrays follows the usual numpy rules;
+    any other indexing falls back to reading the whole cube.
+
+    Parameters
+    ----------
+    frames : `list`
+        The (ny, nx) data arrays of each map. These can be any array-like
+        object supporting numpy indexing, such as memory mapped arrays or
+        `~sunpy.io.file_tools.DeferredData`.
+    masks : `list`, optional
+        The (ny, nx) masks of each map, with `None` for maps which do not
+        have a mask. If given, indexing the cube returns a masked array.
+    """
+    def __init__(self, frames, masks=None):
+        self._frames = list(frames)
+        if not self._frames:
+            raise ValueError('A DeferredCube needs at least one frame.')
+        shape = self._frames[0].shape
+        if any(frame.shape != shape for frame in self._frames):
+            raise ValueError('Not all frames have the same shape.')
+        if masks is not None and len(masks) != len(self._frames):
+            raise ValueError('The number of masks must match the number of frames.')
+        self._masks = None if masks is None else list(masks)
+        self._shape = tuple(shape) + (len(self._frames),)
+        self._dtype = np.result_type(*[frame.dtype for frame in self._frames])
+
+    @property
+    def shape(self):
+        return self._shape
+
+    @property
+    def ndim(self):
+        return len(self._shape)
+
+    @property
+    def size(self):
+        return int(np.prod(self._shape))
+
+    @property
+    def dtype(self):
+        return self._dtype
+
+    def __len__(self):
+        return self._shape[0]
+
+    def _expand_key(self, key):
+        """
+        Expand ``key`` to a (y, x, t) tuple, or return `None` if it can not be
+        applied one frame at a time.
+        """
+        if not isinstance(key, tuple):
+            key = (key,)
+        ellipses = [i for i, k in enumerate(key) if k is Ellipsis]
+        if len(ellipses) > 1:
+            raise IndexError("an index can only have a single ellipsis ('...')")
+        if ellipses:
+            i = ellipses[0]
+            key = key[:i] + (slice(None),) * (self.ndim - len(key) + 1) + key[i + 1:]
+        if len(key) > self.ndim:
+            raise IndexError('too many indices for array')
+        key = key + (slice(None),) * (self.ndim - len(key))
+
+        n_arrays = 0
+        for k in key:
+            if k is None:
+                return None
+            if not isinstance(k, (slice, int, np.integer)):
+                if np.ndim(k) != 1:
+                    return None
+                n_arrays += 1
+        if n_arrays > 1:
+            return None
+        ykey, xkey, tkey = key
+        if (not isinstance(ykey, slice) and isinstance(xkey, slice) and
+                not isinstance(tkey, (slice, int, np.integer))):
+            # numpy moves the axes of advanced indices which are separated by
+            # a slice to the front, which can not be done one frame at a time
+            return None
+        return key
+
+    def _take(self, ykey, xkey, indices, masked):
+        # Find the shape of a selection from one frame without allocating it
+        plane_shape = np.broadcast_to(np.empty((), dtype=bool), self._shape[:2])[ykey, xkey].shape
+        data = np.empty(plane_shape + (len(indices),), dtype=self._dtype)
+        for j, i in enumerate(indices):
+            data[..., j] = self._read_frame(i, ykey, xkey)
+        if not masked:
+            return data
+        mask = np.zeros(data.shape, dtype=bool)
+        for j, i in enumerate(indices):
+            if self._masks[i] is not None:
+                mask[..., j] = self._masks[i][ykey, xkey]
+        return ma.masked_array(data, mask=mask)
+
+    def _read_frame(self, i, ykey, xkey):
+        """
+        The (ykey, xkey) selection from frame ``i``. Frames which have not
+        been read yet are only read in the smallest section containing the
+        selection, and are not kept in memory.
+        """
+        frame = self._frames[i]
+        if not isinstance(frame, DeferredData) or frame.loaded:
+            return frame[ykey, xkey]
+        ysection, ykey = _section(ykey, self._shape[0])
+        xsection, xkey = _section(xkey, self._shape[1])
+        if ysection is None and xsection is None:
+            return frame.read()[ykey, xkey]
+        return frame.read(section=(ysection or slice(None),
+                                   xsection or slice(None)))[ykey, xkey]
+
+    def _getitem(self, key, masked):
+        expanded = self._expand_key(key)
+        if expanded is None:
+            return self._take(slice(None), slice(None), range(self._shape[2]), masked)[key]
+        ykey, xkey, tkey = expanded
+        if isinstance(tkey, (int, np.integer)):
+            return self._take(ykey, xkey, [range(self._shape[2])[tkey]], masked)[..., 0]
+        return self._take(ykey, xkey, np.arange(self._shape[2])[tkey], masked)
+
+    def __getitem__(self, key):
+        return self._getitem(key, self._masks is not None)
+
+    def __array__(self, dtype=None):
+        array = self._getitem(Ellipsis, False)
+        if dtype is not None:
+            array = array.astype(dtype, copy=False)
+        return array
+
+    def __array_ufunc__(self, ufunc, method, *inputs, **kwargs):
+        inputs = tuple(x[...] if isinstance(x, DeferredCube) else x for x in inputs)
+        if 'out' in kwargs:
+            if any(isinstance(x, DeferredCube) for x in kwargs['out']):
+                return NotImplemented
+        return getattr(ufunc, method)(*inputs, **kwargs)
+
+    def __repr__(self):
+        return "<{} shape={} dtype={}>".format(type(self).__name__, self._shape, self._dtype)
+
+
+def _section(key, n):
+    """
+    Split the index ``key`` of an axis of length ``n`` into the smallest
+    contiguous slice containing the selected elements, or `None` for the
+    whole axis, and the index of the selection within that slice.
+    """
+    if isinstance(key, slice):
+        selected = range(*key.indices(n))
+        if len(selected) == n:
+            return None, key
+        if not selected:
+            return slice(0, 0), slice(None)
+        start = min(selected[0], selected[-1])
+        stop = selected[-1] - start + (1 if selected.step > 0 else -1)
+        return (slice(start, max(selected[0], selected[-1]) + 1),
+                slice(selected[0] - start, stop if stop >= 0 else None, selected.step))
+    if isinstance(key, (int, np.integer)):
+        index = range(n)[key]
+        return slice(index, index + 1), 0
+    selected = np.arange(n)[key]
+    if selected.size == 0:
+        return slice(0, 0), selected
+    start = selected.min()
+    return slice(start, selected.max() + 1), selected - start
@@ -5,17 +5,21 @@ Created on Fri Jun 21 15:05:09 2013
 @author: stuart
 """
 import os
+import mmap
 import glob
 import tempfile
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 
 import pytest
 import numpy as np
 from astropy.io import fits
+import astropy.units as u
 from astropy.wcs import WCS
 
 import sunpy
 import sunpy.map
 import sunpy.data.test
+from sunpy.io.file_tools import DeferredData
 
 
 filepath = sunpy.data.test.rootdir
@@ -88,6 +92,19 @@ class TestMap(object):
         pair_map = sunpy.map.Map(data, header)
         assert isinstance(pair_map, sunpy.map.GenericMap)
 
+    @pytest.mark.parametrize('executor_class', [ThreadPoolExecutor, ProcessPoolExecutor])
+    def test_executor(self, executor_class):
+        files = [os.path.join(filepath, "EIT"), AIA_171_IMAGE,
+                 os.path.join(filepath, "EIT", "*")]
+        maps = sunpy.map.Map(files)
+        with executor_class(max_workers=2) as executor:
+            parallel_maps = sunpy.map.Map(files, executor=executor)
+        assert len(parallel_maps) == len(maps)
+        for amap, parallel_map in zip(maps, parallel_maps):
+            assert type(parallel_map) is type(amap)
+            assert parallel_map.date == amap.date
+            np.testing.assert_equal(parallel_map.data, amap.data)
+
     # requires dask array to run properly
     def test_dask_array(self):
         dask_array = pytest.importorskip('dask.array')
@@ -96,6 +113,101 @@ class TestMap(object):
         pair_map = sunpy.map.Map(da, amap.meta)
         assert isinstance(pair_map, sunpy.map.GenericMap)
 
+    def test_memmap(self):
+        amap = sunpy.map.Map(AIA_171_IMAGE, memmap=True)
+        assert isinstance(amap, sunpy.map.sources.AIAMap)
+        # The data should be a view onto the memory mapped file
+        assert not amap.data.flags.owndata
+        assert isinstance(amap.data.base, mmap.mmap)
+
+        inmemory = sunpy.map.Map(AIA_171_IMAGE)
+        np.testing.assert_equal(amap.data, inmemory.data)
+        submap = amap.submap([10, 10]*u.pix, [20, 20]*u.pix)
+        np.testing.assert_equal(submap.data, inmemory.data[10:20, 10:20])
+        superpixel = amap.superpixel([2, 2]*u.pix)
+        np.testing.assert_equal(superpixel.data,
+                                inmemory.superpixel([2, 2]*u.pix).data)
+
+    def test_lazy(self):
+        amap = sunpy.map.Map(AIA_171_IMAGE, lazy=True)
+        inmemory = sunpy.map.Map(AIA_171_IMAGE)
+        assert isinstance(amap, sunpy.map.sources.AIAMap)
+        assert isinstance(amap.data, DeferredData)
+        assert amap.date == inmemory.date
+        assert amap.wavelength == inmemory.wavelength
+        assert amap.exposure_time == inmemory.exposure_time
+        assert amap.dimensions == inmemory.dimensions
+        assert amap.dtype == inmemory.dtype
+        assert amap.wcs.wcs.compare(inmemory.wcs.wcs)
+        assert not amap.data.loaded
+
+        # A submap only reads its section of the data
+        submap = amap.submap([10, 10]*u.pix, [20, 20]*u.pix)
+        assert not amap.data.loaded
+        np.testing.assert_equal(submap.data, inmemory.data[10:20, 10:20])
+
+        # Tables in other HDUs are not returned as maps
+        rhessi = sunpy.map.Map(RHESSI_IMAGE, lazy=True)
+        assert isinstance(rhessi, sunpy.map.sources.RHESSIMap)
+        assert rhessi.data.shape == (64, 64)
+
+    def test_lazy_sequence(self):
+        sequence = sunpy.map.Map(a_list_of_many, sequence=True, lazy=True)
+        assert isinstance(sequence, sunpy.map.MapSequence)
+        dates = [m.date for m in sequence]
+        assert dates == sorted(dates)
+        assert not any(m.data.loaded for m in sequence)
+
+    def test_region(self, tmpdir):
+        inmemory = sunpy.map.Map(AIA_171_IMAGE)
+        bottom_left = inmemory.pixel_to_world(20*u.pix, 30*u.pix)
+        top_right = inmemory.pixel_to_world(60*u.pix, 50*u.pix)
+        expected = inmemory.submap(bottom_left, top_right)
+
+        # A tile compressed copy of the file, Rice compression is lossless
+        # for integers
+        compressed = str(tmpdir / 'compressed.fits')
+        header = fits.getheader(AIA_171_IMAGE)
+        fits.HDUList([fits.PrimaryHDU(),
+                      fits.CompImageHDU(np.round(inmemory.data).astype(np.int32), header,
+                                        tile_size=(16, 16))]
+                     ).writeto(compressed)
+
+        for path, data in ((AIA_171_IMAGE, expected.data),
+                           (compressed, np.round(expected.data))):
+            cutout = sunpy.map.Map(path, region=(bottom_left, top_right))
+            assert isinstance(cutout, sunpy.map.sources.AIAMap)
+            assert not isinstance(cutout.data, DeferredData)
+            np.testing.assert_equal(cutout.data, data)
+            assert cutout.reference_pixel == expected.reference_pixel
+            assert cutout.dimensions == expected.dimensions
+
+        # A submap of a lazy map only reads the pixels of the submap
+        lazy = sunpy.map.Map(AIA_171_IMAGE, lazy=True)
+        submap = lazy.submap(bottom_left, top_right)
+        assert not lazy.data.loaded
+        np.testing.assert_equal(submap.data, expected.data)
+
+    def test_section(self):
+        inmemory = sunpy.map.Map(AIA_171_IMAGE)
+        section = (slice(30, 50), slice(20, 60))
+        expected = inmemory.submap([20, 30]*u.pix, [60, 50]*u.pix)
+        for kwargs in ({}, {'lazy': True}):
+            amap = sunpy.map.Map(AIA_171_IMAGE, section=section, **kwargs)
+            np.testing.assert_equal(amap.data, inmemory.data[section])
+            assert amap.reference_pixel == expected.reference_pixel
+
+        # A region within the section
+        bottom_left = inmemory.pixel_to_world(25*u.pix, 35*u.pix)
+        top_right = inmemory.pixel_to_world(45*u.pix, 45*u.pix)
+        cutout = sunpy.map.Map(AIA_171_IMAGE, section=section, region=(bottom_left, top_right))
+        np.testing.assert_equal(cutout.data, inmemory.submap(bottom_left, top_right).data)
+
+        with pytest.raises(ValueError):
+            sunpy.map.Map(AIA_171_IMAGE, rlevel=2)
+        with pytest.raises(ValueError):
+            sunpy.map.Map(AIA_171_IMAGE, rlevel=2, lazy=True)
+
     # requires sqlalchemy to run properly
     def test_databaseentry(self):
         sqlalchemy = pytest.importorskip('sqlalchemy')
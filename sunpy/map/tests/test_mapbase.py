@@ -24,6 +24,7 @@ import sunpy.sun
 import sunpy.data.test
 import sunpy.coordinates
 from sunpy.time import parse_time
+from sunpy.util.decorators import cached_property_based_on
 
 testpath = sunpy.data.test.rootdir
 
@@ -101,6 +102,53 @@ def test_wcs(aia171_test_map):
     assert set(wcs.wcs.cunit) == set([u.Unit(a) for a in aia171_test_map.spatial_units])
 
 
+def test_wcs_cache(generic_map):
+    wcs = generic_map.wcs
+    frame = generic_map.coordinate_frame
+    assert generic_map.wcs is wcs
+    assert generic_map.coordinate_frame is frame
+    assert generic_map.observer_coordinate is generic_map.observer_coordinate
+
+    # Modifying the metadata should cause the WCS to be rebuilt
+    generic_map.meta['crval1'] = 10
+    assert generic_map.wcs is not wcs
+    assert generic_map.wcs.wcs.crval[0] == 10
+
+
+def test_wcs_cache_unhashable_meta(generic_map):
+    generic_map.meta['unhashable'] = [1, 2]
+    assert generic_map._meta_hash is None
+    assert generic_map.wcs is not generic_map.wcs
+
+
+def test_wcs_rebuilds_submap_plot(aia171_test_map, monkeypatch):
+    # Count how many times a WCS is built during a typical submap and plot
+    # workflow: it should be built only once per map.
+    built_for = []
+    build_wcs = sunpy.map.GenericMap.wcs.fget.__wrapped__
+
+    def counting_wcs(self):
+        built_for.append(self)
+        return build_wcs(self)
+
+    monkeypatch.setattr(sunpy.map.GenericMap, 'wcs',
+                        cached_property_based_on('_meta_hash')(counting_wcs))
+
+    bottom_left = SkyCoord(-100*u.arcsec, -100*u.arcsec, frame=aia171_test_map.coordinate_frame)
+    top_right = SkyCoord(100*u.arcsec, 100*u.arcsec, frame=aia171_test_map.coordinate_frame)
+    submap = aia171_test_map.submap(bottom_left, top_right)
+    submap.pixel_to_world(*submap.dimensions)
+    fig = plt.figure()
+    ax = fig.add_subplot(111, projection=submap)
+    submap.plot(axes=ax)
+    submap.draw_limb(axes=ax)
+    plt.close(fig)
+
+    assert len(built_for) == 2
+    assert built_for[0] is aia171_test_map
+    assert built_for[1] is submap
+
+
 def test_dtype(generic_map):
     assert generic_map.dtype == np.float64
 
@@ -262,6 +310,43 @@ def test_world_to_pixel(generic_map):
     assert_quantity_allclose(test_pixel, generic_map.reference_pixel)
 
 
+def test_all_coordinates(aia171_test_map):
+    lon, lat = aia171_test_map.all_coordinates()
+    assert lon.shape == aia171_test_map.data.shape
+    coordinate = aia171_test_map.pixel_to_world(3*u.pix, 10*u.pix)
+    assert_quantity_allclose(lon[10, 3], coordinate.Tx)
+    assert_quantity_allclose(lat[10, 3], coordinate.Ty)
+    with pytest.raises(ValueError):
+        lon[0, 0] = 0*u.arcsec
+
+    # The cache is shared between maps with the same coordinate system
+    copied_map = sunpy.map.Map(aia171_test_map.data.copy(), aia171_test_map.meta.copy())
+    assert copied_map.all_coordinates()[0] is lon
+    submap = aia171_test_map.submap([0, 0]*u.pix, [10, 10]*u.pix)
+    assert submap.all_coordinates()[0].shape == (10, 10)
+
+    # The cache is limited by the size of the coordinates
+    assert sunpy.map.mapbase._all_coordinates_cache.nbytes >= lon.nbytes + lat.nbytes
+    assert (sunpy.map.mapbase._all_coordinates_cache.nbytes <=
+            sunpy.map.mapbase._all_coordinates_cache.max_bytes)
+
+    lon32, lat32 = aia171_test_map.all_coordinates(dtype=np.float32)
+    assert lon32.dtype == np.float32
+    assert_quantity_allclose(lon32, lon, rtol=1e-6)
+
+    hgs_lon, hgs_lat = aia171_test_map.all_coordinates('heliographic_stonyhurst')
+    assert hgs_lon.unit == u.deg
+    assert np.isnan(hgs_lon[0, 0])
+    hgs = aia171_test_map.pixel_to_world(64*u.pix, 64*u.pix).transform_to('heliographic_stonyhurst')
+    assert_quantity_allclose(hgs_lon[64, 64], hgs.lon)
+    assert_quantity_allclose(hgs_lat[64, 64], hgs.lat)
+
+    with pytest.raises(ValueError):
+        aia171_test_map.all_coordinates('icrs')
+    with pytest.raises(ValueError):
+        aia171_test_map.all_coordinates(dtype=int)
+
+
 def test_save(generic_map):
     """Tests the map save function"""
     aiamap = aia171_test_map()
@@ -435,6 +520,39 @@ def test_superpixel(aia171_test_map, aia171_test_map_with_mask):
         np.int((aia171_test_map.dimensions[1] / dimensions[1]).value) * u.pix - 1 * u.pix)
 
 
+def test_pyramid_level(aia171_test_map):
+    assert aia171_test_map.pyramid_level(0) is aia171_test_map
+    level2 = aia171_test_map.pyramid_level(2)
+    expected = aia171_test_map.superpixel((4, 4) * u.pix, func=np.mean)
+    assert level2.data.shape == expected.data.shape
+    np.testing.assert_allclose(level2.data, expected.data, rtol=1e-6)
+    assert_quantity_allclose(u.Quantity(level2.scale), u.Quantity(expected.scale))
+    assert_quantity_allclose(level2.center.Tx, expected.center.Tx)
+    assert_quantity_allclose(level2.center.Ty, expected.center.Ty)
+
+    # The levels are cached until the metadata changes
+    assert aia171_test_map.pyramid_level(2) is level2
+    assert aia171_test_map.pyramid_level(1) is aia171_test_map._pyramid[1]
+    aia171_test_map.meta['crval1'] += 1
+    assert aia171_test_map.pyramid_level(2) is not level2
+
+    with pytest.raises(ValueError):
+        aia171_test_map.pyramid_level(-1)
+    with pytest.raises(ValueError):
+        aia171_test_map.pyramid_level(20)
+
+
+def test_plot_tiled(aia171_test_map):
+    fig = plt.figure(figsize=(0.5, 0.5), dpi=100)
+    axes = fig.add_subplot(111, projection=aia171_test_map)
+    im = aia171_test_map.plot(axes=axes, tiled=True)
+    # The image is drawn from the pyramid at about the resolution of the axes
+    level = im._tiled_image.overview_level
+    assert level > 0
+    np.testing.assert_allclose(im.get_array(), aia171_test_map.pyramid_level(level).data)
+    plt.close(fig)
+
+
 def calc_new_matrix(angle):
     c = np.cos(np.deg2rad(angle))
     s = np.sin(np.deg2rad(angle))
@@ -495,6 +613,16 @@ def test_rotate_pad_crpix(generic_map):
                              u.Quantity((6.049038105675565, 7.5490381056760265), u.pix))
 
 
+def test_rotate_float32(generic_map):
+    float32_map = sunpy.map.Map(generic_map.data.astype(np.float32), generic_map.meta)
+    rotated_map = float32_map.rotate(30*u.deg)
+    expected = generic_map.rotate(30*u.deg)
+    assert rotated_map.data.dtype == np.float32
+    np.testing.assert_allclose(rotated_map.data, expected.data, atol=1e-6)
+    assert_quantity_allclose(u.Quantity(rotated_map.reference_pixel),
+                             u.Quantity(expected.reference_pixel))
+
+
 def test_rotate_recenter(generic_map):
     rotated_map = generic_map.rotate(20 * u.deg, recenter=True)
     pixel_array_center = (np.flipud(rotated_map.data.shape) - 1) / 2.0
@@ -9,7 +9,9 @@ import sunpy.map
 from sunpy.util.metadata import MetaDict
 import pytest
 import os
+import glob
 import sunpy.data.test
+from sunpy.map.mapsequence import DeferredCube
 
 
 @pytest.fixture
@@ -145,3 +147,116 @@ def test_all_meta(mapsequence_all_the_same):
     assert len(meta) == 2
     assert np.all(np.asarray([isinstance(h, MetaDict) for h in meta]))
     assert np.all(np.asarray([meta[i] == mapsequence_all_the_same[i].meta for i in range(0, len(meta))]))
+
+
+def test_as_array_lazy(mapsequence_all_the_same_some_have_masks):
+    cube = mapsequence_all_the_same_some_have_masks.as_array(lazy=True)
+    assert isinstance(cube, DeferredCube)
+    assert cube.shape == (128, 128, 3)
+    expected = mapsequence_all_the_same_some_have_masks.as_array()
+    for key in [Ellipsis, (slice(None), slice(None), 1), (10, 20, -1),
+                (slice(0, 5), Ellipsis, slice(None, None, 2)),
+                ([1, 3, 2], slice(4, 9)), (Ellipsis, [2, 0]),
+                ([1, 2], [3, 4], 0), (slice(None), None, 1),
+                (0, slice(None), [1, 2]), ([4, 5], slice(None), 1)]:
+        returned = cube[key]
+        np.testing.assert_equal(np.ma.getdata(returned), expected.data[key])
+        np.testing.assert_equal(np.ma.getmaskarray(returned), np.ma.getmaskarray(expected)[key])
+    np.testing.assert_equal(np.asarray(cube), expected.data)
+    np.testing.assert_equal(np.ma.getdata(cube + 1), expected.data + 1)
+    # The axes of advanced indices separated by a slice come first
+    assert cube[0, :, [1, 2]].shape == (2, 128)
+    np.testing.assert_equal(np.ma.getdata(cube[0, :, [1, 2]]), np.asarray(cube)[0, :, [1, 2]])
+    with pytest.raises(IndexError):
+        cube[0, 0, 3]
+
+
+def test_as_array_lazy_files():
+    files = glob.glob(os.path.join(sunpy.data.test.rootdir, "EIT", "*"))
+    sequence = sunpy.map.Map(files, sequence=True, lazy=True, memmap=True)
+    cube = sequence.as_array(lazy=True)
+    assert cube.shape == sequence[0].data.shape + (len(files),)
+    assert not any(m.data.loaded for m in sequence)
+
+    frame = cube[:, :, 2]
+    assert isinstance(frame, np.ndarray)
+    np.testing.assert_equal(frame, sunpy.map.Map(sequence[2].data.filepath).data)
+
+    # Slices of the cube only read sections of the frames, and do not keep
+    # the frames in memory
+    expected = np.stack([sunpy.map.Map(m.data.filepath).data for m in sequence], axis=-1)
+    for key in [(slice(0, 10), slice(0, 10)), (slice(20, 3, -3), 5, slice(None, None, 2)),
+                ([7, 2, 9], slice(-10, None)), (Ellipsis, [1, 0])]:
+        np.testing.assert_equal(cube[key], expected[key])
+    assert not any(m.data.loaded for m in sequence)
+
+
+def test_as_array_out(mapsequence_all_the_same_some_have_masks):
+    expected = mapsequence_all_the_same_some_have_masks.as_array()
+
+    out = np.zeros((3, 128, 128), dtype=np.float64)
+    returned = mapsequence_all_the_same_some_have_masks.as_array(out=out, frame_axis=0)
+    assert np.shares_memory(returned, out)
+    np.testing.assert_equal(out, np.moveaxis(expected.data, -1, 0))
+    np.testing.assert_equal(returned.mask, np.moveaxis(expected.mask, -1, 0))
+
+    with pytest.raises(ValueError):
+        mapsequence_all_the_same_some_have_masks.as_array(out=out)
+    with pytest.raises(ValueError):
+        mapsequence_all_the_same_some_have_masks.as_array(frame_axis=1)
+    with pytest.raises(ValueError):
+        mapsequence_all_the_same_some_have_masks.as_array(lazy=True, frame_axis=0)
+
+
+def test_as_array_frame_masks(mapsequence_all_the_same_some_have_masks):
+    sequence = mapsequence_all_the_same_some_have_masks
+    data, masks = sequence.as_array(mask='frames')
+    assert not isinstance(data, np.ma.MaskedArray)
+    np.testing.assert_equal(data, sequence.as_array().data)
+    assert len(masks) == 3
+    assert masks[0] is sequence[0].mask
+    assert masks[2] is None
+
+    cube, masks = sequence.as_array(lazy=True, mask='frames')
+    assert not isinstance(cube[0, 0, :], np.ma.MaskedArray)
+    with pytest.raises(ValueError):
+        sequence.as_array(mask='sparse')
+
+
+@pytest.mark.parametrize('func', [np.sum, np.mean])
+def test_superpixel(mapsequence_all_the_same_some_have_masks, func):
+    dimensions = (4, 2)*u.pix
+    offset = (1, 3)*u.pix
+    sequence = mapsequence_all_the_same_some_have_masks.superpixel(dimensions, offset, func)
+    assert isinstance(sequence, sunpy.map.MapSequence)
+    assert len(sequence) == 3
+    for amap, new_map in zip(mapsequence_all_the_same_some_have_masks, sequence):
+        expected = amap.superpixel(dimensions, offset, func)
+        assert type(new_map) is type(expected)
+        np.testing.assert_allclose(new_map.data, expected.data)
+        if expected.mask is None:
+            assert new_map.mask is None
+        else:
+            np.testing.assert_equal(new_map.mask, expected.mask)
+        assert dict(new_map.meta) == dict(expected.meta)
+
+
+@pytest.mark.parametrize('method', ['neighbor', 'nearest', 'linear', 'spline'])
+def test_resample(method):
+    files = glob.glob(os.path.join(sunpy.data.test.rootdir, "EIT", "*"))
+    original = sunpy.map.Map(files, sequence=True)
+    dimensions = (200, 100)*u.pix
+    sequence = original.resample(dimensions, method)
+    assert len(sequence) == len(original)
+    for amap, new_map in zip(original, sequence):
+        expected = amap.resample(dimensions, method)
+        assert new_map.date == amap.date
+        np.testing.assert_allclose(new_map.data, expected.data, atol=1e-8 * expected.data.max())
+        assert dict(new_map.meta) == dict(expected.meta)
+
+
+def test_superpixel_resample_different_shapes(mapsequence_different):
+    with pytest.raises(ValueError):
+        mapsequence_different.superpixel((2, 2)*u.pix)
+    with pytest.raises(ValueError):
+        mapsequence_different.resample((2, 2)*u.pix)
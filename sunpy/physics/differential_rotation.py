@@ -1,17 +1,18 @@
 import datetime
-import warnings
 from copy import deepcopy
-from itertools import product
+from itertools import chain, islice, product
 
 import numpy as np
 
 from astropy import units as u
-from astropy.coordinates import SkyCoord, Longitude
+from astropy.coordinates import SkyCoord, Longitude, BaseCoordinateFrame
 
 from sunpy.time import parse_time
-from sunpy.coordinates import HeliographicStonyhurst, frames
+from sunpy.io.file_tools import DeferredData
+from sunpy.coordinates import HeliographicStonyhurst, Helioprojective, frames
+from sunpy.coordinates import array_transforms
 
-__all__ = ['diff_rot', 'solar_rotate_coordinate', 'diffrot_map']
+__all__ = ['diff_rot', 'solar_rotate_coordinate', 'diffrot_map', 'diffrot_maps']
 
 
 @u.quantity_input(duration=u.s, latitude=u.degree)
@@ -149,6 +150,11 @@ def solar_rotate_coordinate(coordinate,
     interval = (
         parse_time(new_observer_time) - parse_time(coordinate.obstime)).to(u.s)
 
+    if (isinstance(coordinate.frame, Helioprojective) and
+            isinstance(coordinate.observer, BaseCoordinateFrame)):
+        return _solar_rotate_hpc(coordinate, interval, new_observer_time,
+                                 new_observer_location, **diff_rot_kwargs)
+
     # Compute Stonyhurst Heliographic co-ordinates - returns (longitude,
     # latitude). Points off the limb are returned as nan.
     heliographic_coordinate = coordinate.transform_to('heliographic_stonyhurst')
@@ -168,72 +174,139 @@ def solar_rotate_coordinate(coordinate,
     return heliographic_rotated.transform_to(coordinate.frame.name)
 
 
-@u.quantity_input(dt=u.s)
-def _warp_sun_coordinates(xy, smap, dt, **diffrot_kwargs):
+def _solar_rotate_hpc(coordinate, interval, new_observer_time, new_observer_location,
+                      **diff_rot_kwargs):
+    """
+    Implementation of `solar_rotate_coordinate` for Helioprojective
+    coordinates, which transforms plain arrays rather than coordinate objects
+    so that it is fast for large arrays of coordinates.
     """
-    Function that returns a new list of coordinates for each input coord.
-    This is an inverse function needed by the scikit-image `transform.warp`
-    function.
+    new_frame = Helioprojective(obstime=new_observer_time, observer=new_observer_location)
 
-    Parameters
-    ----------
-    xy : `numpy.ndarray`
-        Array from `transform.warp`
-    smap : `~sunpy.map`
-        Original map that we want to transform
-    dt : `~astropy.units.Quantity`
-        Desired interval to rotate the input map by solar differential rotation.
+    distance = coordinate.distance
+    distance = None if distance.unit is u.one else distance.to_value(u.m)
+    lon, lat, _ = array_transforms.hpc_to_hgs(coordinate.Tx.to_value(u.deg),
+                                              coordinate.Ty.to_value(u.deg),
+                                              coordinate.observer, distance=distance,
+                                              rsun=coordinate.rsun.to_value(u.m))
 
-    Returns
-    -------
-    xy2 : `~numpy.ndarray`
-        Array with the inverse transformation
+    # Compute the differential rotation
+    drot = diff_rot(interval, lat * u.deg, **diff_rot_kwargs)
+
+    # Rotate the coordinates and view them from the new observer. As in
+    # solar_rotate_coordinate the rotated coordinates are placed on the
+    # surface of a Sun of the default radius.
+    tx, ty, distance = array_transforms.hgs_to_hpc(lon + drot.to_value(u.deg), lat,
+                                                   new_frame.observer)
+
+    return SkyCoord((tx * u.deg).to(u.arcsec), (ty * u.deg).to(u.arcsec),
+                    (distance * u.m).to(u.km), frame=new_frame)
+
+
+def _warp_sun_block(smap, rows, dt, observer, **diffrot_kwargs):
     """
-    # NOTE: The time is being subtracted - this is because this function
-    # calculates the inverse of the transformation.
-    rotated_time = smap.date - dt
-
-    # Calculate the hpc coords
-    x = np.arange(0, smap.dimensions.x.value)
-    y = np.arange(0, smap.dimensions.y.value)
-    xx, yy = np.meshgrid(x, y)
-    # the xy input array would have the following shape
-    # xy = np.dstack([xx.T.flat, yy.T.flat])[0]
-
-    # We start by converting the pixel to world
-    with warnings.catch_warnings():
-        warnings.simplefilter('ignore')
-        hpc_coords = smap.pixel_to_world(xx * u.pix, yy * u.pix)
-
-        # then diff-rotate the hpc coordinates to the desired time
-        rotated_coord = solar_rotate_coordinate(hpc_coords, rotated_time, **diffrot_kwargs)
-
-        # To find the values that are behind the sun we need to convert them
-        # to HeliographicStonyhurst
-        findOccult = rotated_coord.transform_to(HeliographicStonyhurst)
-
-        with np.errstate(invalid='ignore'):
-            # and find which ones are outside the [-90, 90] range.
-            occult = np.logical_or(np.less(findOccult.lon, -90 * u.deg),
-                                   np.greater(findOccult.lon, 90 * u.deg))
+    Return the pixel coordinates that a block of rows of the map rotate from
+    over the interval ``dt``, as a ``(2, rows, columns)`` array of row and
+    column pixel coordinates which can be passed to the scikit-image
+    `transform.warp` function.
+
+    The coordinates are transformed as plain arrays with
+    `sunpy.coordinates.array_transforms`, so only arrays the size of the block
+    are allocated. ``observer`` is the ``(lon, lat, radius)`` of the observer
+    of the map in Heliographic Stonyhurst.
+    """
+    wcs = smap.wcs
+    rsun = smap.coordinate_frame.rsun.to_value(u.m)
+
+    y, x = np.mgrid[rows, 0:smap.data.shape[1]]
+    tx, ty = wcs.wcs_pix2world(x, y, 0)
+
+    with np.errstate(invalid='ignore'):
+        lon, lat, _ = array_transforms.hpc_to_hgs(tx, ty, observer, rsun=rsun)
+    return _rotate_sun_pixels(wcs, lon, lat, dt, observer, **diffrot_kwargs)
+
+
+def _rotate_sun_pixels(wcs, lon, lat, dt, observer, **diffrot_kwargs):
+    """
+    Return the ``(2, rows, columns)`` row and column pixel coordinates in
+    ``wcs`` that the Heliographic Stonyhurst coordinates ``lon`` and ``lat``
+    (in degrees) rotate from over the interval ``dt``.
+    """
+    with np.errstate(invalid='ignore'):
+        # NOTE: The time is being subtracted - this is because this function
+        # calculates the inverse of the transformation.
+        lon = lon + diff_rot(-dt, lat * u.deg, **diffrot_kwargs).to_value(u.deg)
+        lat = np.array(lat)
 
         # NaN-ing values that move to the other side of the sun
-        rotated_coord.data.lon[occult] = np.nan * u.deg
-        rotated_coord.data.lat[occult] = np.nan * u.deg
-        rotated_coord.cache.clear()
+        occult = np.abs(np.mod(lon + 180, 360) - 180) > 90
+        lon[occult] = np.nan
+        lat[occult] = np.nan
+
+        tx, ty, _ = array_transforms.hgs_to_hpc(lon, lat, observer)
 
-        # Go back to pixel co-ordinates
-        x2, y2 = smap.world_to_pixel(rotated_coord)
+    # Go back to pixel co-ordinates
+    coords = np.empty((2,) + lon.shape)
+    coords[1], coords[0] = wcs.wcs_world2pix(tx, ty, 0)
+    return coords
 
-    # Re-stack the data to make it correct output form
-    xy2 = np.dstack([x2.T.value.flat, y2.T.value.flat])[0]
-    # Returned a masked array with the non-finite entries masked.
-    xy2 = np.ma.array(xy2, mask=np.isnan(xy2))
-    return xy2
+
+def _check_helioprojective(smap):
+    """
+    Raise a `ValueError` if ``smap`` does not have a Helioprojective
+    coordinate frame, which the rotation of the pixels assumes.
+    """
+    if not isinstance(smap.coordinate_frame, Helioprojective):
+        raise ValueError("Solar differential rotation can only be applied to maps in "
+                         "Helioprojective coordinates, not in {}.".format(
+                             type(smap.coordinate_frame).__name__))
+
+
+def _observer_values(smap):
+    """
+    Return the Heliographic Stonyhurst ``(lon, lat, radius)`` of the observer
+    of ``smap`` in degrees and metres.
+    """
+    observer = SkyCoord(smap.coordinate_frame.observer).transform_to(HeliographicStonyhurst)
+    return (observer.lon.to_value(u.deg), observer.lat.to_value(u.deg),
+            observer.radius.to_value(u.m))
+
+
+def _warp_sun_data(data, original, blocks, coordinates, executor=None):
+    """
+    Warp ``data`` with the scikit-image `transform.warp` function one block of
+    rows at a time, where ``coordinates(rows)`` returns the inverse
+    coordinates of the block ``rows``, and return the result in the intensity
+    range of ``original``.
+    """
+    # Only this function needs scikit image
+    from skimage import transform
+    from sunpy.image.util import to_norm, un_norm
+
+    image = to_norm(data)
+    out = np.empty(image.shape)
+
+    def warp_block(rows):
+        out[rows] = transform.warp(image, coordinates(rows), clip=False)
+
+    if executor is None:
+        list(map(warp_block, blocks))
+    else:
+        list(executor.map(warp_block, blocks))
+
+    # Clip the whole image, as transform.warp does
+    min_val, max_val = np.nanmin(image), np.nanmax(image)
+    if out.min() <= 0 <= out.max():
+        min_val, max_val = min(min_val, 0), max(max_val, 0)
+    np.clip(out, min_val, max_val, out=out)
+
+    # Recover the original intensity range.
+    return un_norm(out, original)
 
 
 @u.quantity_input(dt='time')
-def diffrot_map(smap, time=None, dt=None, pad=False, **diffrot_kwargs):
+def diffrot_map(smap, time=None, dt=None, pad=False, executor=None, block_size=None,
+                **diffrot_kwargs):
     """
     Function to apply solar differential rotation to a sunpy map.
 
@@ -247,6 +320,15 @@ def diffrot_map(smap, time=None, dt=None, pad=False, **diffrot_kwargs):
         Desired interval between the input map and returned map.
     pad : `bool`
         Whether to create a padded map for submaps to don't loose data
+    executor : `concurrent.futures.Executor`, optional
+        If given, the blocks of rows of the map are rotated concurrently
+        using this executor, for example a
+        `concurrent.futures.ThreadPoolExecutor` with the number of workers to
+        use.
+    block_size : `int`, optional
+        The number of rows of the map rotated at a time, which bounds the
+        memory used for the coordinate calculations. Defaults to blocks of
+        about a million pixels.
 
     Returns
     -------
@@ -254,12 +336,11 @@ def diffrot_map(smap, time=None, dt=None, pad=False, **diffrot_kwargs):
         A map with the result of applying solar differential rotation to the
         input map.
     """
-    # Only this function needs scikit image
-    from skimage import transform
-    from sunpy.image.util import to_norm, un_norm
     # Import map here for performance reasons.
     import sunpy.map
 
+    _check_helioprojective(smap)
+
     if (time is not None) and (dt is not None):
         raise ValueError('Only a time or an interval is accepted')
     elif not (time or dt):
@@ -305,14 +386,16 @@ def diffrot_map(smap, time=None, dt=None, pad=False, **diffrot_kwargs):
             smap_meta['crpix2'] += deltay
             smap = sunpy.map.Map(smap_data, smap_meta)
 
-    warp_args = {'smap': smap, 'dt': dt}
-    warp_args.update(diffrot_kwargs)
-    # Apply solar differential rotation as a scikit-image warp
-    out = transform.warp(to_norm(smap_data), inverse_map=_warp_sun_coordinates,
-                         map_args=warp_args)
+    ny, nx = smap_data.shape
+    if block_size is None:
+        block_size = max(2**20 // nx, 1)
+    blocks = [slice(start, min(start + block_size, ny)) for start in range(0, ny, block_size)]
+    observer = _observer_values(smap)
 
-    # Recover the original intensity range.
-    out = un_norm(out, smap.data)
+    # Apply solar differential rotation as a scikit-image warp of each block
+    out = _warp_sun_data(smap_data, smap.data, blocks,
+                         lambda rows: _warp_sun_block(smap, rows, dt, observer, **diffrot_kwargs),
+                         executor=executor)
 
     # Update the meta information with the new date and time, and reference pixel.
     out_meta = deepcopy(smap.meta)
@@ -326,3 +409,92 @@ def diffrot_map(smap, time=None, dt=None, pad=False, **diffrot_kwargs):
         out_meta['crval2'] = crval_rotated.Ty.value
 
     return sunpy.map.Map((out, out_meta))
+
+
+def diffrot_maps(maps, layer_index=0, executor=None, **diffrot_kwargs):
+    """
+    Apply solar differential rotation to a sequence of maps, so that every
+    map shows the Sun as it was at the time of one of the maps.
+
+    The maps are read and rotated one at a time as they are iterated over,
+    and the data of lazily loaded maps are not kept on the maps. The
+    heliographic coordinates of the pixels are calculated with
+    `~sunpy.map.GenericMap.all_coordinates` as float32, so they are cached and
+    only calculated once for maps with the same coordinate system and
+    observer. Only the rotation of the coordinates is calculated for each
+    map, in blocks of rows as in
+    `~sunpy.physics.differential_rotation.diffrot_map`.
+
+    Parameters
+    ----------
+    maps : iterable of `~sunpy.map.GenericMap` or `~sunpy.map.MapSequence`
+        The maps to rotate.
+    layer_index : `int`
+        The maps are rotated to the time of the map indexed by
+        ``layer_index``. If ``maps`` is an iterator, only the maps up to this
+        one are read ahead, and it can not be negative.
+    executor : `concurrent.futures.Executor`, optional
+        If given, blocks of rows of each map are rotated concurrently using
+        this executor, as in `~sunpy.physics.differential_rotation.diffrot_map`.
+    **diffrot_kwargs : keyword arguments
+        Keyword arguments are passed on as keyword arguments to
+        `~sunpy.physics.differential_rotation.diff_rot`.
+
+    Yields
+    ------
+    map : `~sunpy.map.GenericMap`
+        Each map with the result of applying solar differential rotation to
+        it. Unlike `~sunpy.physics.differential_rotation.diffrot_map` the
+        metadata of the maps is not changed, so the maps keep their
+        observation times and solar features stay on the same pixels of
+        every map.
+
+    Examples
+    --------
+    >>> import sunpy.map
+    >>> from sunpy.physics.differential_rotation import diffrot_maps
+    >>> maps = sunpy.map.Map('images/*.fits', sequence=True, lazy=True)   # doctest: +SKIP
+    >>> for derotated in diffrot_maps(maps):   # doctest: +SKIP
+    ...     derotated.save(...)   # doctest: +SKIP
+    """
+    # Import map here for performance reasons.
+    import sunpy.map
+
+    if hasattr(maps, '__getitem__'):
+        new_time = maps[layer_index].date
+    else:
+        if layer_index < 0:
+            raise ValueError('layer_index can not be negative for an iterator of maps.')
+        maps = iter(maps)
+        first = list(islice(maps, layer_index + 1))
+        if len(first) <= layer_index:
+            raise IndexError('layer_index is out of range of the maps.')
+        new_time = first[layer_index].date
+        maps = chain(first, maps)
+
+    for smap in maps:
+        _check_helioprojective(smap)
+        dt = (new_time - smap.date).to(u.s)
+        observer = _observer_values(smap)
+        # The heliographic coordinates of the pixels are cached and shared
+        # between maps with the same coordinate system and observer, so only
+        # the rotation is calculated for each map
+        lon, lat = smap.all_coordinates('heliographic_stonyhurst', dtype=np.float32)
+        lon, lat = lon.to_value(u.deg), lat.to_value(u.deg)
+
+        def coordinates(rows, wcs=smap.wcs, lon=lon, lat=lat, dt=dt, observer=observer):
+            return _rotate_sun_pixels(wcs, lon[rows], lat[rows], dt, observer, **diffrot_kwargs)
+
+        # Read the data without keeping them on lazily loaded maps
+        data = smap.data.read() if isinstance(smap.data, DeferredData) else smap.data
+        if smap.mask is not None:
+            smap_data = np.ma.array(data, mask=smap.mask)
+        else:
+            smap_data = data
+
+        ny, nx = smap_data.shape
+        block_size = max(2**20 // nx, 1)
+        blocks = [slice(start, min(start + block_size, ny)) for start in range(0, ny, block_size)]
+        out = _warp_sun_data(smap_data, data, blocks, coordinates, executor=executor)
+
+        yield sunpy.map.Map((out, deepcopy(smap.meta)))
@@ -1,4 +1,8 @@
 import os
+import glob
+from copy import deepcopy
+from concurrent.futures import ThreadPoolExecutor
+
 import pytest
 
 import numpy as np
@@ -7,11 +11,12 @@ from astropy.time import Time
 from astropy.coordinates import SkyCoord
 from astropy.coordinates import Longitude
 from astropy.tests.helper import assert_quantity_allclose
+from numpy.testing import assert_allclose
 from astropy.time import TimeDelta
 
 from sunpy.coordinates import frames
 from sunpy.coordinates.ephemeris import get_earth
-from sunpy.physics.differential_rotation import diff_rot, solar_rotate_coordinate, diffrot_map
+from sunpy.physics.differential_rotation import diff_rot, solar_rotate_coordinate, diffrot_map, diffrot_maps
 from sunpy.time import parse_time
 import sunpy.data.test
 import sunpy.map
@@ -148,6 +153,67 @@ def test_diffrot_map(aia171_test_map):
     assert (aia171_test_map.date - TimeDelta(5*u.day)) - aia_srot.date < TimeDelta(1*u.second)
 
 
+def test_diffrot_map_blocks(aia171_test_map):
+    # The result should not depend on how the map is split into blocks
+    aia_srot = diffrot_map(aia171_test_map, dt=-5 * u.day)
+    blocks_srot = diffrot_map(aia171_test_map, dt=-5 * u.day, block_size=7)
+    np.testing.assert_array_equal(blocks_srot.data, aia_srot.data)
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        threaded_srot = diffrot_map(aia171_test_map, dt=-5 * u.day, block_size=5,
+                                    executor=executor)
+    np.testing.assert_array_equal(threaded_srot.data, aia_srot.data)
+
+
+def test_diffrot_map_not_helioprojective():
+    meta = {'ctype1': 'HGLN-CAR', 'ctype2': 'HGLT-CAR', 'cunit1': 'deg', 'cunit2': 'deg',
+            'cdelt1': 1, 'cdelt2': 1, 'crpix1': 5, 'crpix2': 5, 'crval1': 0, 'crval2': 0,
+            'date-obs': '2011-02-15T00:00:00'}
+    carrington_map = sunpy.map.Map(np.zeros((10, 10)), meta)
+    with pytest.raises(ValueError):
+        diffrot_map(carrington_map, dt=1 * u.day)
+    with pytest.raises(ValueError):
+        list(diffrot_maps([carrington_map]))
+
+
+def test_diffrot_maps(aia171_test_map):
+    maps = []
+    for date in ['2011-02-15T00:00:00', '2011-02-16T00:00:00', '2011-02-16T00:00:00']:
+        meta = deepcopy(aia171_test_map.meta)
+        meta['date-obs'] = date
+        maps.append(sunpy.map.Map(aia171_test_map.data, meta))
+    derotated = list(diffrot_maps(maps))
+    assert len(derotated) == len(maps)
+    for amap, derotated_map in zip(maps, derotated):
+        assert derotated_map.date == amap.date
+        expected = diffrot_map(amap, time=maps[0].date)
+        # The heliographic coordinates of the pixels are only float32
+        assert_allclose(derotated_map.data, expected.data, rtol=1e-3,
+                        atol=1e-3 * np.nanmax(np.abs(expected.data)), equal_nan=True)
+
+    # The heliographic coordinates are shared between maps of different times
+    # with the same observer
+    coordinates = [amap.all_coordinates('heliographic_stonyhurst', dtype=np.float32)
+                   for amap in maps]
+    assert coordinates[0][0] is coordinates[1][0] is coordinates[2][0]
+
+    sequence = sunpy.map.Map(maps, sequence=True, derotate=True)
+    for amap, derotated_map in zip(sequence, derotated):
+        np.testing.assert_array_equal(amap.data, derotated_map.data)
+
+
+def test_diffrot_maps_lazy():
+    files = sorted(glob.glob(os.path.join(sunpy.data.test.rootdir, 'EIT', '*.fits')))[:3]
+    sequence = sunpy.map.Map(files, sequence=True, lazy=True)
+    expected = list(diffrot_maps([sunpy.map.Map(path) for path in files], layer_index=1))
+    # The data are not kept on the lazily loaded maps
+    derotated = list(diffrot_maps(iter(sequence.maps), layer_index=1))
+    assert not any(m.data.loaded for m in sequence)
+    for derotated_map, expected_map in zip(derotated, expected):
+        np.testing.assert_array_equal(derotated_map.data, expected_map.data)
+    with pytest.raises(ValueError):
+        next(diffrot_maps(iter(sequence.maps), layer_index=-1))
+
+
 def test_diffrot_submap(aia171_test_submap):
     # Test a submap without padding
     aia_srot = diffrot_map(aia171_test_submap, '2011-02-14T12:00:00')
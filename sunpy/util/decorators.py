@@ -11,7 +11,7 @@ import warnings
 
 from sunpy.util.exceptions import SunpyDeprecationWarning
 
-__all__ = ['deprecated']
+__all__ = ['deprecated', 'cached_property_based_on']
 
 
 def deprecated(since, message='', name='', alternative=''):
@@ -219,3 +219,41 @@ class add_common_docstring:
         if self.kwargs:
             func.__doc__ = func.__doc__.format(**self.kwargs)
         return func
+
+
+def cached_property_based_on(attr_name):
+    """
+    A decorator to cache the value of a property based on the value of a
+    different attribute of the same instance.
+
+    The cached value is discarded, and the property recomputed, whenever the
+    value of ``attr_name`` compares unequal to the value it had when the
+    property was last computed. If ``attr_name`` evaluates to `None` the
+    property is never cached.
+
+    Parameters
+    ----------
+    attr_name : `str`
+        The name of the attribute whose value the cache is keyed on. This will
+        be evaluated on every access of the decorated property, so it should
+        be much cheaper to compute than the property itself.
+    """
+    def outer(method):
+        cache_name = '_cached_' + method.__name__
+
+        @functools.wraps(method)
+        def inner(instance):
+            key = getattr(instance, attr_name)
+            if key is not None:
+                cached = instance.__dict__.get(cache_name)
+                if cached is not None and cached[0] == key:
+                    return cached[1]
+
+            value = method(instance)
+            if key is not None:
+                instance.__dict__[cache_name] = (key, value)
+            return value
+
+        return property(inner)
+
+    return outer
@@ -145,3 +145,39 @@ def test_expand_list_generator():
 
     lst = ['a', 'b', [], (['c', 'd']), tuple(), ['e']]
     assert list(util.expand_list_generator(lst)) == ['a', 'b', 'c', 'd', 'e']
+
+
+def test_lru_cache():
+    """
+    The least recently used item should be discarded when the cache is full.
+    """
+    cache = util.LRUCache(maxsize=2)
+    cache['a'] = 1
+    cache['b'] = 2
+    assert cache['a'] == 1
+    cache['c'] = 3
+    assert len(cache) == 2
+    assert 'b' not in cache
+    assert cache.get('b') is None
+    assert cache['a'] == 1
+    assert cache['c'] == 3
+    cache.clear()
+    assert len(cache) == 0
+
+
+def test_lru_cache_max_bytes():
+    """
+    Items should be discarded while the total size is larger than max_bytes.
+    """
+    cache = util.LRUCache(maxsize=None, max_bytes=100)
+    cache['a'] = np.zeros(40, dtype=np.uint8)
+    cache['b'] = np.zeros(40, dtype=np.uint8)
+    assert cache.nbytes == 80
+    cache['c'] = np.zeros(40, dtype=np.uint8)
+    assert 'a' not in cache
+    assert cache.nbytes == 80
+    # An item larger than the cache is kept until the next one is added
+    cache['d'] = np.zeros(200, dtype=np.uint8)
+    assert len(cache) == 1
+    assert 'd' in cache
+    assert cache.nbytes == 200
@@ -3,13 +3,15 @@ General utility functions.
 """
 
 import os
+import threading
 from itertools import count
+from collections import OrderedDict
 
 import numpy as np
 
 __all__ = ['to_signed', 'unique', 'print_table', 'replacement_filename',
            'merge', 'common_base', 'minimal_pairs', 'expand_list',
-           'expand_list_generator']
+           'expand_list_generator', 'LRUCache']
 
 
 def to_signed(dtype):
@@ -212,3 +214,73 @@ def expand_list_generator(inp):
                 yield nested_item
         else:
             yield item
+
+
+class LRUCache(object):
+    """
+    A dictionary-like cache which holds at most ``maxsize`` items.
+
+    When the cache is full the least recently used item is discarded to make
+    room for a new one. Access to the cache is thread safe.
+
+    Parameters
+    ----------
+    maxsize : `int` or `None`
+        The maximum number of items held in the cache. If `None` the number
+        of items is not limited.
+    max_bytes : `int`, optional
+        If given, least recently used items are also discarded while the total
+        size of the items is larger than this, although the most recently
+        added item is always kept.
+    sizeof : function, optional
+        A function returning the size in bytes of an item, used with
+        ``max_bytes``. Defaults to the ``nbytes`` attribute of the item, for
+        example of a `numpy.ndarray`.
+    """
+    def __init__(self, maxsize=128, max_bytes=None, sizeof=None):
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self._sizeof = sizeof or (lambda value: getattr(value, 'nbytes', 0))
+        self._items = OrderedDict()
+        self._sizes = {}
+        self._lock = threading.RLock()
+        self.nbytes = 0
+
+    def __len__(self):
+        return len(self._items)
+
+    def __contains__(self, key):
+        return key in self._items
+
+    def __getitem__(self, key):
+        with self._lock:
+            value = self._items[key]
+            self._items.move_to_end(key)
+            return value
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __setitem__(self, key, value):
+        size = self._sizeof(value) if self.max_bytes is not None else 0
+        with self._lock:
+            self.nbytes += size - self._sizes.get(key, 0)
+            self._items[key] = value
+            self._sizes[key] = size
+            self._items.move_to_end(key)
+            while len(self._items) > 1 and self._full():
+                old_key, _ = self._items.popitem(last=False)
+                self.nbytes -= self._sizes.pop(old_key)
+
+    def _full(self):
+        return ((self.maxsize is not None and len(self._items) > self.maxsize) or
+                (self.max_bytes is not None and self.nbytes > self.max_bytes))
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self._sizes.clear()
+            self.nbytes = 0
@@ -2,6 +2,7 @@ import numpy as np
 import matplotlib as mpl
 import astropy.wcs
 
+from sunpy.visualization.tiles import TiledImage
 from . base import ArrayAnimator
 
 __all__ = ['ImageAnimator', 'ImageAnimatorWCS']
@@ -55,6 +56,14 @@ class ImageAnimator(ArrayAnimator):
     button_func: list
         List of functions to map to the buttons
 
+    tiled: bool
+        If True, only the part of each image visible in the axes is drawn,
+        taking every ``2**n``-th pixel to give about the resolution of the
+        screen, see `~sunpy.visualization.tiles.TiledImage`. The tiles of the
+        images next to the current one along the active slider are
+        calculated in a background thread. This is not used when the image
+        axes are given as arrays of values.
+
     Extra keywords are passed to imshow.
 
     """
@@ -70,6 +79,7 @@ class ImageAnimator(ArrayAnimator):
         # pixel values or min max pair. This will determine the type of image produced
         # and hence how to plot and update it.
         self._non_regular_plot_axis = False
+        self.tiled = kwargs.pop('tiled', False)
         # Run init for parent class
         super(ImageAnimator, self).__init__(data, image_axes=image_axes,
                                             axis_ranges=axis_ranges, **kwargs)
@@ -114,6 +124,10 @@ class ImageAnimator(ArrayAnimator):
                     y_ranges[-1] + (y_ranges[-1] - y_ranges[-2]) / 2.)
             ax.set_xlim(xlim)
             ax.set_ylim(ylim)
+        elif self.tiled:
+            extent = imshow_args.pop('extent')
+            im = TiledImage(ax, self.data[self.frame_index].shape, self._get_level,
+                            key=self._frame_key(), extent=extent, **imshow_args).image
         else:
             # Else produce a more basic plot with regular axes.
             im = ax.imshow(self.data[self.frame_index], **imshow_args)
@@ -122,6 +136,23 @@ class ImageAnimator(ArrayAnimator):
 
         return im
 
+    def _frame_key(self):
+        """
+        The indices of the slider axes of the current frame.
+        """
+        return tuple(self.frame_slice[i] for i in self.slider_axes)
+
+    def _get_level(self, key, level):
+        """
+        Every ``2**level``-th pixel of the frame with slider indices ``key``,
+        for tiled plotting.
+        """
+        frame_slice = list(self.frame_slice)
+        for i, index in zip(self.slider_axes, key):
+            frame_slice[i] = index
+        step = 2 ** level
+        return self.data[tuple(frame_slice)][::step, ::step]
+
     def update_plot(self, val, im, slider):
         """Updates plot based on slider/array dimension being iterated."""
         val = int(val)
@@ -136,6 +167,18 @@ class ImageAnimator(ArrayAnimator):
                     data = self.data[self.frame_index]
                 im.set_data(self.axis_ranges[self.image_axes[0]],
                             self.axis_ranges[self.image_axes[1]], data)
+            elif self.tiled:
+                key = self._frame_key()
+                im._tiled_image.set_frame(key)
+                # Prepare the neighbouring frames along this slider
+                neighbours = []
+                for step in (1, -1):
+                    index = ind + step
+                    if 0 <= index < self.data.shape[ax_ind]:
+                        neighbour = list(key)
+                        neighbour[slider.slider_ind] = index
+                        neighbours.append(tuple(neighbour))
+                im._tiled_image.prefetch(neighbours)
             else:
                 im.set_array(self.data[self.frame_index])
             slider.cval = val
@@ -1,12 +1,34 @@
 # -*- coding: utf-8 -*-
 
+import threading
 from copy import deepcopy
+from concurrent.futures import ThreadPoolExecutor
 
+import numpy as np
+
+import astropy.units as u
+
+from sunpy.io.file_tools import DeferredData
+from sunpy.util import LRUCache
 from sunpy.visualization import animator as imageanimator
 from sunpy.visualization.wcsaxes_compat import _FORCE_NO_WCSAXES
 from sunpy.visualization import wcsaxes_compat, axis_labels_from_ctype
 
-__all__ = ['MapSequenceAnimator']
+__all__ = ['MapSequenceAnimator', 'MapFrames']
+
+# The background thread shared by all MapFrames to prefetch maps, which is
+# only started when it is first needed. It is separate from the thread which
+# prefetches tiles, as the tiles of a sequence wait for its maps.
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _prefetch_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=1)
+        return _executor
 
 
 class MapSequenceAnimator(imageanimator.BaseFuncAnimator):
@@ -21,10 +43,17 @@ class MapSequenceAnimator(imageanimator.BaseFuncAnimator):
     - 'bottom': change the active slider down one
     - 'p': play/pause active slider
 
+    The maps are read through a cache of the maps with their data in memory,
+    so the maps of a sequence created with ``lazy=True`` (see
+    `sunpy.map.Map`), or a list of files, are only read when they are shown.
+    While the animation plays, the maps after the current one are read in a
+    background thread.
+
     Parameters
     ----------
-    mapsequence : `sunpy.map.MapSequence`
-        A MapSequence
+    mapsequence : `sunpy.map.MapSequence` or `list`
+        A MapSequence, or a list of files or maps which are read into a
+        MapSequence with ``lazy=True``.
 
     annotate : `bool`
         Annotate the figure with scale and titles
@@ -45,6 +74,25 @@ class MapSequenceAnimator(imageanimator.BaseFuncAnimator):
         Any objects returned from this function will have their `remove()` method
         called at the start of the next frame to clear them from the plot.
 
+    tiled : `bool`
+        If True, only the part of each map visible in the axes is drawn, at
+        about the resolution of the screen, see
+        `~sunpy.visualization.tiles.TiledImage`. The tiles of the maps next
+        to the current one are calculated in a background thread.
+
+    resample : `list`
+        Draw the maps at a lower resolution to increase the speed of the
+        animation, as a fraction of the size of the maps, i.e. [0.25, 0.25]
+        to plot at 1/4 resolution. The maps are resampled as they are read.
+
+    cache_bytes : `int`
+        The maximum size in bytes of the data of the maps kept in memory.
+        Defaults to 1 GiB.
+
+    prefetch : `int`
+        The number of maps after the current one to read in the background.
+        Defaults to 4.
+
     Notes
     -----
     Extra keywords are passed to `mapsequence[0].plot()` i.e. the `plot()` routine of
@@ -52,9 +100,17 @@ class MapSequenceAnimator(imageanimator.BaseFuncAnimator):
     """
 
     def __init__(self, mapsequence, annotate=True, **kwargs):
+        # Import here to avoid a circular import
+        import sunpy.map
+        if not isinstance(mapsequence, sunpy.map.MapSequence):
+            mapsequence = sunpy.map.Map(list(mapsequence), sequence=True, lazy=True)
 
         self.mapsequence = mapsequence
         self.annotate = annotate
+        self.tiled = kwargs.pop('tiled', False)
+        self.prefetch = kwargs.pop('prefetch', 4)
+        frames = MapFrames(mapsequence.maps, resample=kwargs.pop('resample', None),
+                           max_bytes=kwargs.pop('cache_bytes', 2**30))
         self.user_plot_function = kwargs.pop('plot_function',
                                              lambda fig, ax, smap: [])
         # List of object to remove at the start of each plot step
@@ -63,7 +119,7 @@ class MapSequenceAnimator(imageanimator.BaseFuncAnimator):
         slider_ranges = [[0, len(mapsequence.maps)]]
 
         imageanimator.BaseFuncAnimator.__init__(
-            self, mapsequence.maps, slider_functions, slider_ranges, **kwargs)
+            self, frames, slider_functions, slider_ranges, **kwargs)
 
         if annotate:
             self._annotate_plot(0)
@@ -75,29 +131,40 @@ class MapSequenceAnimator(imageanimator.BaseFuncAnimator):
             self.remove_obj.pop(0).remove()
 
         i = int(val)
-        im.set_array(self.data[i].data)
-        im.set_cmap(self.mapsequence[i].plot_settings['cmap'])
+        smap = self.data[i]
+        # Read the maps which are played next
+        self.data.prefetch(self.data.following(i, self.prefetch))
+        if self.tiled:
+            tiles = im._tiled_image
+            tiles.set_frame(i)
+            tiles.prefetch([j for j in (i + 1, i - 1) if 0 <= j < len(self.data)])
+            # Scale the colours on the whole map at the resolution of the screen
+            scale_data = smap.pyramid_level(tiles.overview_level).data
+        else:
+            im.set_array(smap.data)
+            scale_data = smap.data
+        im.set_cmap(smap.plot_settings['cmap'])
 
-        norm = deepcopy(self.mapsequence[i].plot_settings['norm'])
+        norm = deepcopy(smap.plot_settings['norm'])
         # The following explicit call is for bugged versions of Astropy's ImageNormalize
-        norm.autoscale_None(self.data[i].data)
+        norm.autoscale_None(scale_data)
         im.set_norm(norm)
 
         if wcsaxes_compat.is_wcsaxes(im.axes):
-            im.axes.reset_wcs(self.mapsequence[i].wcs)
+            im.axes.reset_wcs(smap.wcs)
             wcsaxes_compat.default_wcs_ticks(im.axes,
-                                             self.mapsequence[i].spatial_units,
-                                             self.mapsequence[i].coordinate_system)
+                                             smap.spatial_units,
+                                             smap.coordinate_system)
 
         # Having this line in means the plot will resize for non-homogenous
         # maps. However it also means that if you zoom in on the plot bad
         # things happen.
-        # im.set_extent(self.mapsequence[i].xrange + self.mapsequence[i].yrange)
+        # im.set_extent(smap.xrange + smap.yrange)
         if self.annotate:
             self._annotate_plot(i)
 
         self.remove_obj += list(
-            self.user_plot_function(self.fig, self.axes, self.mapsequence[i]))
+            self.user_plot_function(self.fig, self.axes, smap))
 
     def _annotate_plot(self, ind):
         """
@@ -118,13 +185,112 @@ class MapSequenceAnimator(imageanimator.BaseFuncAnimator):
         Create an axes which is wcsaxes if we have that...
         """
         if not _FORCE_NO_WCSAXES:
-            return self.fig.add_subplot(111, projection=self.mapsequence[0].wcs)
+            return self.fig.add_subplot(111, projection=self.data[0].wcs)
         else:
             return self.fig.add_subplot(111)
 
     def plot_start_image(self, ax):
-        im = self.mapsequence[0].plot(
-            annotate=self.annotate, axes=ax, **self.imshow_kwargs)
+        im = self.data[0].plot(
+            annotate=self.annotate, axes=ax, tiled=self.tiled, **self.imshow_kwargs)
+        if self.tiled:
+            im._tiled_image.get_level = self._get_level
+        self.data.prefetch(self.data.following(0, self.prefetch))
         self.remove_obj += list(
-            self.user_plot_function(self.fig, self.axes, self.mapsequence[0]))
+            self.user_plot_function(self.fig, self.axes, self.data[0]))
         return im
+
+    def _get_level(self, i, level):
+        """
+        The data of the map ``i`` downsampled by ``2**level``, for tiled
+        plotting.
+        """
+        return self.data[i].pyramid_level(level)._plot_data
+
+
+class MapFrames(object):
+    """
+    The maps of a sequence with their data in memory, for plotting.
+
+    The data of maps which are read lazily (see the ``lazy`` option of
+    `sunpy.map.Map`) are read from their files when a map is first
+    requested, without keeping the data on the original maps, and the maps
+    are resampled for plotting if ``resample`` is given. The resulting maps
+    are kept in a least recently used cache which holds at most
+    ``max_bytes`` of data, and the maps which will be needed next can be
+    read in a background thread with `prefetch`.
+
+    Parameters
+    ----------
+    maps : `list`
+        The maps of the sequence.
+    resample : `list`, optional
+        Resample the maps to this fraction of their size in the x and y
+        directions. Fractions of 1/2, 1/4, 1/8 and so on are taken from the
+        image pyramids of the maps (see `~sunpy.map.GenericMap.pyramid_level`).
+    max_bytes : `int`, optional
+        The maximum size in bytes of the data kept in the cache. Defaults to
+        1 GiB.
+    """
+    def __init__(self, maps, resample=None, max_bytes=2**30):
+        self.maps = maps
+        self.resample = resample
+        self._cache = LRUCache(maxsize=None, max_bytes=max_bytes,
+                               sizeof=lambda smap: smap.data.nbytes)
+        self._pending = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.maps)
+
+    def __getitem__(self, i):
+        smap = self._cache.get(i)
+        if smap is not None:
+            return smap
+        with self._lock:
+            future = self._pending.get(i)
+        if future is not None:
+            return future.result()
+        return self._read(i)
+
+    def following(self, i, n):
+        """
+        The indices of the ``n`` maps after map ``i``, continuing from the
+        start of the sequence after the end as an animation does.
+        """
+        return [(i + k) % len(self) for k in range(1, min(n, len(self) - 1) + 1)]
+
+    def prefetch(self, indices):
+        """
+        Read the maps ``indices`` into the cache in a background thread shared
+        by all `MapFrames`, in the order given.
+        """
+        executor = _prefetch_executor()
+        with self._lock:
+            for i in indices:
+                if i not in self._cache and i not in self._pending:
+                    self._pending[i] = executor.submit(self._read, i)
+
+    def _read(self, i):
+        try:
+            smap = self.maps[i]
+            if isinstance(smap.data, DeferredData) and not smap.data.loaded:
+                smap = smap._new_instance(smap.data.read(), smap.meta,
+                                          plot_settings=smap.plot_settings)
+            if self.resample:
+                smap = _resample_for_plot(smap, self.resample)
+            self._cache[i] = smap
+        finally:
+            with self._lock:
+                self._pending.pop(i, None)
+        return smap
+
+
+def _resample_for_plot(smap, resample):
+    """
+    The map ``smap`` resampled by the fractions ``resample`` for plotting.
+    """
+    if resample[0] == resample[1] and 0 < resample[0] <= 1:
+        level = -np.log2(resample[0])
+        if level == int(level):
+            return smap.pyramid_level(int(level))
+    return smap.resample(u.Quantity(smap.dimensions) * np.array(resample))
@@ -0,0 +1,35 @@
+# -*- coding: utf-8 -*-
+
+import numpy as np
+import matplotlib.pyplot as plt
+
+from sunpy.visualization.animator import ImageAnimator
+from sunpy.visualization.tiles import _prefetch_executor
+
+
+def test_image_animator_tiled():
+    data = np.random.random((3, 2, 512, 512))
+    fig = plt.figure(figsize=(3, 3), dpi=100)
+    animator = ImageAnimator(data, fig=fig, tiled=True)
+    tiles = animator.im._tiled_image
+    step = 2 ** tiles.overview_level
+    assert step > 1
+    np.testing.assert_array_equal(animator.im.get_array(), data[0, 0, ::step, ::step])
+
+    # Moving a slider shows the frame at the new slider indices
+    slider = animator.sliders[0]._slider
+    animator.update_plot(1, animator.im, slider)
+    np.testing.assert_array_equal(animator.im.get_array(), data[1, 0, ::step, ::step])
+    slider = animator.sliders[1]._slider
+    animator.update_plot(1, animator.im, slider)
+    np.testing.assert_array_equal(animator.im.get_array(), data[1, 1, ::step, ::step])
+
+    # The neighbouring frames along the slider which moved are prefetched
+    _prefetch_executor().submit(lambda: None).result()
+    assert ((1, 0), tiles._view_state()) in tiles._tiles
+
+    # Zooming in shows the visible part at full resolution
+    animator.axes.set_xlim(99.5, 149.5)
+    animator.axes.set_ylim(299.5, 349.5)
+    np.testing.assert_array_equal(animator.im.get_array(), data[1, 1, 300:350, 100:150])
+    plt.close(fig)
@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+
+import os
+import glob
+
+import numpy as np
+import matplotlib.pyplot as plt
+import pytest
+
+import sunpy.map
+import sunpy.data.test
+from sunpy.visualization.animator import MapSequenceAnimator, MapFrames
+
+
+@pytest.fixture
+def eit_files():
+    return sorted(glob.glob(os.path.join(sunpy.data.test.rootdir, "EIT", "*")))
+
+
+def test_map_frames(eit_files):
+    sequence = sunpy.map.Map(eit_files, sequence=True, lazy=True)
+    nbytes = sequence[0].data.size * sequence[0].data.dtype.itemsize
+    frames = MapFrames(sequence.maps, max_bytes=2 * nbytes)
+    assert len(frames) == len(eit_files)
+    assert frames.following(len(frames) - 1, 2) == [0, 1]
+
+    np.testing.assert_equal(frames[2].data, sunpy.map.Map(eit_files[2]).data)
+    # The data are not kept on the maps of the sequence
+    assert not any(m.data.loaded for m in sequence)
+    assert frames[2] is frames[2]
+
+    frames.prefetch([0, 1])
+    frames[0]
+    frames[1]
+    # Only two maps fit in the cache
+    assert 2 not in frames._cache
+    assert frames._cache.nbytes == 2 * nbytes
+
+
+def test_map_frames_resample(eit_files):
+    sequence = sunpy.map.Map(eit_files[:2], sequence=True, lazy=True)
+    frames = MapFrames(sequence.maps, resample=[0.5, 0.5])
+    expected = sunpy.map.Map(eit_files[1]).pyramid_level(1)
+    np.testing.assert_allclose(frames[1].data, expected.data)
+
+
+def test_animator_files(eit_files):
+    anim = MapSequenceAnimator(eit_files, fig=plt.figure(), prefetch=2)
+    assert isinstance(anim.mapsequence, sunpy.map.MapSequence)
+    anim.updatefig(3, anim.im, anim.sliders[0]._slider)
+    np.testing.assert_equal(anim.im.get_array(), anim.mapsequence[3].data)
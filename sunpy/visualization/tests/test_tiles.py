@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+
+import numpy as np
+import matplotlib.pyplot as plt
+
+from sunpy.visualization.tiles import TiledImage, _prefetch_executor
+
+
+def strided_level(frames):
+    def get_level(key, level):
+        step = 2 ** level
+        return frames[key][::step, ::step]
+    return get_level
+
+
+def test_tiled_image():
+    frames = np.random.random((3, 1024, 1024))
+    fig = plt.figure(figsize=(2, 2), dpi=100)
+    ax = fig.add_axes([0, 0, 1, 1])
+    tiles = TiledImage(ax, frames.shape[1:], strided_level(frames), interpolation='nearest')
+
+    # The whole image is shown at about the resolution of the axes
+    assert tiles.overview_level == 2
+    np.testing.assert_array_equal(tiles.image.get_array(), frames[0, ::4, ::4])
+    assert ax.get_xlim() == (-0.5, 1023.5)
+    assert ax.get_ylim() == (-0.5, 1023.5)
+
+    # Zooming in shows the visible part at full resolution
+    ax.set_xlim(99.5, 199.5)
+    ax.set_ylim(299.5, 399.5)
+    np.testing.assert_array_equal(tiles.image.get_array(), frames[0, 300:400, 100:200])
+    np.testing.assert_allclose(tiles.image.get_extent(), [99.5, 199.5, 299.5, 399.5])
+
+    # Other frames are shown and prefetched for the same view
+    tiles.set_frame(1)
+    np.testing.assert_array_equal(tiles.image.get_array(), frames[1, 300:400, 100:200])
+    tiles.prefetch([2])
+    # The shared prefetch thread runs its work in order
+    executor = _prefetch_executor()
+    executor.submit(lambda: None).result()
+    assert (2, tiles._view_state()) in tiles._tiles
+    # Other tiled images share the thread
+    other = TiledImage(ax, frames.shape[1:], strided_level(frames))
+    other.prefetch([0])
+    assert _prefetch_executor() is executor
+    plt.close(fig)
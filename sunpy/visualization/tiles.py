@@ -0,0 +1,210 @@
+# -*- coding: utf-8 -*-
+"""
+Rendering of large images by drawing only the part of the image which is
+visible in the axes, at about the resolution of the screen.
+"""
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+__all__ = ['TiledImage']
+
+# The background thread shared by all tiled images to prefetch tiles, which
+# is only started when it is first needed.
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _prefetch_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=1)
+        return _executor
+
+
+class TiledImage(object):
+    """
+    Show an image, or frames of images, by passing matplotlib only the tile
+    of the image which is visible in the axes, downsampled to about the
+    resolution of the axes on the screen.
+
+    The image is read through a function ``get_level(key, level)`` which
+    returns the frame ``key`` downsampled by a factor of ``2**level`` in both
+    directions, for example from the image pyramid of a map
+    (`~sunpy.map.GenericMap.pyramid_level`) or by taking every ``2**level``
+    pixel of an array. The tile is chosen from the limits of the axes and
+    their size on the screen, which includes the figure DPI, and is updated
+    when the axes are zoomed, panned or resized. The tiles of other frames,
+    such as the neighbours of the frame shown by an animator, can be
+    calculated in a background thread with `prefetch`.
+
+    Parameters
+    ----------
+    axes : `matplotlib.axes.Axes`
+        The axes to show the image on.
+    shape : `tuple`
+        The (ny, nx) shape of the frames at full resolution.
+    get_level : function
+        A function ``get_level(key, level)`` returning a 2D array, which can
+        be masked, of the frame ``key`` downsampled by ``2**level``. Pixel
+        ``i`` of the level covers pixels ``i * 2**level`` to
+        ``(i + 1) * 2**level - 1`` of the full resolution frame.
+    key : hashable, optional
+        The frame to show, passed to ``get_level``. Default 0.
+    extent : `tuple`, optional
+        The (left, right, bottom, top) edges of the frames in data
+        coordinates, as for :func:`matplotlib.pyplot.imshow`. Default is the
+        pixel coordinates of the frames.
+    max_level : `int`, optional
+        The coarsest level used. Defaults to the level at which the shorter
+        side of the frames is one pixel long.
+
+    Extra keywords are passed to :func:`matplotlib.pyplot.imshow`. The
+    origin of the image must be 'lower'.
+
+    Attributes
+    ----------
+    image : `matplotlib.image.AxesImage`
+        The image showing the tiles.
+    """
+    # The number of tiles kept for reuse
+    _cache_size = 16
+
+    def __init__(self, axes, shape, get_level, key=0, extent=None, max_level=None,
+                 **imshow_kwargs):
+        if imshow_kwargs.setdefault('origin', 'lower') != 'lower':
+            raise ValueError("Tiled images must have origin='lower'.")
+        self.axes = axes
+        self.shape = tuple(shape)
+        self.get_level = get_level
+        self.key = key
+        if extent is None:
+            extent = (-0.5, self.shape[1] - 0.5, -0.5, self.shape[0] - 0.5)
+        self.extent = tuple(extent)
+        if max_level is None:
+            max_level = max(int(np.log2(min(self.shape))), 0)
+        self.max_level = max_level
+        self._tiles = OrderedDict()
+        self._lock = threading.Lock()
+
+        # Show the whole image, and stop the axes being rescaled to the
+        # extent of each tile.
+        axes.set_xlim(self.extent[:2])
+        axes.set_ylim(self.extent[2:])
+        tile, tile_extent = self._tile(key, self._view_state())
+        self.image = axes.imshow(tile, extent=tile_extent, **imshow_kwargs)
+        axes.set_xlim(self.extent[:2])
+        axes.set_ylim(self.extent[2:])
+        axes.set_autoscale_on(False)
+        # The image keeps this alive, as matplotlib only keeps weak
+        # references to the callbacks.
+        self.image._tiled_image = self
+
+        axes.callbacks.connect('xlim_changed', self._view_changed)
+        axes.callbacks.connect('ylim_changed', self._view_changed)
+        axes.figure.canvas.mpl_connect('resize_event', self._view_changed)
+
+    @property
+    def overview_level(self):
+        """
+        The level at which the whole frame is shown on the axes at the
+        resolution of the screen.
+        """
+        return self._level(self.shape[1], self.shape[0])
+
+    def set_frame(self, key):
+        """
+        Show the frame ``key``.
+        """
+        self.key = key
+        self.refresh()
+
+    def refresh(self):
+        """
+        Update the tile for the current limits and size of the axes.
+        """
+        tile, tile_extent = self._tile(self.key, self._view_state())
+        # Nothing of the image is visible
+        if tile is None:
+            return
+        self.image.set_data(tile)
+        self.image.set_extent(tile_extent)
+
+    def prefetch(self, keys):
+        """
+        Calculate the tiles of the frames ``keys`` for the current view in a
+        background thread shared by all tiled images, so that they are ready
+        to be shown.
+        """
+        executor = _prefetch_executor()
+        state = self._view_state()
+        for key in keys:
+            executor.submit(self._tile, key, state)
+
+    def _view_changed(self, *args):
+        self.refresh()
+        self.axes.figure.canvas.draw_idle()
+
+    def _level(self, width, height):
+        """
+        The coarsest level with at least one pixel per screen pixel of the
+        axes, for a view ``width`` by ``height`` full resolution pixels.
+        """
+        bbox = self.axes.bbox
+        ratio = min(width / max(bbox.width, 1), height / max(bbox.height, 1))
+        if ratio < 2:
+            return 0
+        return min(int(np.log2(ratio)), self.max_level)
+
+    def _view_state(self):
+        """
+        The level and the (x0, x1, y0, y1) window of the view in pixels of
+        the level.
+        """
+        ny, nx = self.shape
+        left, right, bottom, top = self.extent
+        x = np.sort((np.array(self.axes.get_xlim()) - left) / (right - left) * nx)
+        y = np.sort((np.array(self.axes.get_ylim()) - bottom) / (top - bottom) * ny)
+
+        level = self._level(x[1] - x[0], y[1] - y[0])
+        step = 2 ** level
+        x0, x1 = np.clip([np.floor(x[0]), np.ceil(x[1])], 0, nx).astype(int)
+        y0, y1 = np.clip([np.floor(y[0]), np.ceil(y[1])], 0, ny).astype(int)
+        return level, x0 // step, -(-x1 // step), y0 // step, -(-y1 // step)
+
+    def _tile(self, key, state):
+        """
+        Return the tile of the frame ``key`` for the view ``state`` and its
+        extent, or `None` if the view is outside the image.
+        """
+        with self._lock:
+            if (key, state) in self._tiles:
+                self._tiles.move_to_end((key, state))
+                return self._tiles[(key, state)]
+
+        level, x0, x1, y0, y1 = state
+        data = self.get_level(key, level)
+        # Copy the tile, so any lazily loaded data is read here
+        if isinstance(data, np.ma.MaskedArray):
+            tile = data[y0:y1, x0:x1].copy()
+        else:
+            tile = np.array(data[y0:y1, x0:x1])
+        if tile.size == 0:
+            return None, None
+
+        # Convert the edges of the tile to data coordinates
+        step = 2 ** level
+        left, right, bottom, top = self.extent
+        xscale = (right - left) / self.shape[1]
+        yscale = (top - bottom) / self.shape[0]
+        tile_extent = (left + x0 * step * xscale, left + (x0 + tile.shape[1]) * step * xscale,
+                       bottom + y0 * step * yscale, bottom + (y0 + tile.shape[0]) * step * yscale)
+
+        with self._lock:
+            self._tiles[(key, state)] = tile, tile_extent
+            while len(self._tiles) > self._cache_size:
+                self._tiles.popitem(last=False)
+        return tile, tile_extent
@@ -0,0 +1,49 @@
+"""
+Compare the run time of the correlation backends of
+`sunpy.image.coalignment.calculate_match_template_shift`.
+
+A sequence of shifted copies of a smooth random image is coaligned with the
+scikit-image and the FFT backends, and the time taken and the largest
+difference between the shifts they find are printed. Run it with
+
+    python tools/benchmark_coalignment.py [number of layers] [layer size]
+"""
+import sys
+import time
+
+import numpy as np
+from scipy.ndimage import gaussian_filter, shift
+
+import sunpy.map
+from sunpy.image.coalignment import calculate_match_template_shift
+
+
+def make_sequence(nt, size):
+    rng = np.random.RandomState(0)
+    image = gaussian_filter(rng.rand(size + 40, size + 40), 3)
+    header = {'cdelt1': 0.6, 'cdelt2': 0.6, 'ctype1': 'HPLN-TAN', 'ctype2': 'HPLT-TAN',
+              'cunit1': 'arcsec', 'cunit2': 'arcsec', 'date-obs': '2011-01-01T00:00:00'}
+    maps = []
+    for offset in rng.uniform(-10, 10, (nt, 2)):
+        data = shift(image, offset, order=1)[20:-20, 20:-20]
+        maps.append(sunpy.map.Map(data, header))
+    return sunpy.map.Map(maps, sequence=True)
+
+
+def main(nt=200, size=256):
+    mc = make_sequence(nt, size)
+    print('{} layers of {} x {} pixels'.format(nt, size, size))
+
+    results = {}
+    for backend in ['skimage', 'fft']:
+        start = time.perf_counter()
+        results[backend] = calculate_match_template_shift(mc, backend=backend)
+        print('{:>8}: {:.2f} s'.format(backend, time.perf_counter() - start))
+
+    difference = max(np.max(np.abs(results['fft'][axis] - results['skimage'][axis]))
+                     for axis in 'xy')
+    print('Largest difference between the shifts: {}'.format(difference))
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
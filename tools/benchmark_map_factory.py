@@ -0,0 +1,73 @@
+"""
+Compare the run time of reading many files with `sunpy.map.Map` one at a
+time and with an executor.
+
+The EIT test files in ``sunpy/data/test/EIT`` are copied a number of times
+into a temporary directory, both as they are and as Rice tile compressed
+files, and each set is read without an executor and with a
+`concurrent.futures.ThreadPoolExecutor`. The time taken for each is
+printed. Run it with
+
+    python tools/benchmark_map_factory.py [number of copies] [number of workers]
+"""
+import os
+import sys
+import glob
+import time
+import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from astropy.io import fits
+
+import sunpy.map
+import sunpy.data.test
+
+
+def make_files(directory, copies):
+    """
+    Copy the EIT test files ``copies`` times into ``directory``, and write a
+    Rice compressed copy of each, returning the two lists of paths.
+    """
+    originals = sorted(glob.glob(os.path.join(sunpy.data.test.rootdir, 'EIT', '*.fits')))
+    plain = []
+    compressed = []
+    for i in range(copies):
+        for path in originals:
+            name = '{}_{:04d}'.format(os.path.splitext(os.path.basename(path))[0], i)
+            plain.append(os.path.join(directory, name + '.fits'))
+            shutil.copy(path, plain[-1])
+
+            compressed.append(os.path.join(directory, name + '_rice.fits'))
+            with fits.open(path) as hdulist:
+                hdu = hdulist[0]
+                fits.HDUList([fits.PrimaryHDU(),
+                              fits.CompImageHDU(np.round(hdu.data).astype(np.int32),
+                                                hdu.header)]).writeto(compressed[-1])
+    return plain, compressed
+
+
+def timed(function):
+    start = time.perf_counter()
+    function()
+    return time.perf_counter() - start
+
+
+def main(copies=20, workers=4):
+    directory = tempfile.mkdtemp()
+    try:
+        plain, compressed = make_files(directory, copies)
+        print('{} files, {} workers'.format(len(plain), workers))
+        for name, files in [('plain', plain), ('rice', compressed)]:
+            serial = timed(lambda: sunpy.map.Map(files))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                threaded = timed(lambda: sunpy.map.Map(files, executor=executor))
+            print('{:>6}: serial {:.2f} s, threaded {:.2f} s, speed-up {:.2f}'.format(
+                name, serial, threaded, serial / threaded))
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,79 @@
+"""
+Compare the run time of a submap and plot workflow with the `~astropy.wcs.WCS`
+of `sunpy.map.GenericMap` cached on the metadata and built on every access.
+
+The AIA test map in ``sunpy/data/test`` is repeatedly cut to a submap, which
+is then plotted with its limb drawn, with and without the caching of
+``GenericMap.wcs`` and ``GenericMap.coordinate_frame``. The time taken and
+the number of times a WCS was built are printed. Run it with
+
+    python tools/benchmark_wcs.py [number of repeats]
+"""
+import os
+import sys
+import time
+
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+
+import astropy.units as u
+from astropy.coordinates import SkyCoord
+
+import sunpy.map
+import sunpy.data.test
+from sunpy.util.decorators import cached_property_based_on
+
+
+def submap_plot(amap, repeats):
+    for _ in range(repeats):
+        bottom_left = SkyCoord(-300*u.arcsec, -300*u.arcsec, frame=amap.coordinate_frame)
+        top_right = SkyCoord(300*u.arcsec, 300*u.arcsec, frame=amap.coordinate_frame)
+        submap = amap.submap(bottom_left, top_right)
+        submap.pixel_to_world(*submap.dimensions)
+        fig = plt.figure()
+        ax = fig.add_subplot(111, projection=submap)
+        submap.plot(axes=ax)
+        submap.draw_limb(axes=ax)
+        fig.canvas.draw()
+        plt.close(fig)
+
+
+def run(repeats, cached):
+    """
+    Return the time taken and the number of WCS built by ``repeats`` runs of
+    `submap_plot`, with the WCS cached or not.
+    """
+    cached_wcs = sunpy.map.GenericMap.wcs
+    cached_frame = sunpy.map.GenericMap.coordinate_frame
+    build_wcs = cached_wcs.fget.__wrapped__
+    builds = []
+
+    def counting_wcs(self):
+        builds.append(None)
+        return build_wcs(self)
+
+    if cached:
+        sunpy.map.GenericMap.wcs = cached_property_based_on('_meta_hash')(counting_wcs)
+    else:
+        sunpy.map.GenericMap.wcs = property(counting_wcs)
+        sunpy.map.GenericMap.coordinate_frame = property(cached_frame.fget.__wrapped__)
+    try:
+        amap = sunpy.map.Map(os.path.join(sunpy.data.test.rootdir, 'aia_171_level1.fits'))
+        start = time.perf_counter()
+        submap_plot(amap, repeats)
+        return time.perf_counter() - start, len(builds)
+    finally:
+        sunpy.map.GenericMap.wcs = cached_wcs
+        sunpy.map.GenericMap.coordinate_frame = cached_frame
+
+
+def main(repeats=20):
+    print('{} submaps plotted'.format(repeats))
+    for name, cached in [('uncached', False), ('cached', True)]:
+        elapsed, builds = run(repeats, cached)
+        print('{:>8}: {:.2f} s, {} WCS built'.format(name, elapsed, builds))
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))